@@ -4,8 +4,16 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
+import os
+import time
 import numpy as np
 
+from frt.optimization.whatif import load_risk_model, risk_state, apply_weight_changes, sector_weights
+from frt.optimization.whatif import risk_metrics as whatif_risk_metrics
+from frt.tca.cube import CUBE_DIMENSIONS, load_cube, query_cube
+from frt.alerts.rules import EPISODE_COLUMNS, load_rules, evaluate_rules, active_alerts
+from frt.alerts.store import connect, query_alerts, count_alerts, query_runs, count_runs, monitor_status
+
 # ---------------- Page Setup ----------------
 st.set_page_config(
     page_title="Financial Risk Dashboard - Enhanced",
@@ -155,14 +163,73 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ---------------- Data Loading with Error Handling ----------------
+def file_version(path):
+    # Modification time, part of each loader's cache key so rewritten outputs are reloaded
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+@st.cache_resource(max_entries=1)
+def _load_whatif_model(path, version):
+    # Risk model and base state are built once per file version; what-ifs only apply deltas
+    model = load_risk_model(path)
+    return model, risk_state(model)
+
+def load_whatif_model(path):
+    version = file_version(path)
+    if version is None:
+        return None, None
+    try:
+        return _load_whatif_model(path, version)
+    except FileNotFoundError:
+        return None, None
+
+@st.cache_resource(max_entries=1)
+def _load_tca_cube(path, version):
+    # Pre-aggregated TCA cells; every drill-down is answered from these
+    return load_cube(path)
+
+def load_tca_cube(path):
+    version = file_version(path)
+    if version is None:
+        return None
+    try:
+        return _load_tca_cube(path, version)
+    except FileNotFoundError:
+        return None
+
+@st.cache_resource
+def open_store(path):
+    # Alert and audit history, written by the pipeline, batch runs and the alert monitor
+    return connect(path)
+
 @st.cache_data
-def load_csv_safe(path):
+def _load_alert_rules(path, version):
+    # Thresholds, hysteresis and severities of the alert rules
+    return load_rules(path)
+
+def load_alert_rules(path):
     try:
-        df = pd.read_csv(path)
-        df.columns = df.columns.str.strip()
-        return df
+        return _load_alert_rules(path, file_version(path))
     except FileNotFoundError:
         st.warning(f"File not found: {path}")
+        return None
+
+@st.cache_data
+def _read_csv(path, version):
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    return df
+
+def load_csv_safe(path, optional=False):
+    # Keyed on the file version, so a pipeline run reaches an open dashboard on its next rerun
+    try:
+        return _read_csv(path, file_version(path))
+    except FileNotFoundError:
+        # Optional outputs only exist once the producing notebook has been re-run
+        if not optional:
+            st.warning(f"File not found: {path}")
         return pd.DataFrame()
     except Exception as e:
         st.error(f"Error loading {path}: {str(e)}")
@@ -181,9 +248,17 @@ with st.spinner("Loading data..."):
     portfolio_risk_returns = load_csv_safe("./Portfolio Optimization Module/portfolio_risk_return_report.csv")
     risk_budget = load_csv_safe("./Portfolio Optimization Module/risk_budget_report.csv")
     sector_allocation = load_csv_safe("./Portfolio Optimization Module/sector_allocation_report.csv")
+    efficient_frontier = load_csv_safe("./Portfolio Optimization Module/efficient_frontier.csv", optional=True)
+    random_portfolios = load_csv_safe("./Portfolio Optimization Module/random_portfolios.csv", optional=True)
+    risk_parity = load_csv_safe("./Portfolio Optimization Module/risk_parity_report.csv", optional=True)
+    whatif_model, whatif_base = load_whatif_model("./Portfolio Optimization Module/risk_model.npz")
     
     # Load enhanced TCA data
     tca_summary = load_csv_safe("./Transaction Cost Analysis (TCA)/weekly_tca_summary.csv")
+    tca_cube = load_tca_cube("./Transaction Cost Analysis (TCA)/tca_cube.npz")
+    alert_config = load_alert_rules("./alert_rules.json")
+    # The file may only appear once a run or the monitor has started; checked on every rerun
+    store = open_store("./monitoring.db") if os.path.exists("./monitoring.db") else None
 
 # ---------------- Sidebar Navigation ----------------
 st.sidebar.markdown("""
@@ -720,6 +795,65 @@ elif section == "Portfolio Optimization":
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    if not efficient_frontier.empty:
+        st.markdown("<div class='section-header'><h3>Efficient Frontier</h3></div>", unsafe_allow_html=True)
+        
+        fig_frontier = go.Figure()
+        
+        if not random_portfolios.empty:
+            fig_frontier.add_trace(go.Scattergl(
+                x=random_portfolios['volatility'] * 100,
+                y=random_portfolios['return'] * 100,
+                mode='markers',
+                marker=dict(
+                    size=4,
+                    color=random_portfolios['sharpe'],
+                    colorscale='Viridis',
+                    opacity=0.4,
+                    showscale=True,
+                    colorbar=dict(title="Sharpe")
+                ),
+                name='Random Portfolios',
+                hovertemplate='Volatility: %{x:.3f}%<br>Return: %{y:.3f}%<extra></extra>'
+            ))
+        
+        fig_frontier.add_trace(go.Scatter(
+            x=efficient_frontier['volatility'] * 100,
+            y=efficient_frontier['return'] * 100,
+            mode='lines+markers',
+            line=dict(color='#00D9FF', width=3),
+            marker=dict(size=6),
+            name='Constrained Frontier',
+            hovertemplate='Volatility: %{x:.3f}%<br>Return: %{y:.3f}%<extra></extra>'
+        ))
+        
+        if not portfolio_risk_returns.empty:
+            opt_return = metrics_dict.get('Expected Annual Return', 'N/A')
+            opt_vol = metrics_dict.get('Expected Volatility', 'N/A')
+            if opt_return != 'N/A' and opt_vol != 'N/A':
+                fig_frontier.add_trace(go.Scatter(
+                    x=[float(opt_vol.strip('%'))],
+                    y=[float(opt_return.strip('%'))],
+                    mode='markers',
+                    marker=dict(symbol='star', size=18, color='#E74C3C'),
+                    name='Optimized Portfolio'
+                ))
+        
+        fig_frontier.update_layout(
+            height=450,
+            plot_bgcolor='#0E1117',
+            paper_bgcolor='#0E1117',
+            font=dict(color='#FAFAFA'),
+            xaxis=dict(title="Volatility (%)", gridcolor='#2A2A3E'),
+            yaxis=dict(title="Return (%)", gridcolor='#2A2A3E'),
+            legend=dict(orientation='h', yanchor='bottom', y=1.02, x=0),
+            margin=dict(l=20, r=20, t=40, b=40)
+        )
+        
+        st.plotly_chart(fig_frontier, width='stretch', key="efficient_frontier")
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+    
     st.markdown("<div class='section-header'><h3>Recommended Trades</h3></div>", unsafe_allow_html=True)
     
     if not trade_recommendations.empty and "change" in trade_recommendations.columns:
@@ -810,18 +944,30 @@ elif section == "Portfolio Optimization":
                 </div>
             """, unsafe_allow_html=True)
         
+        if 'expected_cost' in trades.columns:
+            st.markdown("<br>", unsafe_allow_html=True)
+            col1, col2 = st.columns(2)
+            with col1:
+                kpi_card("Expected Trading Cost", trades['expected_cost'].sum() * 10000, None, '#F1C40F', '.1f', ' bps')
+            with col2:
+                kpi_card("Net Expected Alpha", trades['net_expected_alpha'].sum() * 10000, None, '#2ECC71', '.1f', ' bps')
+        
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("<div class='section-header'><h3>Complete Trade List</h3></div>", unsafe_allow_html=True)
         
-        display_cols = ['instrument_name', 'sector', 'current_weight', 'target_weight', 'change']
+        display_cols = ['instrument_name', 'sector', 'current_weight', 'target_weight', 'change',
+                        'expected_cost_bps', 'net_expected_alpha']
         available_cols = [col for col in display_cols if col in trades.columns]
+        formats = {
+            'current_weight': '{:.6f}',
+            'target_weight': '{:.6f}',
+            'change': '{:.6f}',
+            'expected_cost_bps': '{:.2f}',
+            'net_expected_alpha': '{:.6f}'
+        }
         
         st.dataframe(
-            trades[available_cols].style.format({
-                'current_weight': '{:.6f}',
-                'target_weight': '{:.6f}',
-                'change': '{:.6f}'
-            }),
+            trades[available_cols].style.format({col: fmt for col, fmt in formats.items() if col in available_cols}),
             width='stretch',
             height=400
         )
@@ -860,6 +1006,88 @@ elif section == "Portfolio Optimization":
             )
             
             st.plotly_chart(fig, width='stretch', key="sector_trades")
+    
+    if whatif_model is not None and not trade_recommendations.empty:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("<div class='section-header'><h3>What-If Risk</h3></div>", unsafe_allow_html=True)
+        st.markdown("Drop recommended trades or override a target weight; risk is recomputed from the weight changes only")
+        
+        whatif_trades = trade_recommendations[trade_recommendations['instrument_id'].isin(whatif_model['position'])]
+        whatif_labels = whatif_trades['instrument_name'].astype(str) + " (" + whatif_trades['instrument_id'].astype(str) + ")"
+        movers = whatif_labels[whatif_trades['change'].abs() > 0.001]
+        
+        col_drop, col_edit = st.columns(2)
+        edits = {}
+        
+        with col_drop:
+            dropped = st.multiselect("Drop trades (keep current weight)", movers.tolist(), key="whatif_drop")
+            for label in dropped:
+                trade = whatif_trades.loc[whatif_labels == label].iloc[0]
+                edits[trade['instrument_id']] = trade['current_weight']
+        
+        with col_edit:
+            edited = st.selectbox("Override target weight", ["None"] + whatif_labels.tolist(), key="whatif_edit")
+            if edited != "None":
+                trade = whatif_trades.loc[whatif_labels == edited].iloc[0]
+                edits[trade['instrument_id']] = st.slider(
+                    "Target weight", 0.0, max(0.15, float(trade['target_weight'])),
+                    float(trade['target_weight']), step=0.0005, format="%.4f", key="whatif_weight"
+                )
+        
+        started = time.perf_counter()
+        positions = [whatif_model['position'][instrument_id] for instrument_id in edits]
+        whatif_state = apply_weight_changes(whatif_base, whatif_model, positions, list(edits.values()))
+        base_metrics = whatif_risk_metrics(whatif_base)
+        new_metrics = whatif_risk_metrics(whatif_state)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            kpi_card("Volatility", new_metrics['volatility'] * 100,
+                     (new_metrics['volatility'] - base_metrics['volatility']) * 100, '#F1C40F', '.2f', '%')
+        with col2:
+            kpi_card("VaR 95% (Loss)", -new_metrics['var'] * 100,
+                     (base_metrics['var'] - new_metrics['var']) * 100, '#E74C3C', '.2f', '%')
+        with col3:
+            kpi_card("ES 95% (Loss)", -new_metrics['expected_shortfall'] * 100,
+                     (base_metrics['expected_shortfall'] - new_metrics['expected_shortfall']) * 100, '#E74C3C', '.2f', '%')
+        with col4:
+            kpi_card("Tracking Error", new_metrics['tracking_error'] * 100,
+                     (new_metrics['tracking_error'] - base_metrics['tracking_error']) * 100, '#00D9FF', '.2f', '%')
+        
+        st.caption(f"{len(edits)} edit(s) · net exposure {new_metrics['net_exposure']*100:.2f}% · "
+                   f"recomputed in {elapsed_ms:.2f} ms")
+        
+        base_sectors = sector_weights(whatif_base, whatif_model)
+        new_sectors = sector_weights(whatif_state, whatif_model)
+        
+        fig_whatif = go.Figure()
+        fig_whatif.add_trace(go.Bar(
+            x=base_sectors.index,
+            y=base_sectors.values * 100,
+            name='Optimized',
+            marker_color='#00D9FF'
+        ))
+        fig_whatif.add_trace(go.Bar(
+            x=new_sectors.index,
+            y=new_sectors.values * 100,
+            name='What-If',
+            marker_color='#F1C40F'
+        ))
+        
+        fig_whatif.update_layout(
+            height=350,
+            barmode='group',
+            plot_bgcolor='#0E1117',
+            paper_bgcolor='#0E1117',
+            font=dict(color='#FAFAFA'),
+            xaxis=dict(title="Sector", gridcolor='#2A2A3E'),
+            yaxis=dict(title="Weight (%)", gridcolor='#2A2A3E'),
+            margin=dict(l=20, r=20, t=20, b=40)
+        )
+        
+        st.plotly_chart(fig_whatif, width='stretch', key="whatif_sectors")
 
 # ============================================================================
 # RISK BUDGET ANALYSIS
@@ -979,6 +1207,59 @@ elif section == "Risk Budget Analysis":
             width='stretch',
             height=400
         )
+    
+    if not risk_parity.empty:
+        st.markdown("<div class='section-header'><h3>Risk-Budgeted Portfolio</h3></div>", unsafe_allow_html=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            current_max = risk_budget['risk_contribution_pct'].max() if not risk_budget.empty else float('nan')
+            kpi_card("Max Contributor (Optimized)", current_max, None, '#F1C40F', '.2f', '%')
+        
+        with col2:
+            kpi_card("Max Contributor (Risk-Budgeted)", risk_parity['risk_contribution_pct'].max(), None, '#2ECC71', '.2f', '%')
+        
+        with col3:
+            budget_gap = (risk_parity['risk_contribution_pct'] - risk_parity['target_budget_pct']).abs().max()
+            kpi_card("Max Budget Deviation", budget_gap, None, '#00D9FF', '.4f', 'pp')
+        
+        with col4:
+            kpi_card("Largest Weight", risk_parity['weight'].max() * 100, None, '#9B59B6', '.2f', '%')
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        sector_risk = risk_parity.groupby('sector')[['target_budget_pct', 'risk_contribution_pct', 'weight']].sum()
+        sector_risk = sector_risk.sort_values('target_budget_pct', ascending=False)
+        
+        fig_budget = go.Figure()
+        fig_budget.add_trace(go.Bar(
+            x=sector_risk.index,
+            y=sector_risk['target_budget_pct'],
+            name='Target Risk Budget',
+            marker_color='#00D9FF'
+        ))
+        fig_budget.add_trace(go.Bar(
+            x=sector_risk.index,
+            y=sector_risk['risk_contribution_pct'],
+            name='Achieved Risk Contribution',
+            marker_color='#2ECC71',
+            customdata=sector_risk['weight'] * 100,
+            hovertemplate='<b>%{x}</b><br>Risk: %{y:.2f}%<br>Weight: %{customdata:.2f}%<extra></extra>'
+        ))
+        
+        fig_budget.update_layout(
+            height=450,
+            barmode='group',
+            plot_bgcolor='#0E1117',
+            paper_bgcolor='#0E1117',
+            font=dict(color='#FAFAFA'),
+            xaxis=dict(title="Sector", gridcolor='#2A2A3E'),
+            yaxis=dict(title="Share of Portfolio Risk (%)", gridcolor='#2A2A3E'),
+            showlegend=True
+        )
+        
+        st.plotly_chart(fig_budget, width='stretch', key="risk_budget_sectors")
 
 # ============================================================================
 # TCA & ATTRIBUTION (ENHANCED)
@@ -1217,6 +1498,7 @@ elif section == "TCA & Attribution":
             fig_slip = go.Figure()
             fig_slip.add_trace(go.Scatter(
                 y=tca_summary['avg_slippage_bps'],
+                name='Average',
                 mode='lines+markers',
                 line=dict(color='#FF5733', width=3),
                 marker=dict(size=8),
@@ -1225,6 +1507,15 @@ elif section == "TCA & Attribution":
                 hovertemplate='Slippage: %{y:.2f} bps<extra></extra>'
             ))
             
+            if 'p95_slippage_bps' in tca_summary.columns:
+                fig_slip.add_trace(go.Scatter(
+                    y=tca_summary['p95_slippage_bps'],
+                    mode='lines',
+                    name='p95',
+                    line=dict(color='#E74C3C', width=2, dash='dot'),
+                    hovertemplate='p95 Slippage: %{y:.2f} bps<extra></extra>'
+                ))
+            
             avg_slip = tca_summary['avg_slippage_bps'].mean()
             fig_slip.add_hline(y=avg_slip, line_dash="dash", line_color="#FFD700",
                               annotation_text=f"Mean: {avg_slip:.2f} bps")
@@ -1344,12 +1635,103 @@ elif section == "TCA & Attribution":
             format_dict['num_trades'] = '{:,.0f}'
         if 'total_volume' in tca_summary.columns:
             format_dict['total_volume'] = '{:,.0f}'
+        for column in ['std_slippage_bps', 'std_market_impact_bps', 'p50_slippage_bps', 'p95_slippage_bps', 'p99_slippage_bps']:
+            if column in tca_summary.columns:
+                format_dict[column] = '{:.2f}'
         
         st.dataframe(
             tca_summary.style.format(format_dict),
             width='stretch',
             height=400
         )
+    
+    if tca_cube is not None:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("<div class='section-header'><h3>TCA Drill-Down</h3></div>", unsafe_allow_html=True)
+        
+        dimension_labels = {
+            'order_type': 'Order Type',
+            'trade_type': 'Trade Type',
+            'order_size_category': 'Order Size',
+            'sector': 'Sector',
+            'instrument_id': 'Instrument'
+        }
+        
+        filter_cols = st.columns(4)
+        cube_filters = {}
+        for col, dimension in zip(filter_cols, CUBE_DIMENSIONS[:4]):
+            with col:
+                cube_filters[dimension] = st.multiselect(
+                    dimension_labels[dimension], tca_cube['levels'][dimension].tolist(), key=f"cube_{dimension}"
+                )
+        
+        group_dimension = st.selectbox(
+            "Break down by", CUBE_DIMENSIONS, index=3,
+            format_func=lambda dimension: dimension_labels[dimension], key="cube_group"
+        )
+        
+        started = time.perf_counter()
+        drill = query_cube(tca_cube, cube_filters, [group_dimension])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        if drill.empty:
+            st.info("No trades match the selected filters")
+        else:
+            drill = drill.sort_values('total_cost', ascending=False)
+            st.caption(f"{drill['num_trades'].sum():,} trades in {len(drill)} groups · "
+                       f"queried in {elapsed_ms:.2f} ms")
+            
+            # Standard error of the mean slippage per group
+            slippage_se = drill['std_slippage_bps'] / np.sqrt(drill['num_trades'])
+            
+            fig_drill = go.Figure()
+            fig_drill.add_trace(go.Bar(
+                x=drill[group_dimension],
+                y=drill['avg_slippage_bps'],
+                error_y=dict(type='data', array=slippage_se.fillna(0), color='#B0B0B0'),
+                name='Avg Slippage',
+                marker_color='#FF5733',
+                hovertemplate='%{x}<br>Slippage: %{y:.2f} bps<extra></extra>'
+            ))
+            fig_drill.add_trace(go.Bar(
+                x=drill[group_dimension],
+                y=drill['avg_market_impact_bps'],
+                name='Avg Market Impact',
+                marker_color='#F1C40F',
+                hovertemplate='%{x}<br>Market Impact: %{y:.2f} bps<extra></extra>'
+            ))
+            
+            fig_drill.update_layout(
+                height=350,
+                barmode='group',
+                plot_bgcolor='#0E1117',
+                paper_bgcolor='#0E1117',
+                font=dict(color='#FAFAFA'),
+                xaxis=dict(title=dimension_labels[group_dimension], gridcolor='#2A2A3E'),
+                yaxis=dict(title="bps", gridcolor='#2A2A3E'),
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            )
+            
+            st.plotly_chart(fig_drill, width='stretch', key="tca_drill_down")
+            
+            st.dataframe(
+                drill.style.format({
+                    'num_trades': '{:,.0f}',
+                    'avg_slippage_bps': '{:.2f}',
+                    'std_slippage_bps': '{:.2f}',
+                    'avg_market_impact_bps': '{:.2f}',
+                    'std_market_impact_bps': '{:.2f}',
+                    'total_slippage_value': '{:,.2f}',
+                    'total_market_impact_value': '{:,.2f}',
+                    'total_commission': '{:,.2f}',
+                    'total_cost': '{:,.2f}',
+                    'total_pnl': '{:,.2f}',
+                    'total_volume': '{:,.0f}'
+                }),
+                width='stretch',
+                height=400,
+                hide_index=True
+            )
 
 # ============================================================================
 # ALERTS & MONITORING
@@ -1357,90 +1739,40 @@ elif section == "TCA & Attribution":
 elif section == "Alerts & Monitoring":
     st.title("Alerts & Risk Monitoring")
     st.markdown("Real-time breach alerts and risk threshold monitoring")
+    monitor = monitor_status(store) if store is not None else None
+    last_monitor = query_runs(store, module="alerts", limit=1) if store is not None else pd.DataFrame()
+    last_evaluated = (f"; last evaluated new outputs at {last_monitor['started_at'].iloc[0]}"
+                      if not last_monitor.empty else "")
+    if monitor is None:
+        st.caption("Alert monitor not running; start it with `python -m frt.alerts`")
+    elif monitor["running"]:
+        st.caption(f"Alert monitor running, polling every {monitor['interval']:g}s{last_evaluated}")
+    else:
+        st.caption(f"Alert monitor not running since {monitor['polled_at']}{last_evaluated}; "
+                   "start it with `python -m frt.alerts`")
     st.markdown("---")
     
-    alerts = []
-    
-    # VaR Breach Alerts
-    if not risk_metrics.empty:
-        var_95_threshold = -10.0
-        var_99_threshold = -40.0
-        
-        if "VaR_95" in risk_metrics.columns:
-            latest_var_95 = get_safe_value(risk_metrics["VaR_95"])
-            if latest_var_95 < var_95_threshold:
-                alerts.append({
-                    'type': 'danger',
-                    'title': 'VaR 95% Breach',
-                    'message': f'Current VaR 95%: {latest_var_95:.2f} exceeds threshold of {var_95_threshold}',
-                    'metric': latest_var_95
-                })
-        
-        if "VaR_99" in risk_metrics.columns:
-            latest_var_99 = get_safe_value(risk_metrics["VaR_99"])
-            if latest_var_99 < var_99_threshold:
-                alerts.append({
-                    'type': 'danger',
-                    'title': 'VaR 99% Breach',
-                    'message': f'Current VaR 99%: {latest_var_99:.2f} exceeds threshold of {var_99_threshold}',
-                    'metric': latest_var_99
-                })
-    
-    # Stress Test Alerts
-    if not risk_metrics.empty:
-        stress_threshold = -1.0
-        stress_cols = ["Rate_Shock", "Volatility_Spike", "Sector_Drawdown"]
-        
-        for col in stress_cols:
-            if col in risk_metrics.columns:
-                latest_stress = get_safe_value(risk_metrics[col])
-                if latest_stress < stress_threshold:
-                    alerts.append({
-                        'type': 'warning',
-                        'title': f'{col.replace("_", " ")} Alert',
-                        'message': f'Current {col}: {latest_stress:.3f}% exceeds stress threshold',
-                        'metric': latest_stress
-                    })
-    
-    # Sector Concentration Alerts
-    if not sector_exposure.empty:
-        sector_limit = 0.05
-        
-        for _, row in sector_exposure.iterrows():
-            if abs(row['portfolio_weight']) > sector_limit:
-                alert_type = 'warning' if abs(row['portfolio_weight']) < 0.08 else 'danger'
-                alerts.append({
-                    'type': alert_type,
-                    'title': 'Sector Concentration Alert',
-                    'message': f'{row["sector"]} exposure: {row["portfolio_weight"]*100:.3f}% exceeds {sector_limit*100}% limit',
-                    'metric': row['portfolio_weight'] * 100
-                })
-    
-    # TCA Alerts
-    if not tca_summary.empty and 'avg_slippage_bps' in tca_summary.columns:
-        slippage_threshold = 20.0
-        latest_slippage = get_safe_value(tca_summary['avg_slippage_bps'])
-        
-        if abs(latest_slippage) > slippage_threshold:
-            alerts.append({
-                'type': 'warning',
-                'title': 'High Slippage Alert',
-                'message': f'Average slippage: {latest_slippage:.2f} bps exceeds {slippage_threshold} bps threshold',
-                'metric': latest_slippage
-            })
-    
-    # Cost-to-P&L Ratio Alert
-    if not tca_summary.empty and 'cost_to_pnl_ratio' in tca_summary.columns:
-        cost_threshold = 10.0
-        latest_cost_ratio = get_safe_value(tca_summary['cost_to_pnl_ratio'])
-        
-        if latest_cost_ratio > cost_threshold:
-            alerts.append({
-                'type': 'danger',
-                'title': 'High Cost-to-P&L Ratio',
-                'message': f'Cost consuming {latest_cost_ratio:.2f}% of P&L, exceeds {cost_threshold}% threshold',
-                'metric': latest_cost_ratio
-            })
+    # Every rule is evaluated over the full metric history; one row per breach episode
+    alert_episodes = evaluate_rules(
+        {"risk_metrics": risk_metrics, "sector_exposure": sector_exposure, "tca_summary": tca_summary},
+        alert_config["rules"]
+    ) if alert_config else pd.DataFrame(columns=EPISODE_COLUMNS)
+    # When the store has seen an episode, show when it was first detected rather than the render time
+    detected = {}
+    if store is not None:
+        stored = query_alerts(store, active=True, limit=1000)
+        detected = {(r['rule'], r['key'], r['start']): r['detected_at'] for r in stored.to_dict('records')}
+    alerts = [
+        {
+            'type': row['severity'],
+            'title': row['title'],
+            'message': row['message'],
+            'metric': row['last'],
+            'since': row['start'],
+            'detected': detected.get((row['rule'], row['key'], str(row['start'])))
+        }
+        for row in active_alerts(alert_episodes).to_dict('records')
+    ]
     
     # Display Alerts
     st.markdown("<div class='section-header'><h3>Active Alerts</h3></div>", unsafe_allow_html=True)
@@ -1483,7 +1815,7 @@ elif section == "Alerts & Monitoring":
                 <div class='alert-box {alert_class}'>
                     <strong>{alert['title']}</strong><br>
                     {alert['message']}<br>
-                    <small>Detected at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</small>
+                    <small>In breach since: {alert['since']}{f" | Detected at: {alert['detected']}" if alert['detected'] else ""}</small>
                 </div>
             """, unsafe_allow_html=True)
     else:
@@ -1496,19 +1828,56 @@ elif section == "Alerts & Monitoring":
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    # Breach History
+    st.markdown("<div class='section-header'><h3>Breach History</h3></div>", unsafe_allow_html=True)
+    
+    if store is not None and count_alerts(store) > 0:
+        # Paged from the store: months of episodes without re-evaluating the rules
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            severity_filter = st.selectbox("Severity", ["All", "danger", "warning"], key="alert_severity")
+        with col2:
+            module_filter = st.selectbox("Module", ["All", "risk", "tca"], key="alert_module")
+        filters = {
+            'severity': None if severity_filter == "All" else severity_filter,
+            'module': None if module_filter == "All" else module_filter
+        }
+        total = count_alerts(store, **filters)
+        with col3:
+            page = st.number_input(f"Page (of {max(1, -(-total // 50))})", min_value=1,
+                                   max_value=max(1, -(-total // 50)), value=1, key="alert_page")
+        history = query_alerts(store, limit=50, offset=(page - 1) * 50, **filters)
+        st.dataframe(
+            history[['detected_at', 'title', 'severity', 'module', 'key', 'start', 'end', 'periods', 'peak',
+                     'threshold', 'active']],
+            width='stretch',
+            height=300,
+            hide_index=True
+        )
+    elif not alert_episodes.empty:
+        st.dataframe(
+            alert_episodes[['title', 'severity', 'key', 'start', 'end', 'periods', 'peak', 'threshold', 'active']],
+            width='stretch',
+            height=300,
+            hide_index=True
+        )
+    else:
+        st.info("No breach episodes in the metric history.")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
     # Monitoring Dashboard
     st.markdown("<div class='section-header'><h3>Risk Thresholds Monitor</h3></div>", unsafe_allow_html=True)
     
-    if not risk_metrics.empty:
+    rule_thresholds = {rule['column']: rule['threshold'] for rule in alert_config['rules']
+                       if rule['source'] == 'risk_metrics'} if alert_config else {}
+    
+    if not risk_metrics.empty and rule_thresholds:
+        monitored = {'VaR 95%': 'VaR_95', 'VaR 99%': 'VaR_99', 'ES 95%': 'ES_95', 'ES 99%': 'ES_99'}
         thresholds = {
-            'VaR 95%': {'current': get_safe_value(risk_metrics.get("VaR_95", pd.Series([0]))), 
-                       'threshold': -10.0, 'unit': ''},
-            'VaR 99%': {'current': get_safe_value(risk_metrics.get("VaR_99", pd.Series([0]))), 
-                       'threshold': -40.0, 'unit': ''},
-            'ES 95%': {'current': get_safe_value(risk_metrics.get("ES_95", pd.Series([0]))), 
-                      'threshold': -50.0, 'unit': ''},
-            'ES 99%': {'current': get_safe_value(risk_metrics.get("ES_99", pd.Series([0]))), 
-                      'threshold': -150.0, 'unit': ''}
+            label: {'current': get_safe_value(risk_metrics.get(column, pd.Series([0]))),
+                    'threshold': rule_thresholds[column], 'unit': ''}
+            for label, column in monitored.items() if column in rule_thresholds
         }
         
         threshold_df = pd.DataFrame([
@@ -1557,19 +1926,22 @@ elif section == "Alerts & Monitoring":
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("<div class='section-header'><h3>Audit Trail</h3></div>", unsafe_allow_html=True)
     
-    audit_data = {
-        'Timestamp': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-        'Module': ['TCA & Portfolio Optimization'],
-        'Action': ['Enhanced TCA Analysis & Optimization'],
-        'Status': ['Success'],
-        'Records Processed': [len(target_weights) + len(tca_summary)],
-        'Data Version': ['v2.0.0'],
-        'Code Version': ['dashboard-v2.0.0']
-    }
-    
-    audit_df = pd.DataFrame(audit_data)
-    
-    st.dataframe(audit_df, width='stretch', height=150)
+    if store is not None and count_runs(store) > 0:
+        total_runs = count_runs(store)
+        run_page = st.number_input(f"Page (of {-(-total_runs // 25)})", min_value=1,
+                                   max_value=-(-total_runs // 25), value=1, key="audit_page")
+        audit_df = query_runs(store, limit=25, offset=(run_page - 1) * 25).rename(columns={
+            'started_at': 'Timestamp', 'module': 'Module', 'command': 'Action', 'status': 'Status',
+            'seconds': 'Seconds', 'inputs': 'Hashed Inputs', 'code_version': 'Code Version'
+        })
+        st.dataframe(
+            audit_df[['Timestamp', 'Module', 'Action', 'Status', 'Seconds', 'Hashed Inputs', 'Code Version']],
+            width='stretch',
+            height=300,
+            hide_index=True
+        )
+    else:
+        st.info("No runs recorded yet. Runs of `python -m frt.pipeline` and `python -m frt` are logged to monitoring.db.")
     
     st.markdown("""
         <div class='alert-box alert-success'>
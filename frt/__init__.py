@@ -0,0 +1,6 @@
+"""
+Shared engine code for the Financial Risk & Trading modules.
+
+The notebooks under each module directory and ``Dashboard.py`` import from
+this package so that the compute logic lives in one place.
+"""
@@ -0,0 +1,99 @@
+"""
+Headless batch runs of the module stages, without Jupyter or plotting.
+
+    python -m frt risk
+    python -m frt tca backtest                  # several stages, in order
+    python -m frt all --trades /data/trades.csv
+    python -m frt optimization --output-dir /tmp/opt --constraints constraints.json
+    python -m frt all --backtest-config backtest_config.json --constraints constraints.json
+    python -m frt all --profile profiles        # timings, CPU, peak RSS and rows per function
+
+Each stage writes the data files its notebook writes (into the module
+directory by default), so the dashboard and the daily report read batch
+and notebook runs alike. Only the selected stages' modules are imported,
+and matplotlib never is. Each stage run is recorded in the alert / audit
+store with the content hashes of its input files (``--no-store`` to
+skip). ``--profile DIR`` records the stages and the functions they call
+into ``DIR/profile.jsonl`` and ``DIR/profile.prom`` (see
+``frt.profiling``). Exits with status 1 when a stage fails.
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+from datetime import datetime
+
+# Stage -> (module, function); imported only when the stage runs
+STAGE_RUNNERS = {
+    "risk": ("frt.risk.run", "run_risk"),
+    "tca": ("frt.tca.run", "run_tca"),
+    "backtest": ("frt.backtest.run", "run_backtest"),
+    "optimization": ("frt.optimization.run", "run_optimization"),
+}
+
+
+def run_stage(name, **kwargs):
+    """Run one stage; ``kwargs`` are passed through when not None. Returns the written paths"""
+    module, function = STAGE_RUNNERS[name]
+    runner = getattr(importlib.import_module(module), function)
+    return runner(**{key: value for key, value in kwargs.items() if value is not None})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch runs of the module stages")
+    parser.add_argument("stages", nargs="+", choices=list(STAGE_RUNNERS) + ["all"])
+    parser.add_argument("--trades", default=None, help="trades CSV (default: Data/project2_trading.csv)")
+    parser.add_argument("--instruments", default=None, help="instruments CSV (default: Data/project2_instruments.csv)")
+    parser.add_argument("--output-dir", default=None, help="output directory (default: the module directory)")
+    parser.add_argument("--backtest-config", default=None,
+                        help="backtest config JSON (default: the notebook's backtest_config.json)")
+    parser.add_argument("--constraints", default=None,
+                        help="optimization constraint overrides JSON (default: DEFAULT_CONSTRAINTS)")
+    parser.add_argument("--no-store", action="store_true", help="do not record the runs in monitoring.db")
+    parser.add_argument("--profile", metavar="DIR", default=None,
+                        help="record profile.jsonl / profile.prom into DIR (same as FRT_PROFILE=DIR)")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        from frt.profiling import enable
+        enable(args.profile)
+
+    store = None
+    if not args.no_store:
+        from frt.alerts.store import code_version, connect, content_hash, record_run
+        from frt.paths import INSTRUMENTS_FILE, TRADES_FILE
+        store, version = connect(), code_version()
+        inputs = {str(path): content_hash(path) for path in (args.trades or TRADES_FILE,
+                                                             args.instruments or INSTRUMENTS_FILE)
+                  if os.path.exists(path)}
+
+    # In dependency order: backtest and optimization read the TCA impact parameters
+    stages = list(STAGE_RUNNERS) if "all" in args.stages else [s for s in STAGE_RUNNERS if s in args.stages]
+    failed = False
+    for name in stages:
+        kwargs = {"trades_path": args.trades, "instruments_path": args.instruments, "output_dir": args.output_dir}
+        if name == "backtest":
+            kwargs["config_path"] = args.backtest_config
+        elif name == "optimization":
+            kwargs["config_path"] = args.constraints
+        started_at = datetime.now().isoformat(sep=" ", timespec="seconds")
+        start = time.perf_counter()
+        try:
+            paths, status = run_stage(name, **kwargs), "ran"
+        except Exception as exc:
+            paths, status = None, "failed"
+            print(f"❌ {name}: {type(exc).__name__}: {exc}", file=sys.stderr)
+        if store is not None:
+            record_run(store, name, "batch", status, started_at, time.perf_counter() - start, inputs, version)
+        if paths is None:
+            failed = True
+            continue
+        print(f"✅ {name}: {len(paths)} files in {time.perf_counter() - start:.2f}s")
+        for path in paths:
+            print(f"   {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Threshold alerts over the module outputs, configured in ``alert_rules.json``."""
@@ -0,0 +1,31 @@
+"""
+Run the alert monitor.
+
+    python -m frt.alerts                     # poll every 5s until interrupted
+    python -m frt.alerts --interval 30
+    python -m frt.alerts --once              # one pass (e.g. from cron)
+
+Breach episodes are recorded in ``monitoring.db``; the dashboard's Alerts
+page reads them from there.
+"""
+import argparse
+import sys
+
+from frt.paths import ALERT_RULES_FILE, STORE_FILE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate the alert rules as module outputs change")
+    parser.add_argument("--rules", default=str(ALERT_RULES_FILE), help="alert rules JSON (default: alert_rules.json)")
+    parser.add_argument("--store", default=str(STORE_FILE), help="alert store (default: monitoring.db)")
+    parser.add_argument("--interval", type=float, default=None, help="seconds between polls (default: 5)")
+    parser.add_argument("--once", action="store_true", help="evaluate once and exit")
+    args = parser.parse_args(argv)
+
+    from frt.alerts.monitor import POLL_SECONDS, run_monitor
+    run_monitor(args.rules, args.store, args.interval or POLL_SECONDS, args.once)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Background alert monitor: re-evaluates the alert rules as module outputs land.
+
+The source files of ``alert_rules.json`` (and the config itself) are
+polled by size and modification time, so it works on any filesystem and
+needs nothing beyond the standard library. Per poll:
+
+- unchanged sources are not read at all;
+- a source that only grew (its old last 4 KiB are still in place) is
+  read from the previous offset on; the new rows are appended to the
+  cached frame and each rule on it is re-evaluated from its resume
+  points (see ``rules.resume_points``), not over the whole history;
+- any other change (the notebooks rewrite their outputs) re-reads the
+  file and re-evaluates its rules in full, unless the content hash is
+  unchanged;
+- a changed ``alert_rules.json`` reloads the config and re-evaluates all.
+
+Only complete lines are consumed, so a file caught mid-write is finished
+on the next poll. Episodes of the re-evaluated rules go to the alert
+store (``monitoring.db``), where the dashboard reads them. Every pass also
+updates the monitor's heartbeat there, so the dashboard can tell an idle
+monitor from a stopped one.
+"""
+import hashlib
+import io
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from frt.alerts.rules import EPISODE_COLUMNS, breach_episodes, load_rules, resume_points, resume_window
+from frt.alerts.store import code_version, connect, record_alerts, record_heartbeat, record_run, source_modules
+from frt.paths import ALERT_RULES_FILE, STORE_FILE
+from frt.pipeline.stages import output_writers
+
+POLL_SECONDS = 5.0
+TAIL_BYTES = 4096
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _complete(data):
+    """``data`` up to and including its last newline"""
+    return data[:data.rfind(b"\n") + 1]
+
+
+def read_source(path, cached):
+    """
+    Bring the cached source at ``path`` up to date. ``cached`` is None or
+    the dict this returns (frame, offset, tail, sha256, signature).
+    Returns (cache, first new index label or None for a full reload,
+    changed).
+    """
+    signature = _signature(path)
+    if cached is not None and signature == cached["signature"]:
+        return cached, None, False
+    if signature is None:
+        return None, None, cached is not None
+
+    with open(path, "rb") as f:
+        if cached is not None and signature[0] > cached["offset"] and cached["offset"] > 0:
+            start = max(0, cached["offset"] - len(cached["tail"]))
+            f.seek(start)
+            if f.read(cached["offset"] - start) == cached["tail"]:
+                data = _complete(f.read())
+                if not data:
+                    return dict(cached, signature=signature), None, False
+                frame = cached["frame"]
+                rows = pd.read_csv(io.BytesIO(data), header=None, names=list(frame.columns),
+                                   float_precision="round_trip")
+                rows.index += len(frame)
+                offset = cached["offset"] + len(data)
+                f.seek(max(0, offset - TAIL_BYTES))
+                tail = f.read(offset - max(0, offset - TAIL_BYTES))
+                cache = {"frame": pd.concat([frame, rows]), "offset": offset, "tail": tail, "sha256": None,
+                         "signature": signature}
+                return cache, len(frame), True
+            f.seek(0)
+        data = _complete(f.read())
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    if cached is not None and sha256 == cached["sha256"]:
+        return dict(cached, signature=signature), None, False
+    frame = pd.read_csv(io.BytesIO(data), float_precision="round_trip") if data else pd.DataFrame()
+    cache = {"frame": frame, "offset": len(data), "tail": data[-TAIL_BYTES:], "sha256": sha256,
+             "signature": signature}
+    return cache, None, True
+
+
+def poll(config, sources, resume):
+    """
+    One monitoring pass. ``sources`` (source name -> cache) and ``resume``
+    (rule name -> resume points) are updated in place. Returns the
+    episodes of the re-evaluated rules and their names.
+    """
+    episodes, evaluated = [], []
+    for name, path in config["sources"].items():
+        cache, first_new, changed = read_source(path, sources.get(name))
+        if cache is None:
+            sources.pop(name, None)
+        else:
+            sources[name] = cache
+        if not changed or cache is None:
+            continue
+        frame = cache["frame"]
+        for rule in config["rules"]:
+            if rule["source"] != name or rule.get("disabled"):
+                continue
+            window = frame if first_new is None else resume_window(frame, rule, resume.get(rule["name"], {}),
+                                                                  first_new)
+            episodes.append(breach_episodes(window, rule))
+            resume[rule["name"]] = resume_points(window, rule)
+            evaluated.append(rule["name"])
+    episodes = [e for e in episodes if not e.empty]
+    if not episodes:
+        return pd.DataFrame(columns=EPISODE_COLUMNS), evaluated
+    return pd.concat(episodes, ignore_index=True), evaluated
+
+
+def run_monitor(rules_path=ALERT_RULES_FILE, store_path=STORE_FILE, interval=POLL_SECONDS, once=False):
+    """Poll the alert sources every ``interval`` seconds (one pass with ``once``) and record the episodes"""
+    store, version = connect(store_path), code_version()
+    config_signature, config = None, None
+    sources, resume = {}, {}
+    print(f"👀 Monitoring alert sources every {interval:g}s (store: {store_path})", flush=True)
+    try:
+        while True:
+            signature = _signature(rules_path)
+            if signature != config_signature:
+                config_signature, config = signature, load_rules(rules_path)
+                sources, resume = {}, {}
+                print(f"📋 Loaded {len(config['rules'])} rules from {rules_path}", flush=True)
+
+            started = time.perf_counter()
+            episodes, evaluated = poll(config, sources, resume)
+            record_heartbeat(store, "alerts", interval)
+            if evaluated:
+                started_at = datetime.now().isoformat(sep=" ", timespec="seconds")
+                run_id = record_run(store, "alerts", "monitor", "ran", started_at,
+                                    round(time.perf_counter() - started, 3), version=version)
+                new = record_alerts(store, episodes, source_modules(config, output_writers()), evaluated, run_id)
+                active = int(episodes["active"].astype(bool).sum())
+                print(f"🔔 {started_at}: {len(evaluated)} rules re-evaluated, {new} new / {active} active episodes",
+                      flush=True)
+            if once:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("⏹️  Monitor stopped", flush=True)
+    finally:
+        record_heartbeat(store, "alerts", interval, stopped=True)
+        store.close()
@@ -0,0 +1,191 @@
+"""
+Threshold rules evaluated over the full history of a metric.
+
+A rule (one entry of ``alert_rules.json``) compares one column of a
+source frame against a threshold::
+
+    {"name": "slippage", "title": "High Slippage Alert",
+     "source": "tca_summary", "column": "avg_slippage_bps", "time": "_week",
+     "op": ">", "abs": true, "threshold": 20.0, "clear": 15.0,
+     "severity": "warning", "message": "... {peak:.2f} bps ..."}
+
+``op`` is ``<`` or ``>``; ``abs`` compares the magnitude. A breach starts
+when the value crosses ``threshold`` and only ends once it is back past
+``clear`` (hysteresis; defaults to the threshold), so a value hovering
+around the limit raises one alert, not one per period. ``by`` evaluates
+each group (e.g. sector) separately, ``time`` names the column used for
+start / end (default: the row index), ``min_periods`` drops breaches
+shorter than that many periods and ``escalate`` raises the severity to
+``danger`` when the peak goes beyond it.
+
+Every rule is evaluated over all rows at once: enter / leave masks, a
+forward fill for the hysteresis state and a groupby over the breach runs.
+The result is one row per breach episode with its start, end, peak and
+whether it is still active at the latest value.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frt.paths import ALERT_RULES_FILE
+
+SEVERITIES = ["danger", "warning"]
+
+EPISODE_COLUMNS = [
+    "rule", "source", "title", "severity", "key", "start", "end", "periods",
+    "peak", "last", "threshold", "active", "message",
+]
+
+
+def load_rules(path=ALERT_RULES_FILE):
+    """Alert config with the ``sources`` paths resolved against the file's directory"""
+    path = Path(path)
+    with open(path) as f:
+        config = json.load(f)
+    config["sources"] = {name: str((path.parent / source).resolve())
+                         for name, source in config.get("sources", {}).items()}
+    return config
+
+
+def load_sources(config, optional=True):
+    """Source name -> frame for every source file in ``config`` (missing files are skipped)"""
+    frames = {}
+    for name, path in config["sources"].items():
+        try:
+            frames[name] = pd.read_csv(path, float_precision="round_trip")
+        except FileNotFoundError:
+            if not optional:
+                raise
+    return frames
+
+
+def _breaches(values, level, op):
+    return values < level if op == "<" else values > level
+
+
+def breach_state(values, rule, keys=None):
+    """
+    Boolean series: in breach at each row, with hysteresis between
+    ``threshold`` and ``clear``. ``values`` are already made absolute
+    for ``abs`` rules; ``keys`` keeps the state of each group separate.
+    """
+    op, threshold = rule["op"], rule["threshold"]
+    clear = rule.get("clear", threshold)
+    if op not in ("<", ">"):
+        raise ValueError(f"Rule {rule['name']}: unknown op {op!r}")
+    if _breaches(clear, threshold, op):
+        raise ValueError(f"Rule {rule['name']}: clear level {clear} is beyond the threshold {threshold}")
+
+    enter = _breaches(values, threshold, op)
+    leave = ~_breaches(values, clear, op)
+    state = pd.Series(np.where(enter, 1.0, np.where(leave, 0.0, np.nan)), index=values.index)
+    state = state.groupby(keys).ffill() if keys is not None else state.ffill()
+    return state.fillna(0.0).astype(bool)
+
+
+def _rule_series(frame, rule):
+    """(times, keys, values, compared) of the rows with a value, or None when a column is missing"""
+    column, by, time = rule["column"], rule.get("by"), rule.get("time")
+    needed = [column] + [c for c in (by, time) if c]
+    if frame.empty or not set(needed).issubset(frame.columns):
+        return None
+    data = frame[needed].dropna(subset=[column])
+    times = data[time] if time else pd.Series(data.index, index=data.index)
+    keys = data[by].astype(str) if by else pd.Series("", index=data.index)
+    values = data[column].astype(float)
+    compared = values.abs() if rule.get("abs") else values
+    return times, keys, values, compared
+
+
+def breach_episodes(frame, rule):
+    """One row per breach episode of ``rule`` in ``frame`` (columns ``EPISODE_COLUMNS``)"""
+    series = _rule_series(frame, rule)
+    if series is None:
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+    times, keys, values, compared = (s.reset_index(drop=True) for s in series)
+    column = rule["column"]
+
+    state = breach_state(compared, rule, keys)
+    started = state & ~state.groupby(keys).shift(fill_value=False)
+    # An episode is labelled by its first row, carried forward within its own key
+    # so interleaved groups never share or split a run
+    first_row = pd.Series(np.where(started, np.arange(len(state)), np.nan), index=state.index)
+    episode = first_row.groupby(keys).ffill()[state].astype(np.int64)
+    latest = keys.groupby(keys).cumcount(ascending=False) == 0
+    if episode.empty:
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+
+    runs = compared[state].groupby(episode)
+    peak_rows = runs.idxmin() if rule["op"] == "<" else runs.idxmax()
+    rows = pd.Series(episode.index, index=episode.index).groupby(episode)
+    first_rows, last_rows = rows.first(), rows.last()
+    episodes = pd.DataFrame({
+        "rule": rule["name"],
+        "source": rule["source"],
+        "title": rule.get("title", rule["name"]),
+        "severity": rule.get("severity", "warning"),
+        "key": keys[first_rows].to_numpy(),
+        "start": times[first_rows].to_numpy(),
+        "end": times[last_rows].to_numpy(),
+        "periods": runs.size().to_numpy(),
+        "peak": values[peak_rows].to_numpy(),
+        "last": values[last_rows].to_numpy(),
+        "threshold": rule["threshold"],
+        "active": latest[last_rows].to_numpy(),
+    })
+    if "escalate" in rule:
+        escalated = _breaches(compared[peak_rows], rule["escalate"], rule["op"]).to_numpy()
+        episodes.loc[escalated, "severity"] = "danger"
+    episodes = episodes[episodes["periods"] >= rule.get("min_periods", 1)]
+
+    template = rule.get("message", "{column} reached {peak:.4g} against the threshold of {threshold}")
+    episodes["message"] = [template.format(column=column, **row) for row in episodes.to_dict("records")]
+    return episodes.reset_index(drop=True)[EPISODE_COLUMNS]
+
+
+def resume_points(frame, rule):
+    """
+    Key -> index label of the first row of the breach the key is still in
+    at its latest value. After rows are appended to ``frame``, evaluating
+    each key from its resume point (and other keys from the new rows
+    only) gives the same episodes as evaluating the whole history.
+    """
+    series = _rule_series(frame, rule)
+    if series is None:
+        return {}
+    _, keys, _, compared = series
+    state = breach_state(compared, rule, keys)
+    started = state & ~state.groupby(keys).shift(fill_value=False)
+    starts = pd.Series(compared.index, index=compared.index)[started].groupby(keys[started]).last()
+    in_breach = state.groupby(keys).last()
+    return starts[in_breach[in_breach].index].to_dict()
+
+
+def resume_window(frame, rule, resume, first_new):
+    """
+    Rows of ``frame`` to re-evaluate after rows were appended from index
+    label ``first_new`` on, given the ``resume_points`` from before.
+    """
+    by = rule.get("by")
+    keys = frame[by].astype(str) if by and by in frame.columns else pd.Series("", index=frame.index)
+    since = keys.map(resume).fillna(first_new)
+    return frame[frame.index.to_numpy() >= since.to_numpy()]
+
+
+def evaluate_rules(frames, rules):
+    """Breach episodes of every rule whose source is in ``frames`` (source name -> frame)"""
+    episodes = [breach_episodes(frames[rule["source"]], rule)
+                for rule in rules if rule["source"] in frames and not rule.get("disabled")]
+    episodes = [e for e in episodes if not e.empty]
+    if not episodes:
+        return pd.DataFrame(columns=EPISODE_COLUMNS)
+    return pd.concat(episodes, ignore_index=True)
+
+
+def active_alerts(episodes):
+    """Episodes still in breach at the latest value, most severe first"""
+    active = episodes[episodes["active"].astype(bool)]
+    order = active["severity"].map({s: i for i, s in enumerate(SEVERITIES)}).fillna(len(SEVERITIES))
+    return active.iloc[np.argsort(order.to_numpy(), kind="stable")].reset_index(drop=True)
@@ -0,0 +1,249 @@
+"""
+Alert and audit history in an embedded SQLite file (``monitoring.db``).
+
+Four tables:
+
+- ``runs``: one row per pipeline / batch stage run with its status,
+  duration and the code version (``git describe``) it ran with;
+- ``run_inputs``: the content hash of every file a run read, so any
+  output can be traced back to the exact data it was computed from;
+- ``alerts``: breach episodes from ``frt.alerts.rules``, keyed by
+  (rule, key, start). Recording the same episode again updates its end,
+  peak and active flag in place and keeps the time it was first
+  detected, so re-evaluating the rules never duplicates an alert;
+- ``heartbeats``: the last poll of each long-running process (the alert
+  monitor) and its poll interval, so readers can tell a live process
+  from an idle or stopped one.
+
+Both ``runs`` and ``alerts`` are indexed on time and on (module, time);
+alerts also on (severity, time). The dashboard pages through months of
+history with ``query_alerts`` / ``query_runs`` instead of recomputing it.
+The file runs in WAL mode so the dashboard can read while a writer
+records.
+"""
+import hashlib
+import sqlite3
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from frt.paths import ROOT, STORE_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    module TEXT NOT NULL,
+    command TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    seconds REAL,
+    code_version TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_module_time ON runs (module, started_at);
+
+CREATE TABLE IF NOT EXISTS run_inputs (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (run_id, path)
+);
+CREATE INDEX IF NOT EXISTS run_inputs_hash ON run_inputs (sha256);
+
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    rule TEXT NOT NULL,
+    title TEXT,
+    severity TEXT NOT NULL,
+    module TEXT NOT NULL,
+    key TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT,
+    periods INTEGER,
+    peak REAL,
+    last REAL,
+    threshold REAL,
+    active INTEGER NOT NULL,
+    message TEXT,
+    detected_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    run_id INTEGER REFERENCES runs (id),
+    UNIQUE (rule, key, start)
+);
+CREATE INDEX IF NOT EXISTS alerts_time ON alerts (detected_at);
+CREATE INDEX IF NOT EXISTS alerts_module_time ON alerts (module, detected_at);
+CREATE INDEX IF NOT EXISTS alerts_severity_time ON alerts (severity, detected_at);
+
+CREATE TABLE IF NOT EXISTS heartbeats (
+    process TEXT PRIMARY KEY,
+    polled_at TEXT NOT NULL,
+    interval REAL NOT NULL,
+    stopped INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+ALERT_FIELDS = ["rule", "title", "severity", "module", "key", "start", "end", "periods",
+                "peak", "last", "threshold", "active", "message"]
+
+
+def _now():
+    return datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+def connect(path=STORE_FILE):
+    """Open (creating if needed) the store at ``path``"""
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def code_version(root=ROOT):
+    """``git describe`` of the working tree (``-dirty`` with local changes), or ``unknown``"""
+    try:
+        result = subprocess.run(["git", "describe", "--always", "--dirty", "--abbrev=12"], cwd=root,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    return result.stdout.strip() or "unknown"
+
+
+def content_hash(path):
+    """sha256 of the file at ``path``"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def record_run(connection, module, command, status, started_at, seconds, inputs=None, version=None):
+    """Store one run with ``inputs`` (path -> sha256); returns the run id"""
+    with connection:
+        cursor = connection.execute(
+            "INSERT INTO runs (module, command, status, started_at, seconds, code_version) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (module, command, status, started_at, seconds, version or code_version()))
+        connection.executemany("INSERT INTO run_inputs (run_id, path, sha256) VALUES (?, ?, ?)",
+                               [(cursor.lastrowid, str(path), sha) for path, sha in (inputs or {}).items()])
+    return cursor.lastrowid
+
+
+def source_modules(config, writers):
+    """
+    Alert source -> module for an alert config from ``load_rules``: the
+    module ``writers`` maps the source file to (paths relative to the
+    repository root, e.g. ``frt.pipeline.stages.output_writers()``), else
+    the file's directory.
+    """
+    writers = {ROOT / output: module for output, module in writers.items()}
+    return {name: writers.get(Path(path), Path(path).parent.name) for name, path in config["sources"].items()}
+
+
+def record_alerts(connection, episodes, modules, rules=None, run_id=None):
+    """
+    Upsert breach ``episodes``; ``modules`` maps each episode's source to a
+    module. Episodes of ``rules`` (names; default: the rules in
+    ``episodes``) that are stored as active but no longer evaluated as
+    active are closed. Returns the number of newly detected episodes.
+    """
+    now = _now()
+    rows = episodes.assign(module=episodes["source"].map(modules).fillna(episodes["source"]),
+                           active=episodes["active"].astype(bool).astype(int),
+                           start=episodes["start"].astype(str), end=episodes["end"].astype(str))
+    rows = [tuple(row) + (now, now, run_id)
+            for row in rows[ALERT_FIELDS].astype(object).itertuples(index=False)]
+    rules = list(episodes["rule"].unique()) if rules is None else list(rules)
+    columns = ", ".join(f'"{field}"' for field in ALERT_FIELDS)
+    with connection:
+        before = connection.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+        connection.executemany(
+            f"INSERT INTO alerts ({columns}, detected_at, updated_at, run_id) "
+            f"VALUES ({', '.join('?' * (len(ALERT_FIELDS) + 3))}) "
+            "ON CONFLICT (rule, key, start) DO UPDATE SET "
+            "severity = excluded.severity, \"end\" = excluded.\"end\", periods = excluded.periods, "
+            "peak = excluded.peak, last = excluded.last, threshold = excluded.threshold, "
+            "active = excluded.active, message = excluded.message, updated_at = excluded.updated_at, "
+            "run_id = excluded.run_id",
+            rows)
+        if rules:
+            still_active = {(row[0], row[4], row[5]) for row in rows if row[11]}
+            stale = [(now, alert_id) for alert_id, rule, key, start in connection.execute(
+                f"SELECT id, rule, key, start FROM alerts WHERE active = 1 AND rule IN ({', '.join('?' * len(rules))})",
+                rules) if (rule, key, start) not in still_active]
+            connection.executemany("UPDATE alerts SET active = 0, updated_at = ? WHERE id = ?", stale)
+        after = connection.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+    return after - before
+
+
+def record_heartbeat(connection, process, interval, stopped=False):
+    """Mark ``process`` as having polled now (every ``interval`` seconds), or as stopped"""
+    with connection:
+        connection.execute(
+            "INSERT INTO heartbeats (process, polled_at, interval, stopped) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (process) DO UPDATE SET polled_at = excluded.polled_at, "
+            "interval = excluded.interval, stopped = excluded.stopped",
+            (process, _now(), interval, int(stopped)))
+
+
+def monitor_status(connection, process="alerts", now=None):
+    """
+    Liveness of ``process`` from its heartbeat: None if it never ran, else a
+    dict with ``polled_at``, ``interval`` and ``running`` (it has not stopped
+    and polled within three intervals).
+    """
+    row = connection.execute("SELECT polled_at, interval, stopped FROM heartbeats WHERE process = ?",
+                             (process,)).fetchone()
+    if row is None:
+        return None
+    polled_at, interval, stopped = row
+    age = ((now or datetime.now()) - datetime.fromisoformat(polled_at)).total_seconds()
+    return {"polled_at": polled_at, "interval": interval,
+            "running": not stopped and age <= 3 * max(interval, 1.0)}
+
+
+def _where(filters):
+    clauses = [clause for clause, value in filters if value is not None]
+    values = [value for _, value in filters if value is not None]
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", values
+
+
+def _alert_filters(since, until, module, severity, active):
+    return [("detected_at >= ?", since), ("detected_at < ?", until), ("module = ?", module),
+            ("severity = ?", severity), ("active = ?", None if active is None else int(active))]
+
+
+def query_alerts(connection, since=None, until=None, module=None, severity=None, active=None,
+                 limit=50, offset=0):
+    """One page of stored alerts, newest first"""
+    where, values = _where(_alert_filters(since, until, module, severity, active))
+    return pd.read_sql_query(
+        f"SELECT * FROM alerts{where} ORDER BY detected_at DESC, id DESC LIMIT ? OFFSET ?",
+        connection, params=values + [limit, offset])
+
+
+def count_alerts(connection, since=None, until=None, module=None, severity=None, active=None):
+    where, values = _where(_alert_filters(since, until, module, severity, active))
+    return connection.execute(f"SELECT COUNT(*) FROM alerts{where}", values).fetchone()[0]
+
+
+def query_runs(connection, since=None, until=None, module=None, limit=50, offset=0):
+    """One page of recorded runs, newest first, with the number of hashed inputs"""
+    where, values = _where([("started_at >= ?", since), ("started_at < ?", until), ("module = ?", module)])
+    return pd.read_sql_query(
+        f"SELECT runs.*, (SELECT COUNT(*) FROM run_inputs WHERE run_id = runs.id) AS inputs "
+        f"FROM runs{where} ORDER BY started_at DESC, id DESC LIMIT ? OFFSET ?",
+        connection, params=values + [limit, offset])
+
+
+def count_runs(connection, since=None, until=None, module=None):
+    where, values = _where([("started_at >= ?", since), ("started_at < ?", until), ("module = ?", module)])
+    return connection.execute(f"SELECT COUNT(*) FROM runs{where}", values).fetchone()[0]
+
+
+def run_inputs(connection, run_id):
+    """Input files and content hashes of one run"""
+    return pd.read_sql_query("SELECT path, sha256 FROM run_inputs WHERE run_id = ? ORDER BY path",
+                             connection, params=[run_id])
@@ -0,0 +1 @@
+"""Backtesting engine: strategies, position sizing and transaction costs."""
@@ -0,0 +1,239 @@
+"""
+Transaction cost models for the backtester.
+
+``calculate_transaction_costs`` dispatches on
+``config['transaction_costs']['model']``:
+
+- ``flat``: the original commission + slippage + impact bps charge scaled by
+  ``abs(returns)``.
+- ``sqrt_impact``: a liquidity-aware model using per-instrument
+  ``avg_daily_volume``, ``volatility_30d`` and ``liquidity_score``.
+
+The square-root model charges, per instrument and period, on a turnover
+``q`` (fraction of NAV traded)::
+
+    cost = q * (commission_bps + spread_bps_i) / 1e4
+         + eta * sigma_i * sqrt(q * notional / ADV_i) * q
+
+where ``sigma_i`` is the daily volatility (``volatility_30d / sqrt(252)``),
+``spread_bps_i = slippage_bps * reference_liquidity_score / liquidity_score_i``
+and ``avg_daily_volume`` is treated as traded value in USD. Costs are in the
+same units as the P&L of a weight portfolio (fraction of NAV).
+
+``rebalance_cost_coefficients`` exposes the same model as per-instrument
+``linear`` and ``impact`` coefficients, ``cost = linear * q + impact * q^1.5``,
+for the portfolio optimizer. With ``impact_parameters`` (the table written
+by ``frt.tca.impact.calibrate_impact``) the calibrated instruments use their
+own ``eta_i`` and exponent ``beta_i``,
+``impact_i = eta_i * sigma_i * (notional / ADV_i)^beta_i`` and
+``cost = linear * q + impact * q^(1 + beta)``, in both the backtester and
+the optimizer.
+"""
+import numpy as np
+import pandas as pd
+
+from frt.paths import INSTRUMENTS_FILE
+from frt.tca.impact import load_impact_parameters
+
+TRADING_DAYS = 252
+
+DEFAULT_COST_PARAMS = {
+    "model": "flat",
+    "commission_bps": 5,
+    "slippage_bps": 3,
+    "market_impact_bps": 2,
+    # sqrt_impact parameters
+    "impact_eta": 0.5,
+    "portfolio_notional": 10_000_000,
+    "reference_liquidity_score": 50.0,
+    "impact_parameters": None,      # path to calibrated per-instrument eta/beta
+}
+
+LIQUIDITY_COLUMNS = ["avg_daily_volume", "volatility_30d", "liquidity_score"]
+
+_liquidity_cache = {}
+
+
+def load_instrument_liquidity(path=INSTRUMENTS_FILE):
+    """Load the per-instrument liquidity table indexed by instrument_id"""
+    key = str(path)
+    if key not in _liquidity_cache:
+        instruments = pd.read_csv(path)
+        _liquidity_cache[key] = instruments.set_index("instrument_id")[LIQUIDITY_COLUMNS]
+    return _liquidity_cache[key]
+
+
+def _cost_params(config):
+    params = dict(DEFAULT_COST_PARAMS)
+    params.update(config.get("transaction_costs", {}))
+    return params
+
+
+def _liquidity_arrays(columns, liquidity):
+    """Align liquidity inputs to the returns columns, filling gaps with medians"""
+    aligned = liquidity.reindex(columns)
+    aligned = aligned.fillna(liquidity.median())
+    adv = aligned["avg_daily_volume"].to_numpy(dtype=float)
+    sigma = aligned["volatility_30d"].to_numpy(dtype=float) / np.sqrt(TRADING_DAYS)
+    score = aligned["liquidity_score"].to_numpy(dtype=float)
+    return adv, sigma, score
+
+
+def flat_cost_model(turnover, returns, params, liquidity=None):
+    """Flat bps charge proportional to turnover and absolute returns"""
+    total_cost_bps = params["commission_bps"] + params["slippage_bps"] + params["market_impact_bps"]
+    return (total_cost_bps / 10000) * turnover * np.abs(returns)
+
+
+def rebalance_cost_coefficients(assets, params=None, liquidity=None):
+    """
+    Per-instrument sqrt_impact coefficients aligned to ``assets``.
+
+    Returns a dict with ``linear`` (commission + spread per unit of weight
+    traded) and ``impact`` (cost per unit of ``q^1.5``), both as fractions
+    of NAV. ``params`` defaults to ``DEFAULT_COST_PARAMS`` and may be the
+    output of ``calibrate_from_tca``. If ``params['impact_parameters']``
+    points to a calibrated table, the result also has a per-instrument
+    ``exponent`` (``beta``; 0.5 for instruments without a fit).
+    """
+    params = {**DEFAULT_COST_PARAMS, **(params or {})}
+    if liquidity is None:
+        liquidity = load_instrument_liquidity()
+    adv, sigma, score = _liquidity_arrays(assets, liquidity)
+
+    spread_bps = params["slippage_bps"] * params["reference_liquidity_score"] / np.clip(score, 1.0, None)
+    size = params["portfolio_notional"] / np.clip(adv, 1.0, None)
+    coefficients = {
+        "linear": (params["commission_bps"] + spread_bps) / 10000,
+        "impact": params["impact_eta"] * sigma * np.sqrt(size),
+    }
+
+    fitted = load_impact_parameters(params["impact_parameters"]) if params.get("impact_parameters") else None
+    if fitted is not None:
+        fitted = fitted.reindex(assets)
+        eta = fitted["eta"].to_numpy(dtype=float)
+        beta = fitted["beta"].to_numpy(dtype=float)
+        calibrated = ~(np.isnan(eta) | np.isnan(beta))
+        exponent = np.where(calibrated, beta, 0.5)
+        coefficients["impact"] = np.where(calibrated, eta * sigma * size ** exponent, coefficients["impact"])
+        coefficients["exponent"] = exponent
+    return coefficients
+
+
+def amortized(coefficients, holding_periods):
+    """
+    Coefficients of the per-period cost of a rebalance held for
+    ``holding_periods`` return periods: the one-off cost spread evenly, so it
+    is comparable with a per-period expected return.
+    """
+    scaled = dict(coefficients)
+    scaled["linear"] = coefficients["linear"] / holding_periods
+    scaled["impact"] = coefficients["impact"] / holding_periods
+    return scaled
+
+
+def rebalance_cost(trades, coefficients):
+    """Expected cost of each weight change in ``trades`` (fraction of NAV)"""
+    q = np.abs(np.asarray(trades, dtype=float))
+    exponent = coefficients.get("exponent")
+    impact = np.sqrt(q) if exponent is None else q ** exponent
+    return q * (coefficients["linear"] + coefficients["impact"] * impact)
+
+
+def sqrt_impact_cost_model(turnover, returns, params, liquidity=None):
+    """Linear spread/commission plus square-root market impact per instrument"""
+    coefficients = rebalance_cost_coefficients(turnover.columns, params, liquidity)
+    cost = rebalance_cost(turnover.to_numpy(dtype=float), coefficients)
+    return pd.DataFrame(cost, index=turnover.index, columns=turnover.columns)
+
+
+COST_MODELS = {
+    "flat": flat_cost_model,
+    "sqrt_impact": sqrt_impact_cost_model,
+}
+
+
+def calculate_transaction_costs(signals, returns, config, liquidity=None):
+    """
+    Calculate transaction costs for a positions frame.
+
+    Returns the total cost per period and the per-asset cost frame.
+    """
+    params = _cost_params(config)
+    model = COST_MODELS.get(params["model"])
+    if model is None:
+        raise ValueError(f"Unknown transaction cost model: {params['model']}")
+
+    # Calculate turnover (position changes)
+    turnover = abs(signals.diff()).fillna(0)
+
+    tc_per_asset = model(turnover, returns, params, liquidity)
+    tc_total = tc_per_asset.sum(axis=1)
+
+    return tc_total, tc_per_asset
+
+
+def calibrate_from_tca(trades, instruments, reference_liquidity_score=50.0):
+    """
+    Fit sqrt_impact parameters from executed trades.
+
+    The configured ``model`` is left alone: the fitted commission and
+    slippage apply to either model, and the impact coefficient also drives
+    ``capacity_analysis``, which always uses sqrt_impact.
+
+    ``trades`` needs the TCA columns (quantity, execution_price,
+    commission_usd, slippage_bps, market_impact_bps). The impact coefficient
+    is a least-squares fit through the origin of
+    ``market_impact_bps / 1e4`` on ``sigma * sqrt(notional / ADV)``.
+    """
+    liquidity = instruments.set_index("instrument_id")[LIQUIDITY_COLUMNS]
+    merged = trades.join(liquidity, on="instrument_id", how="inner")
+
+    notional = (merged["execution_price"] * merged["quantity"]).abs()
+    valid = (notional > 0) & (merged["avg_daily_volume"] > 0)
+    merged = merged[valid]
+    notional = notional[valid]
+
+    commission_bps = float((merged["commission_usd"] / notional * 10000).median())
+
+    # Observed slippage rescaled to the reference liquidity level
+    liquidity_ratio = merged["liquidity_score"].clip(lower=1.0) / reference_liquidity_score
+    slippage_bps = float((merged["slippage_bps"].abs() * liquidity_ratio).mean())
+
+    sigma = merged["volatility_30d"] / np.sqrt(TRADING_DAYS)
+    x = (sigma * np.sqrt(notional / merged["avg_daily_volume"])).to_numpy()
+    y = (merged["market_impact_bps"] / 10000).to_numpy()
+    impact_eta = float(np.dot(x, y) / np.dot(x, x)) if np.dot(x, x) > 0 else DEFAULT_COST_PARAMS["impact_eta"]
+
+    return {
+        "commission_bps": commission_bps,
+        "slippage_bps": slippage_bps,
+        "impact_eta": impact_eta,
+        "reference_liquidity_score": reference_liquidity_score,
+        "calibration_trades": int(len(merged)),
+    }
+
+
+def capacity_analysis(positions, returns, config, notionals, liquidity=None):
+    """
+    Evaluate gross vs. net performance of a positions frame at several AUM levels.
+
+    Uses the sqrt_impact model regardless of the configured model, since the
+    flat model does not depend on traded size.
+    """
+    gross = float((positions.shift(1) * returns).sum(axis=1).sum())
+    rows = []
+    for notional in notionals:
+        scaled = dict(config)
+        scaled["transaction_costs"] = {**_cost_params(config), "model": "sqrt_impact",
+                                       "portfolio_notional": notional}
+        tc_total, _ = calculate_transaction_costs(positions, returns, scaled, liquidity)
+        total_cost = float(tc_total.sum())
+        rows.append({
+            "notional": notional,
+            "gross_return": gross,
+            "total_cost": total_cost,
+            "net_return": gross - total_cost,
+            "cost_drag_bps": total_cost / len(tc_total) * 10000 if len(tc_total) else 0.0,
+        })
+    return pd.DataFrame(rows)
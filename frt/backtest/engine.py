@@ -0,0 +1,277 @@
+"""
+Backtest engine: position sizing, risk constraints, standard and
+walk-forward backtests, and performance metrics.
+"""
+import numpy as np
+import pandas as pd
+
+from frt.backtest.costs import calculate_transaction_costs
+from frt.profiling import profiled
+
+
+VOL_WINDOW = 20
+
+
+def volatility_targeted_sizing(returns, signals, target_vol=0.10, rolling_std=None):
+    """
+    Size positions based on volatility targeting
+
+    ``rolling_std`` may be passed in when the 20-period rolling std has
+    already been computed (e.g. shared with a strategy's features).
+    """
+    # Calculate rolling volatility (annualized)
+    if rolling_std is None:
+        rolling_std = returns.rolling(window=VOL_WINDOW).std()
+    rolling_vol = rolling_std * np.sqrt(252)
+
+    # Scale positions inversely to volatility
+    vol_scalar = target_vol / (rolling_vol + 1e-8)
+    vol_scalar = vol_scalar.clip(0.5, 2.0)  # Limit scaling between 0.5x and 2x
+
+    # Apply to signals
+    sized_signals = signals * vol_scalar
+
+    return sized_signals
+
+
+def apply_position_limits(positions, config):
+    """
+    Apply position size limits
+    """
+    max_pos = config['position_sizing']['max_position_size']
+    min_pos = config['position_sizing']['min_position_size']
+
+    # Clip positions
+    positions_clipped = positions.clip(-max_pos, max_pos)
+
+    # Set small positions to zero
+    positions_clipped[abs(positions_clipped) < min_pos] = 0
+
+    # Normalize to ensure leverage limit
+    leverage_limit = config['risk_constraints']['leverage_limit']
+    total_exposure = abs(positions_clipped).sum(axis=1)
+
+    # Scale down if over leverage limit
+    scale_factor = np.minimum(1.0, leverage_limit / (total_exposure + 1e-8))
+    positions_final = positions_clipped.multiply(scale_factor, axis=0)
+
+    return positions_final
+
+
+def max_drawdown(series):
+    """Calculate maximum drawdown"""
+    roll_max = series.cummax()
+    drawdown = (series - roll_max) / (roll_max + 1e-8)
+    return drawdown.min()
+
+
+def check_risk_constraints(cum_pnl, daily_pnl, positions, config, instrument_map):
+    """
+    Check and enforce risk constraints
+    """
+    constraints_violated = []
+
+    # 1. Max Drawdown Check
+    max_dd = max_drawdown(cum_pnl)
+    max_dd_limit = config['risk_constraints']['max_drawdown_pct']
+    if abs(max_dd) > max_dd_limit:
+        constraints_violated.append(f"Max Drawdown: {max_dd:.2%} exceeds limit {max_dd_limit:.2%}")
+
+    # 2. Volatility Check
+    vol = daily_pnl.std() * np.sqrt(252)
+    max_vol = config['risk_constraints']['max_volatility']
+    if vol > max_vol:
+        constraints_violated.append(f"Volatility: {vol:.2%} exceeds limit {max_vol:.2%}")
+
+    # 3. Sector Exposure Check
+    max_sector_exp = config['risk_constraints']['max_sector_exposure']
+    for timestamp in positions.index[-10:]:  # Check recent positions
+        pos = positions.loc[timestamp]
+        for sector in set([instrument_map.get(inst, {}).get('sector', 'Unknown') for inst in pos.index]):
+            sector_instruments = [inst for inst in pos.index
+                                  if instrument_map.get(inst, {}).get('sector') == sector]
+            sector_exposure = abs(pos[sector_instruments]).sum()
+            if sector_exposure > max_sector_exp:
+                constraints_violated.append(
+                    f"Sector {sector} exposure: {sector_exposure:.2%} exceeds limit {max_sector_exp:.2%}"
+                )
+                break
+
+    # 4. Asset Exposure Check
+    max_asset_exp = config['risk_constraints']['max_asset_exposure']
+    max_position = abs(positions).max().max()
+    if max_position > max_asset_exp:
+        constraints_violated.append(f"Max asset exposure: {max_position:.2%} exceeds limit {max_asset_exp:.2%}")
+
+    return constraints_violated
+
+
+@profiled(rows="returns")
+def backtest_strategy(returns, strategy_func, config, instrument_map):
+    """
+    Enhanced backtesting with full cost modeling and risk constraints
+    """
+    print(f"\n🔄 Running backtest...")
+
+    # Generate raw signals
+    signals = returns.apply(lambda x: strategy_func(x, config))
+    signals = signals.fillna(0)
+
+    return backtest_signals(returns, signals, config, instrument_map)
+
+
+@profiled(rows="returns")
+def backtest_signals(returns, signals, config, instrument_map, rolling_std=None):
+    """
+    Size, limit and cost a precomputed signals frame and check risk constraints
+    """
+    # Apply position sizing
+    if config['position_sizing']['method'] == 'volatility_targeted':
+        signals = volatility_targeted_sizing(
+            returns, signals,
+            config['position_sizing']['target_volatility'],
+            rolling_std=rolling_std
+        )
+
+    # Apply position limits
+    positions = apply_position_limits(signals, config)
+
+    # Calculate P&L before costs
+    pnl_gross = (positions.shift(1) * returns).sum(axis=1)
+
+    # Calculate transaction costs
+    tc_total, tc_per_asset = calculate_transaction_costs(positions, returns, config)
+
+    # Net P&L after costs
+    pnl_net = pnl_gross - tc_total
+
+    # Cumulative P&L
+    cum_pnl = pnl_net.cumsum()
+
+    # Check risk constraints
+    constraints_violated = check_risk_constraints(
+        cum_pnl, pnl_net, positions, config, instrument_map
+    )
+
+    return {
+        'cum_pnl': cum_pnl,
+        'daily_pnl': pnl_net,
+        'positions': positions,
+        'transaction_costs': tc_total,
+        'gross_pnl': pnl_gross,
+        'constraints_violated': constraints_violated
+    }
+
+
+@profiled(rows="returns")
+def walk_forward_validation(returns, strategy_func, config, instrument_map):
+    """
+    Walk-forward validation with rolling windows
+    """
+    train_pct = config['walk_forward']['train_size']
+    overlap = config['walk_forward']['overlap']
+    min_periods = config['walk_forward']['min_train_periods']
+
+    n = len(returns)
+    train_size = int(train_pct * n)
+    step_size = int(train_size * (1 - overlap))
+
+    print(f"\n📊 Walk-Forward Configuration:")
+    print(f"  Total periods: {n}")
+    print(f"  Train size: {train_size} ({train_pct*100:.0f}%)")
+    print(f"  Test size per window: {step_size}")
+    print(f"  Overlap: {overlap*100:.0f}%")
+
+    all_pnls = []
+    all_positions = []
+    all_costs = []
+    window_count = 0
+
+    for start in range(0, n - train_size, step_size):
+        end_train = start + train_size
+        end_test = min(end_train + step_size, n)
+
+        if end_test - end_train < min_periods:
+            break
+
+        window_count += 1
+
+        # Testing data
+        test_data = returns.iloc[end_train:end_test]
+
+        # Generate signals on test data
+        signals = test_data.apply(lambda x: strategy_func(x, config))
+        signals = signals.fillna(0)
+
+        # Apply position sizing
+        if config['position_sizing']['method'] == 'volatility_targeted':
+            signals = volatility_targeted_sizing(
+                test_data, signals,
+                config['position_sizing']['target_volatility']
+            )
+
+        # Apply position limits
+        positions = apply_position_limits(signals, config)
+
+        # Calculate P&L
+        pnl_gross = (positions.shift(1) * test_data).sum(axis=1)
+        tc_total, _ = calculate_transaction_costs(positions, test_data, config)
+        pnl_net = pnl_gross - tc_total
+
+        all_pnls.append(pnl_net)
+        all_positions.append(positions)
+        all_costs.append(tc_total)
+
+    print(f"  ✅ Completed {window_count} walk-forward windows")
+
+    # Combine results
+    combined_pnl = pd.concat(all_pnls).sort_index()
+    combined_positions = pd.concat(all_positions).sort_index()
+    combined_costs = pd.concat(all_costs).sort_index()
+
+    return {
+        'cum_pnl': combined_pnl.cumsum(),
+        'daily_pnl': combined_pnl,
+        'positions': combined_positions,
+        'transaction_costs': combined_costs,
+        'gross_pnl': combined_pnl + combined_costs,
+        'constraints_violated': []  # Can add constraint checks here
+    }
+
+
+def calculate_metrics(results):
+    """Calculate comprehensive performance metrics"""
+    cum_pnl = results['cum_pnl']
+    daily_pnl = results['daily_pnl']
+
+    metrics = {
+        'Total Return': cum_pnl.iloc[-1],
+        'Volatility': daily_pnl.std() * np.sqrt(252),  # Annualized
+        'Sharpe': (daily_pnl.mean() / daily_pnl.std()) * np.sqrt(252),  # Annualized
+        'Max Drawdown': max_drawdown(cum_pnl),
+        'Win Rate': (daily_pnl > 0).sum() / len(daily_pnl),
+        'Avg Transaction Cost': results['transaction_costs'].mean(),
+        'Total Transaction Cost': results['transaction_costs'].sum(),
+        'Gross Return': results['gross_pnl'].sum(),
+        'Net Return': daily_pnl.sum(),
+        'Avg Daily Return': daily_pnl.mean(),
+        'Best Day': daily_pnl.max(),
+        'Worst Day': daily_pnl.min()
+    }
+
+    return metrics
+
+
+def metrics_table(results_by_strategy):
+    """Summary table (Strategy, Total Return, Volatility, Sharpe, Max Drawdown) for several results"""
+    rows = []
+    for strategy, results in results_by_strategy.items():
+        metrics = calculate_metrics(results)
+        rows.append({
+            "Strategy": strategy,
+            "Total Return": metrics['Total Return'],
+            "Volatility": metrics['Volatility'],
+            "Sharpe": metrics['Sharpe'],
+            "Max Drawdown": metrics['Max Drawdown'],
+        })
+    return pd.DataFrame(rows, columns=["Strategy", "Total Return", "Volatility", "Sharpe", "Max Drawdown"])
@@ -0,0 +1,184 @@
+"""
+Strategy registry.
+
+Each strategy is registered with its default parameters, a warm-up length,
+the intermediate features it needs and a vectorized signal function that
+works on the whole returns frame at once::
+
+    @register_strategy(
+        "momentum",
+        params={"lookback_period": 1, "threshold": 0.0},
+        warmup=lambda p: p["lookback_period"],
+        features=lambda p: [("shift", p["lookback_period"])],
+    )
+    def momentum_signals(returns, features, params):
+        ...
+
+``run_strategies`` collects the feature keys of every requested strategy
+(plus the rolling std used by volatility-targeted sizing), computes each
+distinct feature once, and then backtests every strategy from the shared
+feature cache. Running 20 strategies that all use a 20-period rolling
+mean/std therefore costs one rolling pass, not 20.
+
+Signals are flat (0) during a strategy's warm-up, in the standard backtest
+and in every walk-forward test window alike (``walk_forward_strategies``).
+"""
+import numpy as np
+import pandas as pd
+
+from frt.backtest.engine import VOL_WINDOW, backtest_signals, walk_forward_validation
+from frt.profiling import profiled
+
+STRATEGY_REGISTRY = {}
+
+
+def register_strategy(name, params, warmup, features):
+    """
+    Register a vectorized signal function under ``name``.
+
+    ``params`` are the defaults (overridden by ``config['strategies'][name]``),
+    ``warmup`` and ``features`` are ints/lists or callables of the resolved
+    params. Feature keys are tuples such as ``("rolling_mean", 20)``.
+    """
+    def decorator(signal_func):
+        STRATEGY_REGISTRY[name] = {
+            "name": name,
+            "params": dict(params),
+            "warmup": warmup,
+            "features": features,
+            "signal": signal_func,
+        }
+        return signal_func
+    return decorator
+
+
+def list_strategies():
+    """Names of all registered strategies"""
+    return sorted(STRATEGY_REGISTRY)
+
+
+def resolve_params(name, config, overrides=None):
+    """Registered defaults <- config['strategies'][name] <- overrides"""
+    params = dict(STRATEGY_REGISTRY[name]["params"])
+    params.update(config.get("strategies", {}).get(name, {}))
+    params.update(overrides or {})
+    return params
+
+
+def _evaluate(spec_value, params):
+    return spec_value(params) if callable(spec_value) else spec_value
+
+
+def strategy_warmup(name, params):
+    """Number of leading periods without a valid signal"""
+    return int(_evaluate(STRATEGY_REGISTRY[name]["warmup"], params))
+
+
+def strategy_features(name, params):
+    """Feature keys needed by a strategy for the given params"""
+    return [tuple(key) for key in _evaluate(STRATEGY_REGISTRY[name]["features"], params)]
+
+
+@profiled(rows="returns")
+def compute_features(returns, keys):
+    """
+    Compute each distinct feature key once.
+
+    Rolling mean and std at the same window share one rolling window object.
+    """
+    features = {}
+    rolling = {}
+    for key in dict.fromkeys(keys):
+        kind, arg = key
+        if kind == "shift":
+            features[key] = returns.shift(arg)
+        elif kind in ("rolling_mean", "rolling_std"):
+            window = rolling.setdefault(arg, returns.rolling(window=arg))
+            features[key] = window.mean() if kind == "rolling_mean" else window.std()
+        else:
+            raise ValueError(f"Unknown feature: {key}")
+    return features
+
+
+@profiled(rows="returns")
+def run_strategies(returns, names, config, instrument_map, overrides=None):
+    """
+    Backtest several registered strategies over one returns frame.
+
+    ``overrides`` maps strategy name -> parameter overrides. Returns a dict of
+    strategy name -> backtest results (same shape as ``backtest_strategy``).
+    """
+    overrides = overrides or {}
+    resolved = {name: resolve_params(name, config, overrides.get(name)) for name in names}
+
+    keys = []
+    for name, params in resolved.items():
+        keys.extend(strategy_features(name, params))
+    vol_key = ("rolling_std", VOL_WINDOW)
+    if config['position_sizing']['method'] == 'volatility_targeted':
+        keys.append(vol_key)
+
+    print(f"\n🔄 Running {len(names)} strategies with {len(set(keys))} shared features "
+          f"({len(keys)} requested)...")
+    features = compute_features(returns, keys)
+
+    results = {}
+    for name, params in resolved.items():
+        signals = strategy_signals(returns, name, params, features)
+        results[name] = backtest_signals(returns, signals, config, instrument_map,
+                                         rolling_std=features.get(vol_key))
+    return results
+
+
+def strategy_signals(returns, name, params, features):
+    """Signal frame of a registered strategy, flat during its warm-up"""
+    signals = pd.DataFrame(STRATEGY_REGISTRY[name]["signal"](returns, features, params),
+                           index=returns.index, columns=returns.columns)
+    signals.iloc[:strategy_warmup(name, params)] = 0
+    return signals.fillna(0)
+
+
+def walk_forward_strategies(returns, names, config, instrument_map, overrides=None):
+    """
+    Walk-forward results (see ``engine.walk_forward_validation``) of several
+    registered strategies, with the same signals and warm-up as
+    ``run_strategies`` applied to each test window.
+    """
+    overrides = overrides or {}
+    results = {}
+    for name in names:
+        params = resolve_params(name, config, overrides.get(name))
+
+        def strategy_func(series, config, name=name, params=params):
+            frame = series.to_frame()
+            features = compute_features(frame, strategy_features(name, params))
+            return strategy_signals(frame, name, params, features).iloc[:, 0].to_numpy()
+
+        results[name] = walk_forward_validation(returns, strategy_func, config, instrument_map)
+    return results
+
+
+@register_strategy(
+    "momentum",
+    params={"lookback_period": 1, "holding_period": 1, "threshold": 0.0},
+    warmup=lambda p: p["lookback_period"],
+    features=lambda p: [("shift", p["lookback_period"])],
+)
+def momentum_signals(returns, features, params):
+    """Long if the lagged return is above the threshold, short otherwise"""
+    lagged = features[("shift", params["lookback_period"])]
+    return np.where(lagged > params["threshold"], 1, -1)
+
+
+@register_strategy(
+    "mean_reversion",
+    params={"lookback_period": 1, "mean_window": 20, "std_threshold": 1.5},
+    warmup=lambda p: p["mean_window"] - 1,
+    features=lambda p: [("rolling_mean", p["mean_window"]), ("rolling_std", p["mean_window"])],
+)
+def mean_reversion_signals(returns, features, params):
+    """Long when the rolling z-score is below -threshold, short above +threshold"""
+    window = params["mean_window"]
+    z_score = (returns - features[("rolling_mean", window)]) / (features[("rolling_std", window)] + 1e-8)
+    threshold = params["std_threshold"]
+    return np.where(z_score < -threshold, 1, np.where(z_score > threshold, -1, 0))
@@ -0,0 +1,74 @@
+"""
+Headless backtest stage: standard and walk-forward backtests without plotting.
+
+The configuration is the ``backtest_config.json`` the backtest notebook
+saves, so batch runs use the same settings. Relative paths in it (the
+TCA impact parameters) are relative to the config file's directory.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+from frt.backtest.costs import calibrate_from_tca
+from frt.backtest.engine import calculate_metrics, metrics_table
+from frt.backtest.registry import run_strategies, walk_forward_strategies
+from frt.data import load_instruments, load_trades, returns_matrix
+from frt.paths import BACKTEST_DIR, INSTRUMENTS_FILE, TRADES_FILE
+from frt.profiling import add_rows, profiled
+
+CONFIG_FILE = BACKTEST_DIR / "backtest_config.json"
+
+
+def load_config(path=CONFIG_FILE):
+    """Backtest config with a relative ``impact_parameters`` path resolved against the file's directory"""
+    path = Path(path)
+    with open(path) as f:
+        config = json.load(f)
+    costs = config.get("transaction_costs", {})
+    if costs.get("impact_parameters") and not Path(costs["impact_parameters"]).is_absolute():
+        costs["impact_parameters"] = str((path.parent / costs["impact_parameters"]).resolve())
+    return config
+
+
+@profiled
+def run_backtest(trades_path=TRADES_FILE, instruments_path=INSTRUMENTS_FILE, output_dir=BACKTEST_DIR,
+                 config_path=CONFIG_FILE):
+    """
+    Write ``backtest_results.csv``, ``backtest_results_walkforward.csv`` and
+    ``backtest_detailed_metrics.json`` for every strategy in the config;
+    returns the written paths.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    config = load_config(config_path)
+    np.random.seed(config.get("random_seed", 42))
+    trades = load_trades(trades_path)
+    add_rows(len(trades))
+    instruments = load_instruments(instruments_path)
+    returns = returns_matrix(trades)
+    instrument_map = instruments.set_index('instrument_id')[['instrument_name', 'sector', 'asset_class']].to_dict('index')
+
+    costs = config['transaction_costs']
+    if costs.get('calibrate_from_tca'):
+        costs.update(calibrate_from_tca(trades, instruments))
+
+    names = list(config['strategies'])
+    labels = {name: name.replace("_", " ").title() for name in names}
+    standard = run_strategies(returns, names, config, instrument_map)
+    walk_forward = walk_forward_strategies(returns, names, config, instrument_map)
+
+    paths = [output_dir / "backtest_results.csv", output_dir / "backtest_results_walkforward.csv",
+             output_dir / "backtest_detailed_metrics.json"]
+    metrics_table({labels[name]: standard[name] for name in names}).to_csv(paths[0], index=False)
+    metrics_table({f"{labels[name]} (WF)": results for name, results in walk_forward.items()}).to_csv(
+        paths[1], index=False)
+
+    detailed_metrics = {}
+    for name in names:
+        detailed_metrics[f"{name}_standard"] = calculate_metrics(standard[name])
+        detailed_metrics[f"{name}_walkforward"] = calculate_metrics(walk_forward[name])
+    with open(paths[2], 'w') as f:
+        json.dump({key: {k: float(v) if isinstance(v, (np.integer, np.floating)) else v for k, v in val.items()}
+                   for key, val in detailed_metrics.items()}, f, indent=4)
+    return paths
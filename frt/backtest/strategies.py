@@ -0,0 +1,38 @@
+"""Signal functions applied per instrument return series."""
+import numpy as np
+
+
+def momentum_strategy(ret_series, config):
+    """
+    Enhanced Momentum Strategy:
+    - Go long if recent returns are positive
+    - Go short if recent returns are negative
+    - Includes lookback period and threshold
+    """
+    lookback = config['strategies']['momentum']['lookback_period']
+    threshold = config['strategies']['momentum']['threshold']
+
+    signals = np.where(ret_series.shift(lookback) > threshold, 1, -1)
+    return signals
+
+
+def mean_reversion_strategy(ret_series, config):
+    """
+    Enhanced Mean Reversion Strategy:
+    - Go long if price below mean - threshold*std
+    - Go short if price above mean + threshold*std
+    - Uses rolling statistics
+    """
+    mean_window = config['strategies']['mean_reversion']['mean_window']
+    std_threshold = config['strategies']['mean_reversion']['std_threshold']
+
+    rolling_mean = ret_series.rolling(window=mean_window).mean()
+    rolling_std = ret_series.rolling(window=mean_window).std()
+
+    z_score = (ret_series - rolling_mean) / (rolling_std + 1e-8)
+
+    # Mean reversion: buy when oversold, sell when overbought
+    signals = np.where(z_score < -std_threshold, 1,
+                       np.where(z_score > std_threshold, -1, 0))
+
+    return signals
@@ -0,0 +1 @@
+"""Scaling benchmarks for the engine code on synthetic data."""
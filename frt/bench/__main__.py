@@ -0,0 +1,63 @@
+"""
+Run the backtest scaling benchmarks.
+
+    python -m frt.bench --sizes xs s 2000x5000 --repeat 3 --tolerance 0.1
+
+Exits with status 1 when any stage regresses past the tolerance.
+"""
+import argparse
+import sys
+
+from frt.bench.harness import (DEFAULT_HISTORY_FILE, append_history, compare_runs,
+                               load_history, run_benchmarks)
+from frt.bench.synthetic import PANEL_SIZES
+
+
+def parse_size(text):
+    """Parse a preset name (xs, s, m, l, xl) or an INSTRUMENTSxPERIODS pair"""
+    if text in PANEL_SIZES:
+        return PANEL_SIZES[text]
+    n_instruments, n_periods = text.lower().split("x")
+    return int(n_instruments), int(n_periods)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest engine scaling benchmarks")
+    parser.add_argument("--sizes", nargs="+", default=["xs", "s"],
+                        help=f"presets {sorted(PANEL_SIZES)} or NxT pairs")
+    parser.add_argument("--stages", nargs="+", default=None, help="substring filter on stage names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY_FILE))
+    parser.add_argument("--baseline", default=None, help="run_id to compare against (default: previous run)")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown, e.g. 0.1 = 10%%")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes]
+    history = load_history(args.history)
+    records = run_benchmarks(sizes, repeat=args.repeat, seed=args.seed, stage_filter=args.stages)
+    append_history(records, args.history)
+
+    print(f"{'stage':45s} {'size':>15s} {'time (s)':>10s} {'peak MB':>10s}")
+    for r in records:
+        size = f"{r['n_instruments']}x{r['n_periods']}"
+        print(f"{r['stage']:45s} {size:>15s} {r['wall_time_min_s']:10.3f} {r['peak_memory_mb']:10.1f}")
+    print(f"\nrun_id {records[0]['run_id'] if records else '-'} appended to {args.history}")
+
+    comparison = compare_runs(records, history, args.baseline, args.tolerance)
+    if comparison.empty:
+        print("No baseline run to compare against.")
+        return 0
+
+    regressions = comparison[comparison["regression"]]
+    if regressions.empty:
+        print(f"No regressions beyond {args.tolerance:.0%} tolerance.")
+        return 0
+
+    print(f"\n⚠️  {len(regressions)} regression(s) beyond {args.tolerance:.0%} tolerance:")
+    print(regressions.to_string(index=False))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
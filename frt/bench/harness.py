@@ -0,0 +1,189 @@
+"""
+Benchmark harness for the backtest engine.
+
+Each stage is timed ``repeat`` times and then run once more under
+``tracemalloc`` for peak memory, so the memory tracing does not distort the
+timings. Results are appended as JSON lines to a history file; ``compare_runs``
+flags stages that got slower or hungrier than a baseline run by more than a
+tolerance.
+"""
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from frt.backtest import engine
+from frt.backtest.registry import run_strategies
+from frt.backtest.strategies import mean_reversion_strategy, momentum_strategy
+from frt.bench.synthetic import make_instrument_map, make_returns_panel
+from frt.paths import BACKTEST_DIR, ROOT
+
+DEFAULT_HISTORY_FILE = ROOT / "benchmark_history.jsonl"
+DEFAULT_CONFIG_FILE = BACKTEST_DIR / "backtest_config.json"
+
+STRATEGIES = {
+    "momentum": momentum_strategy,
+    "mean_reversion": mean_reversion_strategy,
+}
+
+
+def load_backtest_config(path=DEFAULT_CONFIG_FILE):
+    """Load the saved backtest configuration written by the backtesting notebook"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _measure(func, repeat):
+    """Return (timings, peak_bytes, result) for ``func`` with stdout silenced"""
+    timings = []
+    result = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return timings, peak, result
+
+
+def build_stages(returns, config, instrument_map, strategies=("momentum", "mean_reversion")):
+    """Stage name -> zero-argument callable; metrics stages reuse the backtest output"""
+    stages = {}
+    for name in strategies:
+        strategy_func = STRATEGIES[name]
+        stages[f"backtest_strategy[{name}]"] = (
+            lambda f=strategy_func: engine.backtest_strategy(returns, f, config, instrument_map)
+        )
+        stages[f"walk_forward_validation[{name}]"] = (
+            lambda f=strategy_func: engine.walk_forward_validation(returns, f, config, instrument_map)
+        )
+    stages["run_strategies[registry]"] = (
+        lambda: run_strategies(returns, list(strategies), config, instrument_map)
+    )
+    return stages
+
+
+def run_benchmarks(sizes, config=None, repeat=3, seed=42, stage_filter=None,
+                   strategies=("momentum", "mean_reversion")):
+    """
+    Benchmark every stage at every (n_instruments, n_periods) size.
+
+    Returns a list of result records (one per stage and size).
+    """
+    if config is None:
+        config = load_backtest_config()
+
+    run_id = uuid.uuid4().hex[:12]
+    common = {
+        "run_id": run_id,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+    records = []
+    for n_instruments, n_periods in sizes:
+        returns = make_returns_panel(n_instruments, n_periods, seed=seed)
+        instrument_map = make_instrument_map(returns.columns)
+        stages = build_stages(returns, config, instrument_map, strategies)
+
+        for stage_name, func in stages.items():
+            if stage_filter and not any(s in stage_name for s in stage_filter):
+                continue
+            timings, peak, result = _measure(func, repeat)
+            records.append(_record(common, stage_name, n_instruments, n_periods, timings, peak))
+
+            if stage_name.startswith("backtest_strategy"):
+                metrics_name = stage_name.replace("backtest_strategy", "calculate_metrics")
+                if stage_filter and not any(s in metrics_name for s in stage_filter):
+                    continue
+                timings, peak, _ = _measure(lambda r=result: engine.calculate_metrics(r), repeat)
+                records.append(_record(common, metrics_name, n_instruments, n_periods, timings, peak))
+    return records
+
+
+def _record(common, stage, n_instruments, n_periods, timings, peak):
+    return {
+        **common,
+        "stage": stage,
+        "n_instruments": n_instruments,
+        "n_periods": n_periods,
+        "wall_time_min_s": min(timings),
+        "wall_time_median_s": statistics.median(timings),
+        "peak_memory_mb": peak / 1024 ** 2,
+    }
+
+
+def append_history(records, path=DEFAULT_HISTORY_FILE):
+    """Append result records to the JSON-lines history file"""
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def load_history(path=DEFAULT_HISTORY_FILE):
+    """Load the benchmark history as a DataFrame (empty if no history yet)"""
+    try:
+        return pd.read_json(path, lines=True)
+    except (FileNotFoundError, ValueError):
+        return pd.DataFrame()
+
+
+def compare_runs(records, history, baseline_run_id=None, tolerance=0.10, time_floor_s=0.01):
+    """
+    Compare ``records`` against a baseline run in ``history``.
+
+    The baseline is ``baseline_run_id`` if given, otherwise the most recent
+    earlier run that measured the same stage and size. Stages faster than
+    ``time_floor_s`` in the baseline are too noisy to flag on time. Returns a
+    DataFrame with time/memory ratios and a ``regression`` flag.
+    """
+    if history.empty:
+        return pd.DataFrame()
+
+    current = pd.DataFrame(records)
+    keys = ["stage", "n_instruments", "n_periods"]
+    previous = history[~history["run_id"].isin(current["run_id"].unique())]
+    if baseline_run_id is not None:
+        previous = previous[previous["run_id"] == baseline_run_id]
+    if previous.empty:
+        return pd.DataFrame()
+
+    baseline = previous.sort_values("timestamp").groupby(keys).tail(1)
+    merged = current.merge(baseline, on=keys, suffixes=("", "_baseline"))
+
+    merged["time_ratio"] = merged["wall_time_min_s"] / merged["wall_time_min_s_baseline"]
+    merged["memory_ratio"] = merged["peak_memory_mb"] / merged["peak_memory_mb_baseline"].replace(0, np.nan)
+    slower = (merged["time_ratio"] > 1 + tolerance) & (merged["wall_time_min_s_baseline"] >= time_floor_s)
+    merged["regression"] = slower | (merged["memory_ratio"] > 1 + tolerance)
+
+    return merged[keys + ["run_id_baseline", "wall_time_min_s_baseline", "wall_time_min_s", "time_ratio",
+                          "peak_memory_mb_baseline", "peak_memory_mb", "memory_ratio", "regression"]]
@@ -0,0 +1,254 @@
+"""
+Seeded synthetic instrument and trade files at production scale.
+
+Writes ``project2_instruments.csv`` and ``project2_trading.csv`` with the
+same columns, categories and value ranges as the files in ``Data/``, for
+any number of instruments and trades, so every module and the dashboard
+can be run at 10x-100x today's size::
+
+    python -m frt.bench.universe --scale 10x --output-dir /data/synthetic_10x
+    python -m frt all --trades /data/synthetic_10x/project2_trading.csv \\
+                      --instruments /data/synthetic_10x/project2_instruments.csv
+
+Correlation structure: an instrument's log P&L level follows a market
+factor, its sector's factor and idiosyncratic noise, with
+``market_share`` / ``sector_share`` of its variance (volatility from
+``volatility_30d``). Two instruments in the same sector are correlated by
+market_share + sector_share, across sectors by market_share. ``pnl_usd``
+is that level at each trade, so ``frt.data.returns_matrix`` recovers the
+structure. Impact grows with the square root of quantity over average
+daily volume.
+
+Trades are generated in blocks of about ``BLOCK_ROWS`` with a generator seeded
+by (seed, block) and the factor / per-instrument state carried between
+blocks, so memory stays flat and the output depends only on the
+arguments. Each block is appended to the CSV as soon as it is generated.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frt.bench.synthetic import SECTORS
+
+ASSET_CLASSES = ["Crypto", "Fixed Income", "Derivatives", "FX", "Commodity", "Equity"]
+EXCHANGES = ["LSE", "HKEX", "Euronext", "TSE", "NYSE", "NASDAQ"]
+CREDIT_RATINGS = ["AAA", "AA", "A", "BBB", "BB", "B", "CCC"]
+NAME_PREFIXES = ["Advanced", "Alpha", "Dynamic", "Elite", "Global", "Innovative", "Premier", "Prime",
+                 "Strategic", "Superior"]
+NAME_SUFFIXES = ["Corp", "Enterprises", "Group", "Industries", "Manufacturing", "Partners", "Solutions",
+                 "Supply Co", "Systems", "Technologies"]
+
+TRADE_TYPES = ["BUY", "SELL"]
+ORDER_TYPES = ["MARKET", "LIMIT", "STOP", "STOP_LIMIT"]
+STRATEGIES = ["MOMENTUM", "MEAN_REVERSION", "PAIRS_TRADING", "ARBITRAGE", "MARKET_MAKING"]
+
+INSTRUMENT_COLUMNS = [
+    "instrument_id", "symbol", "instrument_name", "asset_class", "exchange", "sector", "market_cap_usd",
+    "avg_daily_volume", "beta", "volatility_30d", "sharpe_ratio", "correlation_to_index", "dividend_yield",
+    "pe_ratio", "debt_to_equity", "esg_score", "liquidity_score", "credit_rating",
+]
+TRADE_COLUMNS = [
+    "trade_id", "instrument_id", "timestamp", "trade_type", "order_type", "strategy", "quantity", "price",
+    "execution_price", "slippage_bps", "commission_usd", "market_impact_bps", "pnl_usd", "unrealized_pnl_usd",
+    "position_size", "portfolio_weight", "var_contribution", "expected_shortfall", "alpha", "information_ratio",
+]
+
+# (instruments, trades): today's files and 10x / 100x of them
+UNIVERSE_SIZES = {
+    "1x": (1_500, 30_000),
+    "10x": (15_000, 300_000),
+    "100x": (150_000, 3_000_000),
+}
+
+BLOCK_ROWS = 100_000
+INSTRUMENTS_FILE_NAME = "project2_instruments.csv"
+TRADES_FILE_NAME = "project2_trading.csv"
+
+
+def make_instruments(n_instruments, seed=42, sector_mix=None):
+    """Instrument master in the ``project2_instruments.csv`` schema; ``sector_mix`` maps sector -> weight"""
+    rng = np.random.default_rng([seed, 0])
+    mix = sector_mix or {sector: 1.0 for sector in SECTORS}
+    sectors = list(mix)
+    weights = np.array([mix[s] for s in sectors], dtype=float)
+    width = max(5, len(str(n_instruments)))
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    symbols = ["".join(row) for row in letters[rng.integers(0, 26, (n_instruments, 4))]]
+    names = (np.array(NAME_PREFIXES)[rng.integers(0, len(NAME_PREFIXES), n_instruments)].astype(object) + " "
+             + np.array(NAME_SUFFIXES)[rng.integers(0, len(NAME_SUFFIXES), n_instruments)].astype(object))
+    return pd.DataFrame({
+        "instrument_id": [f"INST_{i + 1:0{width}d}" for i in range(n_instruments)],
+        "symbol": symbols,
+        "instrument_name": names,
+        "asset_class": rng.choice(ASSET_CLASSES, n_instruments),
+        "exchange": rng.choice(EXCHANGES, n_instruments),
+        "sector": rng.choice(sectors, n_instruments, p=weights / weights.sum()),
+        "market_cap_usd": rng.uniform(1e9, 2e12, n_instruments),
+        "avg_daily_volume": rng.uniform(1e5, 5e7, n_instruments),
+        "beta": rng.uniform(-2, 3, n_instruments),
+        "volatility_30d": rng.uniform(0.1, 2.5, n_instruments),
+        "sharpe_ratio": rng.uniform(-1, 3, n_instruments),
+        "correlation_to_index": rng.uniform(-0.8, 0.9, n_instruments),
+        "dividend_yield": rng.uniform(0, 0.15, n_instruments),
+        "pe_ratio": rng.uniform(5, 150, n_instruments),
+        "debt_to_equity": rng.uniform(0, 5, n_instruments),
+        "esg_score": rng.uniform(20, 100, n_instruments),
+        "liquidity_score": rng.uniform(30, 100, n_instruments),
+        "credit_rating": rng.choice(CREDIT_RATINGS, n_instruments),
+    })[INSTRUMENT_COLUMNS]
+
+
+def iter_trades(instruments, n_trades, seed=42, trades_per_timestamp=1, market_share=0.3, sector_share=0.2,
+                start="2024-01-01", end="2024-08-31"):
+    """
+    Yield trades in the ``project2_trading.csv`` schema, ``BLOCK_ROWS`` at a
+    time. ``trades_per_timestamp`` distinct instruments trade at each of
+    the evenly spaced timestamps (1 as in today's file; the instrument
+    count gives a full panel).
+    """
+    if market_share < 0 or sector_share < 0 or market_share + sector_share > 1:
+        raise ValueError("market_share and sector_share must be non-negative and sum to at most 1")
+    n_instruments = len(instruments)
+    per_timestamp = min(trades_per_timestamp, n_instruments)
+    n_timestamps = -(-n_trades // per_timestamp)
+    start_ns, end_ns = pd.Timestamp(start).value, pd.Timestamp(end).value
+    step_ns = (end_ns - start_ns) / max(n_timestamps - 1, 1)
+    step_days = step_ns / 86_400e9
+    width = max(6, len(str(n_trades)))
+
+    sectors, sector_codes = np.unique(instruments["sector"].to_numpy(), return_inverse=True)
+    daily_vol = instruments["volatility_30d"].to_numpy() / np.sqrt(252)
+    adv = instruments["avg_daily_volume"].to_numpy()
+    ids = instruments["instrument_id"].to_numpy()
+    idio_share = 1.0 - market_share - sector_share
+
+    # Carried between blocks: factor levels (market + one per sector) at the last timestamp,
+    # and per instrument the time index, factor levels and log P&L level of its last trade
+    factors, factors_t = np.zeros(1 + len(sectors)), 0
+    last_t = np.full(n_instruments, -1, dtype=np.int64)
+    last_factors = np.zeros((n_instruments, 1 + len(sectors)))
+    level = np.log(np.random.default_rng([seed, 1]).uniform(5_000, 50_000, n_instruments))
+
+    # Blocks hold whole timestamps, so the instruments of a timestamp are drawn together
+    block_rows = per_timestamp * max(1, BLOCK_ROWS // per_timestamp)
+    for block, first in enumerate(range(0, n_trades, block_rows)):
+        rng = np.random.default_rng([seed, 2, block])
+        rows = np.arange(first, min(first + block_rows, n_trades))
+        n = len(rows)
+        t = rows // per_timestamp
+        t0 = t[0]
+        offsets = rng.integers(0, n_instruments, t[-1] - t0 + 1)
+        inst = (offsets[t - t0] + rows % per_timestamp) % n_instruments
+
+        # Factor levels at every timestamp of the block (continuing from the previous block)
+        steps = rng.standard_normal((t[-1] - t0 + 1, len(factors))) * np.sqrt(step_days)
+        if t0 == factors_t:
+            steps[0] = 0.0
+        path = factors + np.cumsum(steps, axis=0)
+        factors, factors_t = path[-1], t[-1]
+        at_trade = path[t - t0]
+
+        # Previous trade of the same instrument: earlier in this block, else the carried state
+        prev_rows = pd.Series(np.arange(n)).groupby(inst).shift()
+        previous = prev_rows.notna().to_numpy()
+        prev_rows = prev_rows.fillna(0).astype(int).to_numpy()
+        prev_t = np.where(previous, t[prev_rows], last_t[inst])
+        prev_factors = np.where(previous[:, None], at_trade[prev_rows], last_factors[inst])
+        seen = prev_t >= 0
+
+        dt_days = np.where(seen, (t - prev_t) * step_days, 0.0)
+        moves = at_trade - prev_factors
+        vol = daily_vol[inst]
+        log_return = vol * (np.sqrt(market_share) * moves[:, 0]
+                            + np.sqrt(sector_share) * moves[np.arange(n), 1 + sector_codes[inst]]
+                            + np.sqrt(idio_share) * np.sqrt(dt_days) * rng.standard_normal(n))
+        log_return[~seen] = 0.0
+        log_pnl = level[inst] + pd.Series(log_return).groupby(inst).cumsum().to_numpy()
+
+        last = ~pd.Series(inst).duplicated(keep="last").to_numpy()
+        last_t[inst[last]] = t[last]
+        last_factors[inst[last]] = at_trade[last]
+        level[inst[last]] = log_pnl[last]
+
+        quantity = rng.integers(100, 100_000, n)
+        price = rng.uniform(10, 5000, n)
+        slippage = rng.uniform(-50, 50, n)
+        impact = 0.5 * vol * np.sqrt(quantity / adv[inst]) * 1e4 * rng.lognormal(0, 0.3, n)
+        timestamps = np.datetime_as_string((start_ns + np.round(t * step_ns)).astype("datetime64[ns]"), unit="ns")
+        yield pd.DataFrame({
+            "trade_id": [f"TRD_{i + 1:0{width}d}" for i in rows],
+            "instrument_id": ids[inst],
+            "timestamp": np.char.replace(timestamps, "T", " "),
+            "trade_type": rng.choice(TRADE_TYPES, n),
+            "order_type": rng.choice(ORDER_TYPES, n),
+            "strategy": rng.choice(STRATEGIES, n),
+            "quantity": quantity,
+            "price": price,
+            "execution_price": price * (1 + slippage / 1e4),
+            "slippage_bps": slippage,
+            "commission_usd": rng.uniform(1, 500, n),
+            "market_impact_bps": impact,
+            "pnl_usd": np.exp(log_pnl),
+            "unrealized_pnl_usd": rng.normal(0, 20_000, n),
+            "position_size": rng.integers(-30_000, 30_000, n),
+            "portfolio_weight": rng.uniform(-0.1, 0.1, n),
+            "var_contribution": rng.uniform(0, 15_000, n),
+            "expected_shortfall": rng.uniform(0, 15_000, n),
+            "alpha": rng.normal(0, 0.02, n),
+            "information_ratio": rng.normal(0, 1, n),
+        })[TRADE_COLUMNS]
+
+
+def write_universe(output_dir, n_instruments, n_trades, seed=42, sector_mix=None, **trade_options):
+    """Write the instrument and trade files to ``output_dir``; returns their paths"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    instruments = make_instruments(n_instruments, seed, sector_mix)
+    instruments_path = output_dir / INSTRUMENTS_FILE_NAME
+    instruments.to_csv(instruments_path, index=False)
+
+    trades_path = output_dir / TRADES_FILE_NAME
+    for block, trades in enumerate(iter_trades(instruments, n_trades, seed, **trade_options)):
+        trades.to_csv(trades_path, index=False, mode="w" if block == 0 else "a", header=block == 0)
+    return [instruments_path, trades_path]
+
+
+def parse_sector_mix(text):
+    """``Technology=0.4,Energy=0.2,...`` -> {sector: weight}"""
+    mix = {}
+    for part in text.split(","):
+        sector, _, weight = part.partition("=")
+        mix[sector.strip()] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic instrument and trade files at scale")
+    parser.add_argument("--scale", choices=list(UNIVERSE_SIZES), default=None,
+                        help="preset (instruments, trades); overridden by --instruments / --trades")
+    parser.add_argument("--instruments", type=int, default=None, help="number of instruments")
+    parser.add_argument("--trades", type=int, default=None, help="number of trades")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sector-mix", type=parse_sector_mix, default=None,
+                        help="sector weights, e.g. Technology=0.4,Energy=0.6 (default: the six sectors equally)")
+    parser.add_argument("--trades-per-timestamp", type=int, default=1,
+                        help="instruments trading at each timestamp (1 as in today's data)")
+    parser.add_argument("--market-share", type=float, default=0.3, help="share of variance from the market factor")
+    parser.add_argument("--sector-share", type=float, default=0.2, help="share of variance from the sector factor")
+    args = parser.parse_args(argv)
+
+    n_instruments, n_trades = UNIVERSE_SIZES[args.scale or "1x"]
+    paths = write_universe(args.output_dir, args.instruments or n_instruments, args.trades or n_trades, args.seed,
+                           args.sector_mix, trades_per_timestamp=args.trades_per_timestamp,
+                           market_share=args.market_share, sector_share=args.sector_share)
+    for path in paths:
+        print(f"✅ {path} ({path.stat().st_size / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Off-screen (Agg) rendering of the report charts from precomputed data."""
@@ -0,0 +1,17 @@
+"""Backtest charts."""
+from matplotlib.figure import Figure
+
+
+def cumulative_pnl(data, title="Strategy Backtest Results"):
+    """Cumulative P&L lines; ``data["series"]`` maps label -> cumulative P&L series"""
+    figure = Figure(figsize=(14, 6))
+    ax = figure.add_subplot()
+    for label, series in data["series"].items():
+        ax.plot(series.index, series.values, label=label, linewidth=2)
+    ax.legend(fontsize=12)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xlabel("Time", fontsize=12)
+    ax.set_ylabel("Cumulative P&L", fontsize=12)
+    ax.grid(True, alpha=0.3)
+    figure.tight_layout()
+    return figure
@@ -0,0 +1,137 @@
+"""Portfolio optimization charts."""
+import matplotlib
+import numpy as np
+from matplotlib.figure import Figure
+
+from frt.charts.render import scatter
+
+
+def _short(names, length):
+    return [name[:length] + '...' if len(name) > length else name for name in names]
+
+
+def portfolio_dashboard(data):
+    """
+    3 x 3 optimization dashboard. ``data``: ``cloud`` (random portfolios:
+    return, volatility, sharpe), ``frontier``, ``current`` / ``optimized``
+    (dicts of return, volatility, sharpe), ``top_holdings``,
+    ``sector_allocation``, ``top_risk``, ``top_corr`` (labelled correlation
+    frame), ``trades`` (instrument_name, signed trade_size_pct),
+    ``returns_current`` / ``returns_optimized`` (period returns) and ``var_95``.
+    """
+    import seaborn as sns
+
+    current, optimized = data["current"], data["optimized"]
+    figure = Figure(figsize=(20, 16))
+
+    # 1. Efficient Frontier (5,000-point cloud drawn rasterized)
+    ax1 = figure.add_subplot(3, 3, 1)
+    cloud = data["cloud"]
+    points = scatter(ax1, cloud['volatility'] * 100, cloud['return'] * 100, c=cloud['sharpe'],
+                     cmap='viridis', alpha=0.3, s=10)
+    ax1.plot(data["frontier"]['volatility'] * 100, data["frontier"]['return'] * 100,
+             color='black', linewidth=2, label='Efficient Frontier')
+    ax1.scatter(optimized['volatility'] * 100, optimized['return'] * 100,
+                marker='*', color='red', s=500, label='Optimized Portfolio', zorder=5)
+    ax1.scatter(current['volatility'] * 100, current['return'] * 100,
+                marker='o', color='orange', s=200, label='Current Portfolio', zorder=5)
+    figure.colorbar(points, ax=ax1, label='Sharpe Ratio')
+    ax1.set_xlabel('Volatility (%)', fontsize=10)
+    ax1.set_ylabel('Return (%)', fontsize=10)
+    ax1.set_title('Efficient Frontier', fontsize=12, fontweight='bold')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # 2. Portfolio Weights Comparison
+    ax2 = figure.add_subplot(3, 3, 2)
+    top_holdings = data["top_holdings"]
+    x = np.arange(len(top_holdings))
+    width = 0.35
+    ax2.bar(x - width/2, top_holdings['current_weight'] * 100, width, label='Current', alpha=0.8, color='skyblue')
+    ax2.bar(x + width/2, top_holdings['target_weight'] * 100, width, label='Target', alpha=0.8, color='coral')
+    ax2.set_xlabel('Instrument', fontsize=10)
+    ax2.set_ylabel('Weight (%)', fontsize=10)
+    ax2.set_title(f'Top {len(top_holdings)} Holdings - Current vs Target', fontsize=12, fontweight='bold')
+    ax2.set_xticks(x)
+    ax2.set_xticklabels(_short(top_holdings['instrument_name'], 15), rotation=45, ha='right', fontsize=8)
+    ax2.legend()
+    ax2.grid(True, alpha=0.3, axis='y')
+
+    # 3. Sector Allocation
+    ax3 = figure.add_subplot(3, 3, 3)
+    sector_allocation = data["sector_allocation"]
+    colors = matplotlib.colormaps['Set3'](np.linspace(0, 1, len(sector_allocation)))
+    _, _, autotexts = ax3.pie(sector_allocation.values, labels=sector_allocation.index,
+                              autopct='%1.1f%%', colors=colors, startangle=90)
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+    ax3.set_title('Sector Allocation (Optimized)', fontsize=12, fontweight='bold')
+
+    # 4. Risk Contribution
+    ax4 = figure.add_subplot(3, 3, 4)
+    top_risk = data["top_risk"]
+    ax4.barh(range(len(top_risk)), top_risk['risk_contribution'] * 100, color='salmon')
+    ax4.set_yticks(range(len(top_risk)))
+    ax4.set_yticklabels(_short(top_risk['instrument'], 20), fontsize=9)
+    ax4.set_xlabel('Risk Contribution (%)', fontsize=10)
+    ax4.set_title(f'Top {len(top_risk)} Risk Contributors', fontsize=12, fontweight='bold')
+    ax4.grid(True, alpha=0.3, axis='x')
+
+    # 5. Correlation Heatmap (top holdings)
+    ax5 = figure.add_subplot(3, 3, 5)
+    sns.heatmap(data["top_corr"], annot=True, fmt='.2f', cmap='coolwarm', center=0,
+                square=True, ax=ax5, cbar_kws={'shrink': 0.8})
+    ax5.set_title(f'Correlation Matrix (Top {len(data["top_corr"])} Holdings)', fontsize=12, fontweight='bold')
+
+    # 6. Trade Recommendations
+    ax6 = figure.add_subplot(3, 3, 6)
+    trades = data["trades"]
+    y_pos = np.arange(len(trades))
+    ax6.barh(y_pos, trades['trade_size_pct'], color=np.where(trades['trade_size_pct'] > 0, 'green', 'red'),
+             alpha=0.7)
+    ax6.set_yticks(y_pos)
+    ax6.set_yticklabels(_short(trades['instrument_name'], 20), fontsize=8)
+    ax6.set_xlabel('Trade Size (%)', fontsize=10)
+    ax6.set_title('Recommended Trades (Top BUY/SELL)', fontsize=12, fontweight='bold')
+    ax6.axvline(x=0, color='black', linestyle='--', linewidth=0.8)
+    ax6.grid(True, alpha=0.3, axis='x')
+
+    # 7. Returns Distribution
+    ax7 = figure.add_subplot(3, 3, 7)
+    returns_current, returns_optimized = data["returns_current"], data["returns_optimized"]
+    ax7.hist(returns_current * 100, bins=30, alpha=0.6, label='Current', color='skyblue')
+    ax7.hist(returns_optimized * 100, bins=30, alpha=0.6, label='Optimized', color='coral')
+    ax7.axvline(data["var_95"] * 100, color='red', linestyle='--', linewidth=2, label='VaR 95%')
+    ax7.set_xlabel('Portfolio Returns (%)', fontsize=10)
+    ax7.set_ylabel('Frequency', fontsize=10)
+    ax7.set_title('Returns Distribution', fontsize=12, fontweight='bold')
+    ax7.legend()
+    ax7.grid(True, alpha=0.3)
+
+    # 8. Cumulative Returns
+    ax8 = figure.add_subplot(3, 3, 8)
+    ax8.plot((1 + returns_current).cumprod().values, label='Current Portfolio', linewidth=2, color='skyblue')
+    ax8.plot((1 + returns_optimized).cumprod().values, label='Optimized Portfolio', linewidth=2, color='coral')
+    ax8.set_xlabel('Time Period', fontsize=10)
+    ax8.set_ylabel('Cumulative Return', fontsize=10)
+    ax8.set_title('Cumulative Returns Comparison', fontsize=12, fontweight='bold')
+    ax8.legend()
+    ax8.grid(True, alpha=0.3)
+
+    # 9. Risk Metrics Comparison
+    ax9 = figure.add_subplot(3, 3, 9)
+    x = np.arange(3)
+    ax9.bar(x - width/2, [current['return'] * 100, current['volatility'] * 100, current['sharpe']], width,
+            label='Current', alpha=0.8, color='skyblue')
+    ax9.bar(x + width/2, [optimized['return'] * 100, optimized['volatility'] * 100, optimized['sharpe']], width,
+            label='Optimized', alpha=0.8, color='coral')
+    ax9.set_ylabel('Value', fontsize=10)
+    ax9.set_title('Key Metrics Comparison', fontsize=12, fontweight='bold')
+    ax9.set_xticks(x)
+    ax9.set_xticklabels(['Return\n(%)', 'Volatility\n(%)', 'Sharpe\nRatio'], fontsize=9)
+    ax9.legend()
+    ax9.grid(True, alpha=0.3, axis='y')
+
+    figure.tight_layout()
+    return figure
@@ -0,0 +1,180 @@
+"""
+Chart rendering in a process pool, skipping charts whose inputs are unchanged.
+
+A chart job is a dict::
+
+    {"chart": "cumulative_pnl", "path": "backtest_results_plot.png",
+     "data": {"series": {"Momentum": cum_pnl, ...}},
+     "options": {"title": "Strategy Backtest Results"}}
+
+``chart`` names a renderer in ``CHART_RENDERERS``. A renderer only draws:
+it gets the precomputed ``data`` (frames, series, arrays, scalars) and
+``options`` and returns a ``matplotlib.figure.Figure``. Figures are built
+with the object-oriented API on the Agg canvas and never go through
+pyplot, so rendering does not touch the notebook's backend or display
+anything. The renderer modules (and matplotlib) are only imported where a
+chart is actually drawn.
+
+The key of a job hashes the renderer's source, the data, options,
+dpi and save options. It is stored in a text chunk of the PNG. A job
+whose key matches the file on disk is skipped without drawing. The
+remaining jobs render in parallel worker processes.
+
+Scatter layers with more than ``DENSE_POINTS`` points are drawn
+rasterized (see ``scatter``). That keeps SVG/PDF exports small; in a PNG
+everything is raster anyway.
+"""
+import hashlib
+import importlib
+import importlib.util
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frt.profiling import profiled
+
+# Chart name -> (module, function); imported only in the process that draws
+CHART_RENDERERS = {
+    "cumulative_pnl": ("frt.charts.backtest", "cumulative_pnl"),
+    "tca_dashboard": ("frt.charts.tca", "tca_dashboard"),
+    "portfolio_dashboard": ("frt.charts.portfolio", "portfolio_dashboard"),
+    "summary_charts": ("frt.charts.report", "summary_charts"),
+}
+
+DPI = 300
+STYLE = "seaborn-v0_8-darkgrid"
+SAVEFIG_OPTIONS = {"bbox_inches": "tight"}
+DENSE_POINTS = 1000
+
+KEY_FIELD = "frt-chart-key"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def scatter(ax, x, y, **kwargs):
+    """``ax.scatter`` that rasterizes layers of more than ``DENSE_POINTS`` points"""
+    kwargs.setdefault("rasterized", np.size(x) > DENSE_POINTS)
+    return ax.scatter(x, y, **kwargs)
+
+
+def _update(digest, value):
+    """Feed ``value`` (nested dicts / lists of frames, arrays and scalars) into ``digest``"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        layout = (list(value.columns), [str(t) for t in value.dtypes]) if isinstance(value, pd.DataFrame) \
+            else (value.name, str(value.dtype))
+        digest.update(f"pandas{layout!r}".encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key in sorted(value, key=str):
+            digest.update(f"{key!r}:".encode())
+            _update(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"list{len(value)}".encode())
+        for item in value:
+            _update(digest, item)
+    else:
+        digest.update(f"{type(value).__name__}{value!r}".encode())
+
+
+def chart_key(job):
+    """Hash of everything that determines the chart's pixels"""
+    module, function = CHART_RENDERERS[job["chart"]]
+    digest = hashlib.sha256(f"{module}:{function}".encode())
+    for source in (__file__, importlib.util.find_spec(module).origin):
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    _update(digest, [job.get("data", {}), job.get("options", {}), job.get("dpi", DPI),
+                     job.get("style", STYLE), job.get("savefig", SAVEFIG_OPTIONS)])
+    return digest.hexdigest()
+
+
+def stored_key(path):
+    """Chart key saved in the PNG at ``path``, or None"""
+    try:
+        with open(path, "rb") as f:
+            if f.read(8) != PNG_SIGNATURE:
+                return None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                length, kind = struct.unpack(">I4s", header)
+                if kind == b"IEND":
+                    return None
+                if kind != b"tEXt":
+                    f.seek(length + 4, os.SEEK_CUR)
+                    continue
+                keyword, _, text = f.read(length).partition(b"\0")
+                f.seek(4, os.SEEK_CUR)
+                if keyword == KEY_FIELD.encode():
+                    return text.decode("latin-1")
+    except (FileNotFoundError, struct.error):
+        return None
+
+
+def _render(job):
+    """Draw and save one chart (in a worker); returns the seconds taken"""
+    import matplotlib.style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    start = time.perf_counter()
+    module, function = CHART_RENDERERS[job["chart"]]
+    renderer = getattr(importlib.import_module(module), function)
+    with matplotlib.style.context(job.get("style", STYLE)):
+        figure = renderer(job.get("data", {}), **job.get("options", {}))
+        FigureCanvasAgg(figure)
+        figure.savefig(job["path"], dpi=job.get("dpi", DPI), metadata={KEY_FIELD: job["key"]},
+                       **job.get("savefig", SAVEFIG_OPTIONS))
+    return time.perf_counter() - start
+
+
+@profiled(rows="jobs")
+def render_charts(jobs, n_jobs=None, force=False):
+    """
+    Render ``jobs`` whose PNG is missing or out of date, ``n_jobs`` at a time
+    (default: one per CPU). Returns one row per job with ``chart``,
+    ``path``, ``status`` (rendered or skipped) and ``seconds``.
+    """
+    rows, pending = [], []
+    for job in jobs:
+        job = dict(job, path=str(job["path"]))
+        job["key"] = chart_key(job)
+        if not force and stored_key(job["path"]) == job["key"]:
+            rows.append({"chart": job["chart"], "path": job["path"], "status": "skipped", "seconds": 0.0})
+        else:
+            Path(job["path"]).parent.mkdir(parents=True, exist_ok=True)
+            pending.append(job)
+
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(pending)))
+    if n_jobs == 1:
+        seconds = [_render(job) for job in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            seconds = list(pool.map(_render, pending))
+
+    rows += [{"chart": job["chart"], "path": job["path"], "status": "rendered", "seconds": s}
+             for job, s in zip(pending, seconds)]
+    order = {str(job["path"]): i for i, job in enumerate(jobs)}
+    rows.sort(key=lambda row: order[row["path"]])
+    return pd.DataFrame(rows, columns=["chart", "path", "status", "seconds"])
+
+
+def show_charts(results, width=900):
+    """Display the rendered PNGs inline when running under IPython (no-op otherwise)"""
+    try:
+        from IPython import get_ipython
+        from IPython.display import Image, display
+    except ImportError:
+        return
+    if get_ipython() is None:
+        return
+    for path in results["path"]:
+        display(Image(filename=path, width=width))
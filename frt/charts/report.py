@@ -0,0 +1,56 @@
+"""Daily report charts."""
+from matplotlib.figure import Figure
+
+
+def summary_charts(data):
+    """
+    2 x 2 summary: ``var_es`` (VaR / ES values), ``sharpe`` (Strategy,
+    Sharpe), ``allocation`` (weight per holding) and ``slippage`` (_week,
+    avg_slippage_bps). A missing (None) input shows a placeholder.
+    """
+    figure = Figure(figsize=(14, 10))
+
+    def placeholder(ax, text):
+        ax.text(0.5, 0.5, text, ha="center", va="center")
+
+    # Chart 1: VaR & ES as Bar Chart
+    ax = figure.add_subplot(2, 2, 1)
+    if data.get("var_es") is not None:
+        var_es = data["var_es"]
+        ax.bar(var_es.index, var_es.values, color=["skyblue", "lightcoral", "orange", "green"])
+        ax.set_title("Portfolio VaR & ES")
+        ax.set_ylabel("Value")
+    else:
+        placeholder(ax, "No VaR/ES data")
+
+    # Chart 2: Strategy Sharpe Ratios
+    ax = figure.add_subplot(2, 2, 2)
+    if data.get("sharpe") is not None:
+        ax.bar(data["sharpe"]["Strategy"], data["sharpe"]["Sharpe"], color="skyblue")
+        ax.set_title("Strategy Sharpe Ratios")
+    else:
+        placeholder(ax, "No Sharpe data")
+
+    # Chart 3: Portfolio Allocation (Top 10 + Others)
+    ax = figure.add_subplot(2, 2, 3)
+    if data.get("allocation") is not None:
+        ax.pie(data["allocation"].values, labels=data["allocation"].index, autopct="%1.1f%%")
+        ax.set_title("Optimized Portfolio Allocation (Top 10)")
+    else:
+        placeholder(ax, "No Portfolio data")
+
+    # Chart 4: TCA Slippage Trend (Week vs Slippage)
+    ax = figure.add_subplot(2, 2, 4)
+    if data.get("slippage") is not None:
+        ax.plot(data["slippage"]["_week"], data["slippage"]["avg_slippage_bps"], marker="o",
+                label="Avg Slippage (bps)")
+        ax.set_title("TCA Slippage Trend")
+        ax.set_xlabel("Week")
+        ax.set_ylabel("Slippage (bps)")
+        ax.tick_params(axis="x", rotation=45)
+        ax.legend()
+    else:
+        placeholder(ax, "No TCA data")
+
+    figure.tight_layout()
+    return figure
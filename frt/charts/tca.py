@@ -0,0 +1,108 @@
+"""TCA charts."""
+from matplotlib.figure import Figure
+
+
+def tca_dashboard(data):
+    """
+    3 x 3 TCA dashboard. ``data``: ``weekly`` (weekly TCA summary),
+    ``strategy_perf`` (per-strategy slippage / cost), ``order_perf``
+    (average slippage per order type) and ``cost_components`` (USD per
+    cost component).
+    """
+    weekly = data["weekly"]
+    strategy_perf = data["strategy_perf"]
+    figure = Figure(figsize=(18, 12))
+
+    # 1. Weekly Average Slippage
+    ax1 = figure.add_subplot(3, 3, 1)
+    ax1.plot(weekly["_week"], weekly["avg_slippage_bps"], marker="o", linewidth=2, color="#FF5733")
+    ax1.axhline(weekly["avg_slippage_bps"].mean(), linestyle="--", color="gray", label="Mean")
+    ax1.set_title("Weekly Average Slippage (bps)", fontweight="bold")
+    ax1.set_xlabel("Week")
+    ax1.set_ylabel("Slippage (bps)")
+    ax1.tick_params(axis='x', rotation=45)
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+
+    # 2. Weekly Total Cost
+    ax2 = figure.add_subplot(3, 3, 2)
+    ax2.plot(weekly["_week"], weekly["total_cost"], marker="o", linewidth=2, color="#E74C3C")
+    ax2.fill_between(range(len(weekly)), weekly["total_cost"], alpha=0.3, color="#E74C3C")
+    ax2.set_title("Weekly Total Cost (USD)", fontweight="bold")
+    ax2.set_xlabel("Week")
+    ax2.set_ylabel("Cost (USD)")
+    ax2.tick_params(axis='x', rotation=45)
+    ax2.grid(True, alpha=0.3)
+
+    # 3. Cost-to-P&L Ratio
+    ax3 = figure.add_subplot(3, 3, 3)
+    ax3.bar(weekly["_week"], weekly["cost_to_pnl_ratio"], color="#F1C40F", alpha=0.7)
+    ax3.axhline(10, linestyle="--", color="red", label="10% Threshold")
+    ax3.set_title("Cost-to-P&L Ratio (%)", fontweight="bold")
+    ax3.set_xlabel("Week")
+    ax3.set_ylabel("Ratio (%)")
+    ax3.tick_params(axis='x', rotation=45)
+    ax3.grid(True, alpha=0.3)
+    ax3.legend()
+
+    # 4. Market Impact Trend
+    ax4 = figure.add_subplot(3, 3, 4)
+    ax4.plot(weekly["_week"], weekly["avg_market_impact_bps"], marker="s", linewidth=2, color="#9B59B6")
+    ax4.set_title("Weekly Market Impact (bps)", fontweight="bold")
+    ax4.set_xlabel("Week")
+    ax4.set_ylabel("Market Impact (bps)")
+    ax4.tick_params(axis='x', rotation=45)
+    ax4.grid(True, alpha=0.3)
+
+    # 5. P&L Attribution Stacked Bar
+    ax5 = figure.add_subplot(3, 3, 5)
+    width = 0.8
+    x_pos = range(len(weekly))
+    ax5.bar(x_pos, weekly["total_alpha"], width, label="Alpha", color="#2ECC71")
+    ax5.bar(x_pos, weekly["total_beta"], width, bottom=weekly["total_alpha"], label="Beta", color="#3498DB")
+    ax5.bar(x_pos, -weekly["total_cost"], width, bottom=weekly["total_alpha"] + weekly["total_beta"],
+            label="Cost", color="#E74C3C")
+    ax5.set_title("P&L Attribution by Week", fontweight="bold")
+    ax5.set_xlabel("Week")
+    ax5.set_ylabel("P&L (USD)")
+    ax5.set_xticks(x_pos)
+    ax5.set_xticklabels(weekly["_week"], rotation=45)
+    ax5.legend()
+    ax5.grid(True, alpha=0.3)
+
+    # 6. Strategy Performance - Slippage
+    ax6 = figure.add_subplot(3, 3, 6)
+    ax6.barh(strategy_perf["strategy"], strategy_perf["slippage_bps"], color="#FF6347")
+    ax6.set_title("Average Slippage by Strategy (bps)", fontweight="bold")
+    ax6.set_xlabel("Avg Slippage (bps)")
+    ax6.grid(True, alpha=0.3, axis='x')
+
+    # 7. Strategy Performance - Cost
+    ax7 = figure.add_subplot(3, 3, 7)
+    ax7.barh(strategy_perf["strategy"], strategy_perf["cost_value"], color="#DC143C")
+    ax7.set_title("Total Cost by Strategy (USD)", fontweight="bold")
+    ax7.set_xlabel("Total Cost (USD)")
+    ax7.grid(True, alpha=0.3, axis='x')
+
+    # 8. Order Type Performance
+    ax8 = figure.add_subplot(3, 3, 8)
+    order_perf = data["order_perf"]
+    ax8.barh(order_perf.index, order_perf.values, color="#1ABC9C")
+    ax8.set_title("Slippage by Order Type (bps)", fontweight="bold")
+    ax8.set_xlabel("Avg Slippage (bps)")
+    ax8.grid(True, alpha=0.3, axis='x')
+
+    # 9. Cost Components Breakdown (a pie needs non-negative parts; otherwise bars)
+    ax9 = figure.add_subplot(3, 3, 9)
+    components = data["cost_components"]
+    colors = ["#FF6B6B", "#4ECDC4", "#FFD93D"]
+    if (components >= 0).all():
+        ax9.pie(components.values, labels=components.index, autopct='%1.1f%%', colors=colors, startangle=90)
+    else:
+        ax9.bar(components.index, components.values, color=colors)
+        ax9.axhline(0, color="black", linewidth=0.8)
+        ax9.set_ylabel("Cost (USD)")
+    ax9.set_title("Cost Components Breakdown", fontweight="bold")
+
+    figure.tight_layout()
+    return figure
@@ -0,0 +1,24 @@
+"""Loading the shared trade and instrument files, and the returns matrix every module builds from them."""
+import pandas as pd
+
+from frt.paths import INSTRUMENTS_FILE, TRADES_FILE
+from frt.profiling import profiled
+
+
+@profiled
+def load_trades(path=TRADES_FILE):
+    return pd.read_csv(path)
+
+
+def load_instruments(path=INSTRUMENTS_FILE):
+    return pd.read_csv(path)
+
+
+@profiled(rows="trades")
+def returns_matrix(trades):
+    """Period returns per instrument: percent change of ``pnl_usd`` by timestamp"""
+    return trades.pivot_table(
+        index="timestamp",
+        columns="instrument_id",
+        values="pnl_usd"
+    ).pct_change().dropna()
@@ -0,0 +1 @@
+"""Portfolio optimization: objectives, risk measures and constrained optimizers."""
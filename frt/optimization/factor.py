@@ -0,0 +1,74 @@
+"""
+Statistical factor covariance.
+
+The sample covariance of 1,500 instruments is replaced by a PCA factor
+model ``S = L L' + diag(d)`` with ``L`` the top ``n_factors`` principal
+components scaled by their volatility and ``d`` the specific (residual)
+variance. Products with ``S`` then cost ``O(n k)`` instead of ``O(n^2)`` and
+``(a S + diag(c))^-1`` reduces to a ``k x k`` solve (Woodbury identity).
+"""
+import numpy as np
+
+
+def factor_covariance(returns, n_factors=10, min_specific_ratio=1e-4):
+    """
+    Fit a PCA factor model to a (periods x instruments) returns frame.
+
+    Returns a dict with ``loadings`` (n x k), ``specific_variance`` (n,),
+    ``explained_variance`` (share of total variance captured by the
+    factors) and the instrument ``index``. Specific variances are floored
+    at ``min_specific_ratio`` times the average variance so the model stays
+    positive definite.
+    """
+    values = np.asarray(returns, dtype=float)
+    centered = values - values.mean(axis=0)
+    n_periods, n_instruments = centered.shape
+    n_factors = int(min(n_factors, n_periods - 1, n_instruments))
+
+    _, singular_values, components = np.linalg.svd(centered, full_matrices=False)
+    loadings = components[:n_factors].T * (singular_values[:n_factors] / np.sqrt(n_periods - 1))
+
+    total_variance = centered.var(axis=0, ddof=1)
+    specific = total_variance - np.sum(loadings ** 2, axis=1)
+    specific = np.maximum(specific, min_specific_ratio * total_variance.mean())
+
+    return {
+        "loadings": loadings,
+        "specific_variance": specific,
+        "explained_variance": np.sum(loadings ** 2) / total_variance.sum(),
+        "index": list(getattr(returns, "columns", range(n_instruments))),
+    }
+
+
+def factor_cov_matvec(model, x):
+    """``S @ x`` without forming ``S``"""
+    loadings = model["loadings"]
+    return loadings @ (loadings.T @ x) + model["specific_variance"] * x
+
+
+def factor_covariance_matrix(model):
+    """Dense ``S`` (for reports and comparisons only)"""
+    loadings = model["loadings"]
+    return loadings @ loadings.T + np.diag(model["specific_variance"])
+
+
+def woodbury_solver(model, scale, shift):
+    """
+    Return ``solve(r)`` for ``(scale * S + shift * I) x = r``.
+
+    ``shift`` may be a scalar or a per-instrument vector. The ``k x k``
+    capacitance matrix is factorised once, so each solve is ``O(n k)``.
+    """
+    loadings = model["loadings"]
+    diagonal = scale * model["specific_variance"] + shift
+    scaled_loadings = loadings / diagonal[:, None]
+    capacitance = np.eye(loadings.shape[1]) / scale + loadings.T @ scaled_loadings
+    cholesky = np.linalg.cholesky(capacitance)
+
+    def solve(rhs):
+        y = rhs / diagonal
+        t = np.linalg.solve(cholesky, loadings.T @ y)
+        t = np.linalg.solve(cholesky.T, t)
+        return y - scaled_loadings @ t
+
+    return solve
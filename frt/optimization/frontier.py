@@ -0,0 +1,157 @@
+"""
+Efficient frontier and random-portfolio cloud.
+
+``random_portfolio_cloud`` draws the random long-only portfolios in
+``(chunk x instruments)`` blocks and gets every volatility from one matrix
+product per block instead of one ``S @ w`` per portfolio. It uses the same
+``RandomState(seed)`` stream as the original per-portfolio loop, so the
+cloud is identical.
+
+``efficient_frontier`` traces the constrained frontier: minimum variance
+subject to ``mu' w >= target`` and the ``CONSTRAINTS_CONFIG`` limits, for a
+grid of targets between the minimum-variance and maximum-return portfolios.
+The grid is split into contiguous chunks solved in parallel processes;
+inside a chunk each point is warm-started from its neighbour.
+
+Both results are cached as CSVs next to the other optimization outputs,
+keyed on a hash of the inputs, for the notebook and the dashboard.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frt.optimization.qp import solve_mean_variance
+from frt.profiling import profiled
+
+FRONTIER_FILE = "efficient_frontier.csv"
+CLOUD_FILE = "random_portfolios.csv"
+CACHE_META_FILE = "efficient_frontier_meta.json"
+
+# Near-zero risk aversion turns the mean-variance QP into the max-return LP
+MAX_RETURN_RISK_AVERSION = 1e-3
+
+
+def portfolio_variances(weights, cov):
+    """Row-wise ``w' S w`` for a (portfolios x instruments) matrix; ``cov`` may be a factor model"""
+    if isinstance(cov, dict):
+        exposures = weights @ cov["loadings"]
+        return np.einsum('ij,ij->i', exposures, exposures) + (weights ** 2) @ cov["specific_variance"]
+    return np.einsum('ij,ij->i', weights @ np.asarray(cov), weights)
+
+
+def random_portfolio_cloud(mean_returns, cov, num_portfolios=5000, risk_free_rate=0.02,
+                           seed=42, chunk_size=500):
+    """
+    Random long-only portfolios as a (3, num_portfolios) array of
+    return, volatility and Sharpe ratio.
+    """
+    mu = np.asarray(mean_returns, dtype=float)
+    rng = np.random.RandomState(seed)
+    results = np.zeros((3, num_portfolios))
+
+    for start in range(0, num_portfolios, chunk_size):
+        stop = min(start + chunk_size, num_portfolios)
+        weights = rng.random_sample((stop - start, len(mu)))
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        returns = weights @ mu
+        volatility = np.sqrt(portfolio_variances(weights, cov))
+        results[0, start:stop] = returns
+        results[1, start:stop] = volatility
+        results[2, start:stop] = (returns - risk_free_rate) / volatility
+    return results
+
+
+def _sweep(task):
+    """Solve a chunk of frontier points in order, warm-starting each from the last"""
+    mu, model, current, benchmark, config, groups, targets, initial_weights = task
+    state = None
+    points = []
+    for target in targets:
+        result = solve_mean_variance(mu, model, current, benchmark, config, groups,
+                                     risk_aversion=1.0, target_return=target,
+                                     initial_weights=initial_weights, warm_start=state)
+        state = result.state
+        points.append((target, result.x, result.success, result.nit))
+    return points
+
+
+@profiled(rows="mean_returns")
+def efficient_frontier(mean_returns, model, current_weights, benchmark_weights, config,
+                       groups=None, n_points=25, cov_matrix=None, risk_free_rate=0.02, n_jobs=None):
+    """
+    Constrained efficient frontier as a DataFrame with one row per target.
+
+    Points are solved on the factor ``model``; when ``cov_matrix`` is given
+    the reported volatility uses it instead (e.g. the sample covariance the
+    random cloud is drawn against). ``n_jobs`` defaults to the CPU count;
+    1 runs in-process.
+    """
+    mu = np.asarray(mean_returns, dtype=float)
+    current = np.asarray(current_weights, dtype=float)
+    benchmark = np.asarray(benchmark_weights, dtype=float)
+    common = (mu, model, current, benchmark, config, groups)
+
+    min_variance = solve_mean_variance(np.zeros_like(mu), *common[1:], risk_aversion=1.0)
+    max_return = solve_mean_variance(*common, risk_aversion=MAX_RETURN_RISK_AVERSION,
+                                     initial_weights=min_variance.x)
+    targets = np.linspace(mu @ min_variance.x, mu @ max_return.x, n_points)
+
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, n_points))
+    tasks = [(*common, chunk, min_variance.x) for chunk in np.array_split(targets, n_jobs) if len(chunk)]
+    if n_jobs == 1:
+        chunks = [_sweep(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = list(pool.map(_sweep, tasks))
+    points = [point for chunk in chunks for point in chunk]
+
+    weights = np.vstack([w for _, w, _, _ in points])
+    returns = weights @ mu
+    volatility = np.sqrt(portfolio_variances(weights, model if cov_matrix is None else cov_matrix))
+    return pd.DataFrame({
+        "target_return": [target for target, _, _, _ in points],
+        "return": returns,
+        "volatility": volatility,
+        "sharpe": (returns - risk_free_rate) / volatility,
+        "converged": [success for _, _, success, _ in points],
+        "iterations": [nit for _, _, _, nit in points],
+    })
+
+
+def frontier_cache_key(*arrays, **params):
+    """Hash of the input arrays and parameters identifying a cached frontier"""
+    digest = hashlib.sha1()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def load_frontier_cache(key, directory="."):
+    """(frontier, cloud) DataFrames if the cache in ``directory`` matches ``key``, else None"""
+    directory = Path(directory)
+    try:
+        with open(directory / CACHE_META_FILE) as f:
+            meta = json.load(f)
+        if meta.get("key") != key:
+            return None
+        return pd.read_csv(directory / FRONTIER_FILE), pd.read_csv(directory / CLOUD_FILE)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_frontier_cache(key, frontier, cloud, directory="."):
+    """Write the frontier, the cloud and the cache key to ``directory``"""
+    directory = Path(directory)
+    frontier.to_csv(directory / FRONTIER_FILE, index=False)
+    cloud.to_csv(directory / CLOUD_FILE, index=False)
+    with open(directory / CACHE_META_FILE, "w") as f:
+        json.dump({"key": key, "created": datetime.now().isoformat(timespec="seconds"),
+                   "n_points": len(frontier), "num_portfolios": len(cloud)}, f, indent=2)
@@ -0,0 +1,38 @@
+"""Portfolio return and risk measures used by the optimizer and reports."""
+import numpy as np
+
+
+def portfolio_return(weights, mean_returns):
+    """Calculate expected portfolio return"""
+    return np.dot(weights, mean_returns)
+
+
+def portfolio_volatility(weights, cov_matrix):
+    """Calculate portfolio volatility"""
+    return np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights)))
+
+
+def portfolio_sharpe(weights, mean_returns, cov_matrix, risk_free_rate=0.02):
+    """Calculate Sharpe ratio"""
+    ret = portfolio_return(weights, mean_returns)
+    vol = portfolio_volatility(weights, cov_matrix)
+    return (ret - risk_free_rate) / vol if vol > 0 else 0
+
+
+def calculate_tracking_error(weights, benchmark_weights, cov_matrix):
+    """Calculate tracking error vs benchmark"""
+    active_weights = weights - benchmark_weights
+    return np.sqrt(np.dot(active_weights.T, np.dot(cov_matrix, active_weights)))
+
+
+def calculate_var(weights, returns_matrix, confidence=0.95):
+    """Calculate Value at Risk"""
+    portfolio_returns = returns_matrix.dot(weights)
+    return np.percentile(portfolio_returns, (1 - confidence) * 100)
+
+
+def calculate_expected_shortfall(weights, returns_matrix, confidence=0.95):
+    """Calculate Expected Shortfall (CVaR)"""
+    portfolio_returns = returns_matrix.dot(weights)
+    var = np.percentile(portfolio_returns, (1 - confidence) * 100)
+    return portfolio_returns[portfolio_returns <= var].mean()
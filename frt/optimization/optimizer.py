@@ -0,0 +1,337 @@
+"""
+Constrained portfolio optimizer with analytic gradients.
+
+Every objective and constraint returns its exact gradient/Jacobian, so the
+solver never falls back to finite differences (one extra objective
+evaluation per weight per gradient).
+
+The turnover constraint ``sum(|w - c|) <= max_turnover`` is not smooth, so
+the weights are split around the current portfolio ``c``::
+
+    w = c + u - v,    u, v >= 0,    sum(u + v) <= max_turnover
+
+which makes turnover a single linear row. The position bounds
+``min_position_weight <= w <= max_position_weight`` become bounds on ``u``
+and ``v``. Budget, net exposure and sector caps are linear rows with
+constant Jacobians; tracking error is imposed in squared form
+``(w - b)' S (w - b) <= max_tracking_error ** 2``, which is smooth at
+``w = b``.
+
+With ``costs`` (the ``linear`` / ``impact`` coefficients of
+``frt.backtest.costs.rebalance_cost_coefficients``) the expected cost of the
+trades ``sum(linear_i q_i + impact_i q_i^(1 + beta_i))``, ``q = u + v``, is
+charged in the objective: netted from the expected excess return for
+``max_sharpe`` and added to the variance objectives. The cost is paid once
+while the returns are per period, so it is amortized over
+``holding_periods`` periods of the returns (see
+``frt.backtest.costs.amortized``). It is smooth in ``u`` and ``v``, so costs
+always use the split, with or without a turnover cap.
+
+All constraint keys are read from the notebook's ``CONSTRAINTS_CONFIG``.
+
+Two solvers share these pieces: ``slsqp`` (scipy's SLSQP, fine for a few
+hundred instruments) and the default ``augmented_lagrangian``, which keeps
+the bounds in L-BFGS-B and prices the handful of constraint rows with
+multipliers. SLSQP solves a dense quadratic subproblem over all variables
+every iteration, which dominates once the turnover split doubles 1,500
+weights to 3,000 variables.
+"""
+import numpy as np
+from scipy.optimize import OptimizeResult, minimize
+
+from frt.backtest.costs import amortized
+from frt.profiling import profiled
+
+DEFAULT_CONSTRAINTS = {
+    'max_position_weight': 0.15,
+    'min_position_weight': 0.0,
+    'gross_exposure': 1.0,
+    'net_exposure_min': 0.95,
+    'net_exposure_max': 1.0,
+    'max_turnover': 0.30,
+    'max_tracking_error': 0.05,
+    'sector_max_weight': 0.35,
+}
+
+
+def sector_groups(assets, instrument_sector_map):
+    """Sector -> positions of its instruments within ``assets``"""
+    groups = {}
+    for i, instr_id in enumerate(assets):
+        sector = instrument_sector_map.get(instr_id)
+        if sector is not None:
+            groups.setdefault(sector, []).append(i)
+    return {sector: np.asarray(idx) for sector, idx in groups.items()}
+
+
+def neg_sharpe(weights, cov_w, problem):
+    """Negative Sharpe ratio and its gradient"""
+    mean_returns = problem['mean_returns']
+    vol = np.sqrt(max(weights @ cov_w, 0.0))
+    if vol <= 0:
+        return 1e10, np.zeros_like(weights)
+    excess = weights @ mean_returns - problem['risk_free_rate']
+    grad = -(mean_returns / vol - excess * cov_w / vol ** 3)
+    return -excess / vol, grad
+
+
+def variance(weights, cov_w, problem):
+    """Portfolio variance and its gradient"""
+    return weights @ cov_w, 2 * cov_w
+
+
+def tracking_variance(weights, cov_w, problem):
+    """Squared tracking error vs the benchmark and its gradient"""
+    active = weights - problem['benchmark_weights']
+    cov_active = cov_w - problem['cov_benchmark']
+    return active @ cov_active, 2 * cov_active
+
+
+def trading_cost(q, costs):
+    """Expected cost of the trade sizes ``q >= 0`` and its gradient"""
+    exponent = costs.get("exponent")
+    exponent = 0.5 if exponent is None else exponent
+    power = q ** exponent
+    value = q @ costs["linear"] + (q * power) @ costs["impact"]
+    return value, costs["linear"] + (1 + exponent) * costs["impact"] * power
+
+
+OBJECTIVES = {
+    "max_sharpe": neg_sharpe,
+    "min_variance": variance,
+    "min_tracking_error": tracking_variance,
+}
+
+
+def _linear_rows(n, config, groups):
+    """Rows ``A`` and limits ``ub`` of the linear constraints ``A @ w <= ub``"""
+    rows, limits = [], []
+    # Net exposure bounds are implied by the budget equality when it lies inside them
+    if not config['net_exposure_min'] <= config['gross_exposure'] <= config['net_exposure_max']:
+        rows += [np.ones(n), -np.ones(n)]
+        limits += [config['net_exposure_max'], -config['net_exposure_min']]
+    sector_cap = config.get('sector_max_weight')
+    if sector_cap is not None:
+        for idx in (groups or {}).values():
+            row = np.zeros(n)
+            row[idx] = 1.0
+            rows.append(row)
+            limits.append(sector_cap)
+    rows = np.vstack(rows) if rows else np.zeros((0, n))
+    return rows, np.asarray(limits, dtype=float)
+
+
+@profiled(rows="mean_returns")
+def optimize_portfolio(mean_returns, cov_matrix, current_weights, benchmark_weights, config,
+                       groups=None, initial_weights=None, objective="max_sharpe",
+                       risk_free_rate=0.02, method="augmented_lagrangian", maxiter=1000, ftol=1e-9,
+                       costs=None, holding_periods=1):
+    """
+    Optimize portfolio weights under ``config`` (a ``CONSTRAINTS_CONFIG`` dict).
+
+    ``groups`` maps sector -> instrument positions (see ``sector_groups``).
+    ``max_turnover`` or ``max_tracking_error`` set to None drops that
+    constraint. ``costs`` (``linear`` and ``impact`` coefficient arrays,
+    optionally ``exponent``) charges the expected trading cost, amortized
+    over ``holding_periods`` periods of ``mean_returns``, in the objective.
+    Returns the scipy ``OptimizeResult`` with ``x`` holding the weights,
+    ``z`` the raw solver variables, ``turnover`` the realised
+    ``sum(|w - c|)`` and ``trading_cost`` the one-off expected cost of the
+    trades.
+    """
+    mean_returns = np.asarray(mean_returns, dtype=float)
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    current = np.asarray(current_weights, dtype=float)
+    benchmark = np.asarray(benchmark_weights, dtype=float)
+    n = len(mean_returns)
+    lo, hi = config['min_position_weight'], config['max_position_weight']
+    max_turnover = config.get('max_turnover')
+    max_te = config.get('max_tracking_error')
+
+    problem = {
+        'mean_returns': mean_returns,
+        'benchmark_weights': benchmark,
+        'cov_benchmark': cov_matrix @ benchmark,
+        'risk_free_rate': risk_free_rate,
+    }
+    objective_func = OBJECTIVES[objective]
+
+    start = current.copy() if initial_weights is None else np.asarray(initial_weights, dtype=float)
+    start = np.clip(start, lo, hi)
+
+    if max_turnover is not None or costs is not None:
+        # w = c + u - v; a current weight outside [lo, hi] forces a minimum trade
+        lower = np.concatenate([np.maximum(0, lo - current), np.maximum(0, current - hi)])
+        upper = np.concatenate([np.maximum(0, hi - current), np.maximum(0, current - lo)])
+
+        def to_weights(z):
+            return current + z[:n] - z[n:]
+
+        def pull_back(grad):
+            return np.concatenate([grad, -grad], axis=-1)
+
+        z0 = np.clip(np.concatenate([start - current, current - start]), lower, upper)
+    else:
+        lower, upper = np.full(n, lo), np.full(n, hi)
+
+        def to_weights(z):
+            return z
+
+        def pull_back(grad):
+            return grad
+
+        z0 = start
+
+    # Objective and tracking error both need S @ w at the same point
+    cache = {}
+
+    def cov_product(z):
+        if cache.get('z') is None or not np.array_equal(cache['z'], z):
+            weights = to_weights(z)
+            cache['z'] = z.copy()
+            cache['w'] = weights.copy()
+            cache['cov_w'] = cov_matrix @ weights
+        return cache['w'], cache['cov_w']
+
+    def fun(z):
+        weights, cov_w = cov_product(z)
+        if costs is None:
+            value, grad = objective_func(weights, cov_w, problem)
+            return value, pull_back(grad)
+        cost, cost_grad = trading_cost(z[:n] + z[n:], per_period_costs)
+        cost_grad = np.concatenate([cost_grad, cost_grad])
+        if objective == "max_sharpe":
+            # Net Sharpe: the cost comes off the expected excess return
+            value, grad = objective_func(weights, cov_w, dict(problem, risk_free_rate=risk_free_rate + cost))
+            vol = np.sqrt(max(weights @ cov_w, 0.0))
+            return value, pull_back(grad) + (cost_grad / vol if vol > 0 else 0.0)
+        value, grad = objective_func(weights, cov_w, problem)
+        return value + cost, pull_back(grad) + cost_grad
+
+    per_period_costs = None if costs is None else amortized(costs, holding_periods)
+    rows, limits = _linear_rows(n, config, groups)
+    linear_jac = -pull_back(rows)
+    if max_turnover is not None:
+        linear_jac = np.vstack([linear_jac, -np.ones(2 * n)])
+
+    def linear_fun(z):
+        values = limits - rows @ to_weights(z)
+        if max_turnover is not None:
+            values = np.append(values, max_turnover - z.sum())
+        return values
+
+    budget_jac = pull_back(np.ones(n))[None, :]
+    constraints = [
+        {'type': 'eq', 'fun': lambda z: np.array([to_weights(z).sum() - config['gross_exposure']]),
+         'jac': lambda z: budget_jac},
+        {'type': 'ineq', 'fun': linear_fun, 'jac': lambda z: linear_jac},
+    ]
+
+    if max_te is not None:
+        # Scaled by max_tracking_error ** 2 so the row is O(1) like the others
+        def te_fun(z):
+            weights, cov_w = cov_product(z)
+            return np.array([1 - tracking_variance(weights, cov_w, problem)[0] / max_te ** 2])
+
+        def te_jac(z):
+            weights, cov_w = cov_product(z)
+            return -pull_back(tracking_variance(weights, cov_w, problem)[1])[None, :] / max_te ** 2
+
+        constraints.append({'type': 'ineq', 'fun': te_fun, 'jac': te_jac})
+
+    bounds = list(zip(lower, upper))
+    if method == "slsqp":
+        result = minimize(fun, z0, jac=True, method='SLSQP', bounds=bounds, constraints=constraints,
+                          options={'maxiter': maxiter, 'ftol': ftol})
+    elif method == "augmented_lagrangian":
+        result = augmented_lagrangian(fun, z0, bounds, constraints, maxiter=maxiter, ftol=ftol)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    result.z = result.x
+    result.x = to_weights(result.z)
+    result.turnover = np.abs(result.x - current).sum()
+    result.trading_cost = 0.0 if costs is None else trading_cost(np.abs(result.x - current), costs)[0]
+    return result
+
+
+def _violation(constraints, values):
+    """Largest equality residual or inequality shortfall"""
+    worst = 0.0
+    for constraint, g in zip(constraints, values):
+        residual = np.abs(g) if constraint['type'] == 'eq' else np.maximum(0, -g)
+        worst = max(worst, residual.max(initial=0.0))
+    return worst
+
+
+def augmented_lagrangian(fun, z0, bounds, constraints, maxiter=1000, ftol=1e-9, tol=1e-8,
+                         rho=10.0, max_outer=50):
+    """
+    Bound-constrained augmented Lagrangian (PHR) with L-BFGS-B inner solves.
+
+    ``fun`` returns (value, gradient); ``constraints`` use the SLSQP dict
+    format with vector ``fun`` and 2-D ``jac``. Bounds are handled natively
+    by L-BFGS-B, so each inner iteration costs one objective/gradient
+    evaluation plus a few constraint rows instead of SLSQP's dense
+    quadratic subproblem over every variable. ``maxiter`` caps each inner
+    solve. The penalty ``rho`` grows tenfold whenever an outer iteration
+    fails to cut the constraint violation by 4x, and an inner solve that
+    ends further from feasibility than the last accepted point is discarded.
+    """
+    z = np.asarray(z0, dtype=float)
+    multipliers = [np.zeros(len(c['fun'](z))) for c in constraints]
+    violation = _violation(constraints, [c['fun'](z) for c in constraints])
+    accepted_violation = max(violation, np.sqrt(tol))
+    previous_value = None
+    total_iterations = total_evaluations = 0
+    success = False
+    message = "Maximum number of outer iterations reached"
+
+    def merit(z):
+        value, grad = fun(z)
+        for constraint, multiplier in zip(constraints, multipliers):
+            g = constraint['fun'](z)
+            if constraint['type'] == 'eq':
+                weight = multiplier + rho * g
+                value += multiplier @ g + 0.5 * rho * g @ g
+            else:
+                weight = np.minimum(0, rho * g - multiplier)
+                value += (weight @ weight - multiplier @ multiplier) / (2 * rho)
+            grad = grad + constraint['jac'](z).T @ weight
+        return value, grad
+
+    for _ in range(max_outer):
+        inner = minimize(merit, z, jac=True, method='L-BFGS-B', bounds=bounds,
+                         options={'maxiter': maxiter, 'ftol': ftol * 1e-3})
+        total_iterations += inner.nit
+        total_evaluations += inner.nfev
+
+        values = [constraint['fun'](inner.x) for constraint in constraints]
+        trial_violation = _violation(constraints, values)
+        if trial_violation > accepted_violation:
+            # The objective ran away from the feasible set (e.g. volatility -> 0
+            # on a singular covariance): retry from the last point, harder penalty
+            rho *= 10
+            continue
+
+        z, violation = inner.x, trial_violation
+        value = fun(z)[0]
+        if violation <= tol and previous_value is not None and \
+                abs(value - previous_value) <= ftol * max(1.0, abs(value)):
+            success = True
+            message = "Optimization terminated successfully"
+            break
+        previous_value = value
+
+        # First-order multiplier update; tighten the penalty if feasibility stalls
+        for k, (constraint, g) in enumerate(zip(constraints, values)):
+            if constraint['type'] == 'eq':
+                multipliers[k] = multipliers[k] + rho * g
+            else:
+                multipliers[k] = np.maximum(0, multipliers[k] - rho * g)
+        if violation > 0.25 * accepted_violation:
+            rho *= 10
+        accepted_violation = max(min(accepted_violation, violation), np.sqrt(tol))
+
+    return OptimizeResult(x=z, fun=fun(z)[0], success=success, message=message,
+                          nit=total_iterations, nfev=total_evaluations, maxcv=violation)
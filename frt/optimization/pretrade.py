@@ -0,0 +1,133 @@
+"""
+Pre-trade risk checks for a batch of candidate trades.
+
+Every trade is checked against position, sector, leverage (gross
+exposure) and historical VaR limits, using the ``whatif`` risk model of
+the portfolio the trades start from. All trades are evaluated in one
+vectorized pass. Positions and sector weights are array lookups on the
+precomputed sector labels, and VaR is re-priced exactly from
+``pnl + R[:, i] * delta_i`` for every trade at once (a periods x trades
+matrix), so no trade needs a loop of its own.
+
+Two modes:
+
+- standalone (default): each trade alone on top of the starting portfolio,
+  i.e. "may this order go out now?";
+- ``cumulative``: trades in list order, each on top of all the earlier
+  ones, i.e. every prefix of the list, to see where a sequence breaks.
+
+``fills`` scales the trades (a scalar or one fraction per trade) to check
+partial fills. A limit only fails a trade that ends beyond the limit *and*
+makes that measure worse, so risk-reducing trades on a book that already
+breaches a limit still pass.
+"""
+import numpy as np
+import pandas as pd
+
+from frt.optimization.whatif import risk_state
+
+PRETRADE_LIMITS = {
+    'max_position_weight': 0.15,
+    'min_position_weight': 0.0,
+    'sector_max_weight': 0.35,
+    'max_gross_exposure': 1.0,
+    'max_var': 0.03,            # largest historical VaR loss (fraction of NAV)
+    'var_confidence': 0.95,
+}
+
+# Tolerance for "the trade made the measure worse"
+_WORSE = 1e-12
+
+
+def _breaches(new, old, limit, upper=True):
+    """Beyond the limit and worse than before the trade"""
+    if upper:
+        return (new > limit + _WORSE) & (new > old + _WORSE)
+    return (new < limit - _WORSE) & (new < old - _WORSE)
+
+
+def check_trades(model, state, instrument_ids, deltas, limits=None, fills=1.0, cumulative=False):
+    """
+    Check candidate weight changes against ``limits`` (``PRETRADE_LIMITS`` keys).
+
+    ``state`` is the ``whatif.risk_state`` of the starting portfolio. Returns
+    a DataFrame with one row per trade: the filled ``delta``, the resulting
+    ``new_weight``, ``sector_weight``, ``gross_exposure`` and ``var_loss``,
+    a ``passed`` flag and the failed checks in ``reasons``.
+    """
+    limits = {**PRETRADE_LIMITS, **(limits or {})}
+    positions = np.array([model["position"][i] for i in instrument_ids], dtype=int)
+    deltas = np.asarray(deltas, dtype=float) * np.broadcast_to(np.asarray(fills, dtype=float), len(positions))
+    labels = model["sector_labels"][positions]
+    weights = state["weights"]
+    quantile = (1 - limits['var_confidence']) * 100
+
+    base_var_loss = -np.percentile(state["pnl"], quantile)
+    pnl_moves = model["returns"][:, positions] * deltas
+    if cumulative:
+        # Running totals per instrument / sector / book over the list order
+        moved = pd.Series(deltas).groupby(positions).cumsum().to_numpy()
+        sector_moved = pd.Series(deltas).groupby(labels).cumsum().to_numpy()
+        new_weight = weights[positions] + moved
+        old_weight = new_weight - deltas
+        gross_step = np.abs(new_weight) - np.abs(old_weight)
+        gross = np.abs(weights).sum() + np.cumsum(gross_step)
+        old_gross = gross - gross_step
+        sector_weight = state["sector_weights"][labels] + sector_moved
+        var_loss = -np.percentile(state["pnl"][:, None] + np.cumsum(pnl_moves, axis=1), quantile, axis=0)
+        old_var_loss = np.concatenate([[base_var_loss], var_loss[:-1]])
+    else:
+        old_weight = weights[positions]
+        new_weight = old_weight + deltas
+        old_gross = np.full(len(positions), np.abs(weights).sum())
+        gross = old_gross + np.abs(new_weight) - np.abs(old_weight)
+        sector_weight = state["sector_weights"][labels] + deltas
+        var_loss = -np.percentile(state["pnl"][:, None] + pnl_moves, quantile, axis=0)
+        old_var_loss = np.full(len(positions), base_var_loss)
+
+    checks = {
+        'position_limit': _breaches(new_weight, old_weight, limits['max_position_weight'])
+                          | _breaches(new_weight, old_weight, limits['min_position_weight'], upper=False),
+        'sector_limit': _breaches(sector_weight, sector_weight - deltas, limits['sector_max_weight']),
+        'leverage_limit': _breaches(gross, old_gross, limits['max_gross_exposure']),
+        'var_limit': _breaches(var_loss, old_var_loss, limits['max_var']),
+    }
+    failed = np.column_stack(list(checks.values()))
+    names = np.array(list(checks))
+
+    return pd.DataFrame({
+        'instrument_id': list(instrument_ids),
+        'sector': model["sector_names"][labels],
+        'delta': deltas,
+        'new_weight': new_weight,
+        'sector_weight': sector_weight,
+        'gross_exposure': gross,
+        'var_loss': var_loss,
+        'passed': ~failed.any(axis=1),
+        'reasons': ["; ".join(names[row]) for row in failed],
+    })
+
+
+def check_trade_list(model, trade_list, limits=None, fills=1.0, cumulative=False, sells_first=True):
+    """
+    Pre-trade check for a ``trade_recommendations`` frame.
+
+    The starting portfolio is the list's ``current_weight`` column (HOLD rows
+    included); the BUY/SELL rows are checked and returned with their
+    ``instrument_name`` and ``action``. ``fills`` is a scalar or one
+    fraction per BUY/SELL row in list order. With ``sells_first`` the SELLs
+    are ordered ahead of the BUYs they fund, which matters for ``cumulative``.
+    """
+    known = trade_list[trade_list['instrument_id'].isin(model["position"])]
+    current = np.zeros(len(model["assets"]))
+    current[[model["position"][i] for i in known['instrument_id']]] = known['current_weight'].to_numpy()
+
+    orders = known[known['action'] != 'HOLD']
+    orders = orders.assign(fill=np.broadcast_to(np.asarray(fills, dtype=float), len(orders)))
+    if sells_first:
+        orders = orders.sort_values('action', key=lambda action: action != 'SELL', kind='stable')
+    result = check_trades(model, risk_state(model, current), orders['instrument_id'], orders['change'],
+                          limits, orders['fill'].to_numpy(), cumulative)
+    result.insert(1, 'instrument_name', orders['instrument_name'].to_numpy())
+    result.insert(2, 'action', orders['action'].to_numpy())
+    return result
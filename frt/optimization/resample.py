@@ -0,0 +1,121 @@
+"""
+Resampled (Michaud-style) portfolio optimization.
+
+A single mean-variance optimum leans hard on the estimation noise in the
+mean returns and the covariance. Resampling bootstraps the return periods
+``n_draws`` times, re-estimates the mean and the factor covariance from
+each draw and solves the same constrained QP for every one of them. The
+resampled portfolio is the average of those weights. The budget, bound,
+sector and turnover constraints are the same convex set in every draw, so
+the average satisfies them too; the tracking-error limit is not, since
+each draw measures it with its own bootstrap covariance, and the average
+can exceed it under the full-sample covariance.
+
+The inputs are first solved once on the full sample; every draw is then
+warm-started from that solution's ADMM state, the centre of the bootstrap
+distribution (chaining draw to draw is no better, since consecutive draws
+are independent). Draws are split into chunks solved in parallel
+processes, as in ``frontier.efficient_frontier``. Each draw has its own
+random stream seeded by ``(seed, draw)`` and the same starting state, so
+the result does not depend on the number of processes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import OptimizeResult
+
+from frt.optimization.factor import factor_covariance
+from frt.optimization.qp import solve_mean_variance
+from frt.profiling import profiled
+
+# A weight above this counts as "selected" for the selection frequency
+SELECTION_THRESHOLD = 1e-3
+
+
+def bootstrap_inputs(returns, rng, n_factors=10):
+    """Mean returns and factor covariance of one bootstrap sample of the return periods"""
+    n_periods = len(returns)
+    sample = returns[rng.integers(0, n_periods, n_periods)]
+    return sample.mean(axis=0), factor_covariance(sample, n_factors=n_factors)
+
+
+def _resample_chunk(task):
+    """Solve a chunk of bootstrap draws, each warm-started from the full-sample state"""
+    returns, draws, seed, current, benchmark, config, groups, risk_aversion, n_factors, state = task
+    solutions = []
+    for draw in draws:
+        mu, model = bootstrap_inputs(returns, np.random.default_rng([seed, draw]), n_factors)
+        result = solve_mean_variance(mu, model, current, benchmark, config, groups,
+                                     risk_aversion=risk_aversion, warm_start=state)
+        solutions.append((result.x, result.success, result.nit))
+    return solutions
+
+
+def weight_dispersion(weights, assets, threshold=SELECTION_THRESHOLD):
+    """
+    Per-instrument stability of a (draws x instruments) weight matrix:
+    mean, standard deviation, 5th/50th/95th percentiles and the share of
+    draws holding the instrument.
+    """
+    p05, p50, p95 = np.percentile(weights, [5, 50, 95], axis=0)
+    return pd.DataFrame({
+        'instrument_id': list(assets),
+        'mean_weight': weights.mean(axis=0),
+        'std_weight': weights.std(axis=0, ddof=1) if len(weights) > 1 else np.zeros(weights.shape[1]),
+        'p05_weight': p05,
+        'median_weight': p50,
+        'p95_weight': p95,
+        'selection_frequency': (weights > threshold).mean(axis=0),
+    })
+
+
+@profiled(rows="returns")
+def resampled_optimization(returns, current_weights, benchmark_weights, config, groups=None,
+                           n_draws=200, risk_aversion=10.0, n_factors=10, initial_weights=None,
+                           seed=42, n_jobs=None):
+    """
+    Resampled mean-variance portfolio under ``config``.
+
+    ``returns`` is the (periods x instruments) returns frame the inputs are
+    estimated from; ``initial_weights`` seeds the full-sample solve. Draws
+    whose ADMM solve did not converge are left out of the average (unless
+    none converged). Returns an ``OptimizeResult`` with ``x`` (the averaged
+    weights), ``point`` (the full-sample optimum), ``weights`` (draws x
+    instruments), ``converged`` (per draw), ``dispersion`` (see
+    ``weight_dispersion``), ``success`` (every draw converged) and ``nit``
+    (mean ADMM iterations per draw).
+    """
+    assets = list(getattr(returns, "columns", range(np.shape(returns)[1])))
+    values = np.asarray(returns, dtype=float)
+    current = np.asarray(current_weights, dtype=float)
+    benchmark = np.asarray(benchmark_weights, dtype=float)
+
+    point = solve_mean_variance(values.mean(axis=0), factor_covariance(values, n_factors=n_factors),
+                                current, benchmark, config, groups, risk_aversion=risk_aversion,
+                                initial_weights=initial_weights)
+
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, n_draws))
+    tasks = [(values, chunk, seed, current, benchmark, config, groups, risk_aversion, n_factors,
+              point.state)
+             for chunk in np.array_split(np.arange(n_draws), n_jobs) if len(chunk)]
+    if n_jobs == 1:
+        chunks = [_resample_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = list(pool.map(_resample_chunk, tasks))
+    solutions = [solution for chunk in chunks for solution in chunk]
+
+    weights = np.vstack([w for w, _, _ in solutions])
+    converged = np.array([success for _, success, _ in solutions])
+    kept = weights[converged] if converged.any() else weights
+    return OptimizeResult(
+        x=kept.mean(axis=0),
+        point=point.x,
+        weights=weights,
+        converged=converged,
+        dispersion=weight_dispersion(kept, assets),
+        success=bool(converged.all()),
+        nit=float(np.mean([nit for _, _, nit in solutions])),
+    )
@@ -0,0 +1,207 @@
+"""
+Risk-budgeting (risk parity) portfolios.
+
+Finds long-only weights whose risk contributions ``w_i (S w)_i / sigma``
+match target budgets ``b`` (summing to 1) by minimising the convex function
+
+    F(y) = 0.5 * y' S y - sum(b * log(y)),    y > 0
+
+whose optimum satisfies ``y_i (S y)_i = b_i``; the weights are ``y / sum(y)``.
+
+Two solvers only touch the covariance through products:
+
+- ``newton``: damped Newton with preconditioned conjugate gradients on
+  ``(S + diag(b / y^2)) p = -grad``; each CG step is one ``S @ v``, so with
+  a factor model it is ``O(n k)`` and scales to 10k+ instruments.
+- ``ccd``: cyclical coordinate descent with the closed-form update
+  ``y_i = (-c + sqrt(c^2 + 4 S_ii b_i)) / (2 S_ii)``, maintaining ``S y``
+  incrementally from one covariance column (dense) or one loading row
+  (factor model) per coordinate. Simple and exact per step, but it
+  converges linearly and needs hundreds of sweeps on correlated books.
+
+``cov`` is either a dense covariance or a ``factor.factor_covariance`` dict.
+"""
+import numpy as np
+import pandas as pd
+from scipy.optimize import OptimizeResult
+
+from frt.optimization.factor import factor_cov_matvec
+
+
+def _matvec(cov):
+    if isinstance(cov, dict):
+        return lambda x: factor_cov_matvec(cov, x)
+    cov = np.asarray(cov, dtype=float)
+    return lambda x: cov @ x
+
+
+def _diagonal(cov):
+    if isinstance(cov, dict):
+        return cov["specific_variance"] + np.sum(cov["loadings"] ** 2, axis=1)
+    return np.diag(np.asarray(cov, dtype=float)).copy()
+
+
+def risk_budgets(assets, instrument_sector_map=None, sector_budgets=None, instrument_budgets=None):
+    """
+    Target risk budgets aligned to ``assets``, normalised to sum to 1.
+
+    ``instrument_budgets`` (instrument_id -> budget) takes precedence;
+    otherwise ``sector_budgets`` (sector -> budget) is split equally among
+    each sector's instruments; with neither every instrument gets 1/n
+    (equal risk contribution). Instruments without a budget get none.
+    ``sector_budgets`` needs ``instrument_sector_map``.
+    """
+    assets = list(assets)
+    if instrument_budgets is not None:
+        budgets = pd.Series(instrument_budgets).reindex(assets).fillna(0).to_numpy(dtype=float)
+    elif sector_budgets is not None:
+        if instrument_sector_map is None:
+            raise ValueError("Sector risk budgets need an instrument_sector_map")
+        sectors = pd.Series([instrument_sector_map.get(a) for a in assets])
+        counts = sectors.map(sectors.value_counts())
+        budgets = (sectors.map(sector_budgets) / counts).fillna(0).to_numpy(dtype=float)
+    else:
+        budgets = np.ones(len(assets))
+    if budgets.sum() <= 0:
+        raise ValueError("Risk budgets must have a positive total")
+    return budgets / budgets.sum()
+
+
+def risk_contributions(weights, cov):
+    """(absolute risk contributions summing to volatility, percentage contributions)"""
+    weights = np.asarray(weights, dtype=float)
+    marginal = _matvec(cov)(weights)
+    volatility = np.sqrt(weights @ marginal)
+    contributions = weights * marginal / volatility
+    return contributions, contributions / volatility * 100
+
+
+def _pcg(apply, rhs, preconditioner, tol, max_iter):
+    """Preconditioned conjugate gradients for an SPD operator"""
+    x = np.zeros_like(rhs)
+    r = rhs.copy()
+    z = r / preconditioner
+    p = z.copy()
+    rz = r @ z
+    target = tol * np.linalg.norm(rhs)
+    for _ in range(max_iter):
+        ap = apply(p)
+        step = rz / (p @ ap)
+        x += step * p
+        r -= step * ap
+        if np.linalg.norm(r) <= target:
+            break
+        z = r / preconditioner
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+    return x
+
+
+def _start(budgets, diagonal, matvec):
+    """Inverse-volatility guess scaled to minimise F along its ray"""
+    y = budgets / np.sqrt(diagonal)
+    return y / np.sqrt(y @ matvec(y))
+
+
+def _newton(cov, budgets, tol, max_iter, cg_tol=1e-2, cg_max_iter=100):
+    matvec = _matvec(cov)
+    diagonal = _diagonal(cov)
+    y = _start(budgets, diagonal, matvec)
+
+    def objective(y):
+        return 0.5 * y @ matvec(y) - budgets @ np.log(y)
+
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        sy = matvec(y)
+        if np.max(np.abs(y * sy - budgets)) <= tol:
+            return y, iterations, True
+        grad = sy - budgets / y
+        curvature = budgets / y ** 2
+        step = _pcg(lambda v: matvec(v) + curvature * v, -grad, diagonal + curvature,
+                    cg_tol, cg_max_iter)
+
+        # Stay inside y > 0, then backtrack (Armijo)
+        shrinking = step < 0
+        t = min(1.0, 0.99 * np.min(-y[shrinking] / step[shrinking])) if shrinking.any() else 1.0
+        current = objective(y)
+        slope = grad @ step
+        while objective(y + t * step) > current + 1e-4 * t * slope and t > 1e-12:
+            t *= 0.5
+        y = y + t * step
+    return y, iterations, False
+
+
+def _ccd(cov, budgets, tol, max_iter):
+    factor = isinstance(cov, dict)
+    matvec = _matvec(cov)
+    diagonal = _diagonal(cov)
+    y = _start(budgets, diagonal, matvec)
+    n = len(y)
+
+    if factor:
+        loadings, specific = cov["loadings"], cov["specific_variance"]
+        exposure = loadings.T @ y
+    else:
+        dense = np.asarray(cov, dtype=float)
+        sy = dense @ y
+
+    sweeps = 0
+    for sweeps in range(1, max_iter + 1):
+        for i in range(n):
+            if factor:
+                own = loadings[i] @ exposure + specific[i] * y[i]
+            else:
+                own = sy[i]
+            others = own - diagonal[i] * y[i]
+            new = (-others + np.sqrt(others * others + 4 * diagonal[i] * budgets[i])) / (2 * diagonal[i])
+            delta = new - y[i]
+            if factor:
+                exposure += delta * loadings[i]
+            else:
+                sy += delta * dense[:, i]
+            y[i] = new
+        if np.max(np.abs(y * matvec(y) - budgets)) <= tol:
+            return y, sweeps, True
+    return y, sweeps, False
+
+
+SOLVERS = {
+    "newton": _newton,
+    "ccd": _ccd,
+}
+
+
+def solve_risk_budget(cov, budgets, method="newton", tol=1e-10, max_iter=200):
+    """
+    Long-only weights whose risk contributions match ``budgets``.
+
+    Returns an ``OptimizeResult`` with ``x`` (weights summing to 1),
+    ``risk_contribution_pct``, ``max_budget_error_pct`` (largest gap to the
+    target in percentage points), ``nit`` and ``success``.
+    """
+    budgets = np.asarray(budgets, dtype=float)
+    budgets = budgets / budgets.sum()
+    if method not in SOLVERS:
+        raise ValueError(f"Unknown method: {method}")
+
+    # Zero budgets mean zero weight; solve on the remaining instruments
+    active = budgets > 0
+    if isinstance(cov, dict):
+        sub_cov = {**cov, "loadings": cov["loadings"][active],
+                   "specific_variance": cov["specific_variance"][active]}
+    else:
+        sub_cov = np.asarray(cov, dtype=float)[np.ix_(active, active)]
+    y, iterations, converged = SOLVERS[method](sub_cov, budgets[active], tol, max_iter)
+
+    weights = np.zeros(len(budgets))
+    weights[active] = y / y.sum()
+    _, pct = risk_contributions(weights, cov)
+    return OptimizeResult(
+        x=weights,
+        success=converged,
+        nit=iterations,
+        risk_contribution_pct=pct,
+        max_budget_error_pct=np.max(np.abs(pct - budgets * 100)),
+    )
@@ -0,0 +1,156 @@
+"""
+Headless optimization stage: target weights, trade list and risk reports
+without plotting.
+
+Runs the notebook's max-Sharpe optimization under ``DEFAULT_CONSTRAINTS``
+(or a JSON file of overrides) with the TCA-calibrated rebalance costs in the
+objective, so the target weights and trades are already net of costs. The
+resampling, frontier, risk-parity and pre-trade sections stay in the
+notebook.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frt.backtest.costs import calibrate_from_tca, rebalance_cost, rebalance_cost_coefficients
+from frt.data import load_instruments, load_trades, returns_matrix
+from frt.optimization.objectives import (calculate_expected_shortfall, calculate_tracking_error, calculate_var,
+                                         portfolio_return, portfolio_volatility)
+from frt.optimization.optimizer import DEFAULT_CONSTRAINTS, optimize_portfolio, sector_groups
+from frt.optimization.whatif import RISK_MODEL_FILE, save_risk_model
+from frt.paths import INSTRUMENTS_FILE, PORTFOLIO_DIR, TCA_DIR, TRADES_FILE
+from frt.profiling import add_rows, profiled
+from frt.tca.impact import IMPACT_PARAMETERS_FILE
+
+RISK_FREE_RATE = 0.02
+
+# Periods of the returns matrix (one per timestamp) a rebalance is held for;
+# the one-off trading cost is weighed against this many periods of expected return
+HOLDING_PERIODS = 21
+
+
+def current_portfolio(trades, assets):
+    """Current weights: mean ``portfolio_weight`` of the recent trades per instrument, normalised"""
+    current = trades.groupby("instrument_id")["portfolio_weight"].mean().reindex(assets).fillna(0)
+    return current / current.sum() if current.sum() > 0 else current
+
+
+def risk_return_report(weights, current, benchmark, mean_returns, cov_matrix, returns):
+    """The notebook's current vs optimized risk / return table (formatted strings)"""
+    expected_return = portfolio_return(weights, mean_returns)
+    expected_volatility = portfolio_volatility(weights, cov_matrix)
+    current_return = portfolio_return(current, mean_returns)
+    current_volatility = portfolio_volatility(current, cov_matrix)
+    current_sharpe = (current_return - RISK_FREE_RATE) / current_volatility if current_volatility > 0 else 0
+    return pd.DataFrame({
+        'Metric': ['Expected Annual Return', 'Expected Volatility', 'Sharpe Ratio', 'Tracking Error',
+                   'Value at Risk (95%)', 'Expected Shortfall (95%)', 'Total Turnover', 'Number of Holdings',
+                   'Max Position Size', 'Gross Exposure', 'Net Exposure'],
+        'Current Portfolio': [
+            f"{current_return*100:.2f}%", f"{current_volatility*100:.2f}%", f"{current_sharpe:.3f}",
+            "N/A", "N/A", "N/A", "N/A", f"{(current > 0.001).sum()}", f"{current.max()*100:.2f}%",
+            f"{current.sum()*100:.2f}%", f"{current.sum()*100:.2f}%"
+        ],
+        'Optimized Portfolio': [
+            f"{expected_return*100:.2f}%", f"{expected_volatility*100:.2f}%",
+            f"{(expected_return - RISK_FREE_RATE) / expected_volatility:.3f}",
+            f"{calculate_tracking_error(weights, benchmark, cov_matrix)*100:.2f}%",
+            f"{calculate_var(weights, returns, confidence=0.95)*100:.2f}%",
+            f"{calculate_expected_shortfall(weights, returns, confidence=0.95)*100:.2f}%",
+            f"{np.sum(np.abs(weights - current))*100:.2f}%", f"{(weights > 0.001).sum()}",
+            f"{weights.max()*100:.2f}%", f"{weights.sum()*100:.2f}%", f"{weights.sum()*100:.2f}%"
+        ]
+    })
+
+
+@profiled
+def run_optimization(trades_path=TRADES_FILE, instruments_path=INSTRUMENTS_FILE, output_dir=PORTFOLIO_DIR,
+                     config_path=None, impact_parameters=TCA_DIR / IMPACT_PARAMETERS_FILE,
+                     holding_periods=HOLDING_PERIODS):
+    """
+    Write the target weights, trade recommendations, risk / return report,
+    risk budget and sector allocation reports and the what-if risk model;
+    returns the written paths. ``config_path`` is an optional JSON file of
+    ``CONSTRAINTS_CONFIG`` overrides. The trading cost is amortized over
+    ``holding_periods`` return periods, and ``expected_alpha`` in the trade
+    list is the expected return of each trade over that horizon.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    config = dict(DEFAULT_CONSTRAINTS)
+    if config_path:
+        with open(config_path) as f:
+            config.update(json.load(f))
+    trades = load_trades(trades_path)
+    add_rows(len(trades))
+    instruments = load_instruments(instruments_path)
+    returns = returns_matrix(trades)
+    mean_returns, cov_matrix = returns.mean(), returns.cov()
+
+    assets = returns.columns.tolist()
+    current = current_portfolio(trades, assets).to_numpy()
+    benchmark = np.ones(len(assets)) / len(assets)
+    instrument_sector_map = instruments.set_index('instrument_id')['sector'].to_dict()
+    instrument_name_map = instruments.set_index('instrument_id')['instrument_name'].to_dict()
+
+    cost_params = calibrate_from_tca(trades, instruments)
+    if impact_parameters and Path(impact_parameters).exists():
+        cost_params["impact_parameters"] = str(impact_parameters)
+    coefficients = rebalance_cost_coefficients(assets, cost_params)
+
+    result = optimize_portfolio(mean_returns, cov_matrix, current, benchmark, config,
+                                sector_groups(assets, instrument_sector_map),
+                                initial_weights=current if current.sum() > 0 else benchmark,
+                                objective="max_sharpe", risk_free_rate=RISK_FREE_RATE, costs=coefficients,
+                                holding_periods=holding_periods)
+    weights = result.x / result.x.sum()
+    print(f"{'✅' if result.success else '⚠️ '} Optimization: turnover {np.abs(weights - current).sum():.2%}, "
+          f"expected cost {result.trading_cost * 1e4:.1f} bps")
+
+    target_weights = pd.DataFrame({
+        "instrument_id": assets,
+        "instrument_name": [instrument_name_map.get(id, f"Unknown_{id}") for id in assets],
+        "current_weight": current,
+        "target_weight": weights,
+        "change": weights - current,
+        "sector": [instrument_sector_map.get(id) for id in assets],
+    }).sort_values('target_weight', ascending=False)
+
+    positions = pd.Series(range(len(assets)), index=assets)[target_weights['instrument_id']].to_numpy()
+
+    recommendations = target_weights.copy()
+    recommendations['action'] = np.select([recommendations['change'] > 0.001, recommendations['change'] < -0.001],
+                                          ['BUY', 'SELL'], 'HOLD')
+    recommendations['trade_size_pct'] = recommendations['change'].abs() * 100
+    recommendations['expected_alpha'] = (recommendations['change'] * holding_periods
+                                         * recommendations['instrument_id'].map(mean_returns))
+    recommendations['expected_cost'] = rebalance_cost(
+        recommendations['change'], {name: values[positions] for name, values in coefficients.items()})
+    recommendations['expected_cost_bps'] = recommendations['expected_cost'] * 10000
+    recommendations['net_expected_alpha'] = recommendations['expected_alpha'] - recommendations['expected_cost']
+
+    risk_contributions = (weights * np.dot(cov_matrix, weights)) / portfolio_volatility(weights, cov_matrix)
+    risk_budget = pd.DataFrame({
+        'instrument_id': assets,
+        'instrument_name': [instrument_name_map.get(id, f"Unknown_{id}") for id in assets],
+        'weight': weights,
+        'risk_contribution': risk_contributions,
+        'risk_contribution_pct': risk_contributions / risk_contributions.sum() * 100
+    }).sort_values('risk_contribution', ascending=False)
+    sector_allocation = target_weights.groupby('sector').agg({
+        'target_weight': 'sum',
+        'instrument_id': 'count'
+    }).rename(columns={'instrument_id': 'num_holdings'})
+
+    paths = [output_dir / name for name in ("target_weights_with_names.csv", "trade_recommendations_with_names.csv",
+                                            "portfolio_risk_return_report.csv", "risk_budget_report.csv",
+                                            "sector_allocation_report.csv", RISK_MODEL_FILE)]
+    target_weights.to_csv(paths[0], index=False)
+    recommendations.to_csv(paths[1], index=False)
+    risk_return_report(weights, current, benchmark, mean_returns, cov_matrix, returns).to_csv(paths[2], index=False)
+    risk_budget.to_csv(paths[3], index=False)
+    sector_allocation.to_csv(paths[4])
+    save_risk_model(paths[5], assets, returns, weights, benchmark, [instrument_sector_map.get(id) for id in assets])
+    return paths
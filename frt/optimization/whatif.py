@@ -0,0 +1,99 @@
+"""
+What-if risk for edited portfolio weights.
+
+The notebook saves a compact risk model (``risk_model.npz``): the
+historical returns matrix ``R`` (periods x instruments), the optimized and
+benchmark weights and each instrument's sector. The centred returns are an
+exact square root of the sample covariance (``S = Rc' Rc / (T - 1)``), so
+one P&L path ``p = R w`` carries every measure in the risk report:
+volatility is ``std(p)``, VaR and expected shortfall are its historical
+quantile and tail mean, and tracking error is ``std(p - R b)``.
+
+``apply_weight_changes`` moves the path by ``R[:, i] * delta_i`` for the
+edited instruments only, ``O(T)`` per edit instead of re-pricing the whole
+book, and updates the sector weights the same way, so a dashboard slider
+can recompute risk on every interaction.
+"""
+import numpy as np
+import pandas as pd
+
+RISK_MODEL_FILE = "risk_model.npz"
+
+
+def save_risk_model(path, assets, returns, weights, benchmark_weights, sectors):
+    """
+    Save the what-if inputs. ``returns`` is the (periods x instruments)
+    returns frame, ``sectors`` the sector of each instrument in ``assets``.
+    """
+    sectors = pd.Series(sectors).fillna("Unknown").to_numpy(dtype=str)
+    sector_names, sector_labels = np.unique(sectors, return_inverse=True)
+    np.savez(
+        path,
+        assets=np.asarray(assets, dtype=str),
+        returns=np.asarray(returns, dtype=float),
+        weights=np.asarray(weights, dtype=float),
+        benchmark_weights=np.asarray(benchmark_weights, dtype=float),
+        sector_names=sector_names,
+        sector_labels=sector_labels,
+    )
+
+
+def load_risk_model(path=RISK_MODEL_FILE):
+    """Risk model dict with a ``position`` lookup (instrument_id -> column)"""
+    with np.load(path) as data:
+        model = {key: data[key] for key in data.files}
+    model["returns"] = np.asfortranarray(model["returns"])   # contiguous instrument columns
+    model["position"] = {asset: i for i, asset in enumerate(model["assets"])}
+    return model
+
+
+def risk_state(model, weights=None):
+    """Portfolio P&L path, benchmark path and sector weights for ``weights`` (default: optimized)"""
+    weights = model["weights"] if weights is None else np.asarray(weights, dtype=float)
+    return {
+        "weights": weights.copy(),
+        "pnl": model["returns"] @ weights,
+        "benchmark_pnl": model["returns"] @ model["benchmark_weights"],
+        "sector_weights": np.bincount(model["sector_labels"], weights=weights,
+                                      minlength=len(model["sector_names"])),
+    }
+
+
+def apply_weight_changes(state, model, positions, new_weights):
+    """
+    New state with the instruments at ``positions`` moved to ``new_weights``.
+
+    Only the edited columns of the returns matrix are touched; ``state`` is
+    left unchanged so the base portfolio can be reused for every what-if.
+    """
+    positions = np.asarray(positions, dtype=int)
+    deltas = np.asarray(new_weights, dtype=float) - state["weights"][positions]
+    weights = state["weights"].copy()
+    weights[positions] += deltas
+    return {
+        "weights": weights,
+        "pnl": state["pnl"] + model["returns"][:, positions] @ deltas,
+        "benchmark_pnl": state["benchmark_pnl"],
+        "sector_weights": state["sector_weights"] + np.bincount(
+            model["sector_labels"][positions], weights=deltas, minlength=len(model["sector_names"])),
+    }
+
+
+def risk_metrics(state, confidence=0.95):
+    """Return, volatility, VaR, expected shortfall, tracking error and exposure of a state"""
+    pnl = state["pnl"]
+    var = np.percentile(pnl, (1 - confidence) * 100)
+    return {
+        "expected_return": pnl.mean(),
+        "volatility": pnl.std(ddof=1),
+        "var": var,
+        "expected_shortfall": pnl[pnl <= var].mean(),
+        "tracking_error": (pnl - state["benchmark_pnl"]).std(ddof=1),
+        "gross_exposure": np.abs(state["weights"]).sum(),
+        "net_exposure": state["weights"].sum(),
+    }
+
+
+def sector_weights(state, model):
+    """Sector weights of a state as a Series"""
+    return pd.Series(state["sector_weights"], index=model["sector_names"])
@@ -0,0 +1,17 @@
+"""Locations of the shared data files and the per-module output directories."""
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DATA_DIR = ROOT / "Data"
+RISK_DIR = ROOT / "Risk Analytics Module"
+BACKTEST_DIR = ROOT / "Backtesting Framework & Strategies"
+PORTFOLIO_DIR = ROOT / "Portfolio Optimization Module"
+TCA_DIR = ROOT / "Transaction Cost Analysis (TCA)"
+REPORT_DIR = ROOT / "Daily Risk & Performance"
+
+INSTRUMENTS_FILE = DATA_DIR / "project2_instruments.csv"
+TRADES_FILE = DATA_DIR / "project2_trading.csv"
+
+ALERT_RULES_FILE = ROOT / "alert_rules.json"
+STORE_FILE = ROOT / "monitoring.db"
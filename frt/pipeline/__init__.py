@@ -0,0 +1 @@
+"""Incremental, concurrent runner for the module notebooks (``python -m frt.pipeline``)."""
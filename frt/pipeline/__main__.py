@@ -0,0 +1,47 @@
+"""
+Run the module notebooks as an incremental pipeline.
+
+    python -m frt.pipeline                     # everything that is out of date
+    python -m frt.pipeline report              # the daily report and what it needs
+    python -m frt.pipeline tca --force         # rerun TCA even if nothing changed
+    python -m frt.pipeline --dry-run           # show what would run
+    python -m frt.pipeline --profile profiles  # record timings into profiles/ (see frt.profiling)
+
+Exits with status 1 when a stage fails or cannot run.
+"""
+import argparse
+import sys
+
+from frt.pipeline.stages import STAGES
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["execute"]:
+        # Worker mode: one notebook, in this process
+        from frt.pipeline.notebook import execute_notebook
+        execute_notebook(argv[1])
+        return 0
+
+    parser = argparse.ArgumentParser(description="Incremental pipeline over the module notebooks")
+    parser.add_argument("stages", nargs="*", help=f"stages to bring up to date {sorted(STAGES)} (default: all)")
+    parser.add_argument("--force", action="store_true", help="rerun the selected stages even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only show what would run")
+    parser.add_argument("--jobs", type=int, default=None, help="maximum stages running at once")
+    parser.add_argument("--profile", metavar="DIR", default=None,
+                        help="record profile.jsonl / profile.prom into DIR (same as FRT_PROFILE=DIR)")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        from frt.profiling import enable
+        enable(args.profile)
+
+    from frt.pipeline.dag import run_pipeline
+    results = run_pipeline(args.stages or None, force=args.force, dry_run=args.dry_run, max_workers=args.jobs)
+    print()
+    print(results.to_string(index=False, float_format=lambda s: f"{s:.1f}"))
+    return 1 if results["status"].isin(["failed", "blocked", "missing_inputs"]).any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
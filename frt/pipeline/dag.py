@@ -0,0 +1,254 @@
+"""
+Incremental DAG runner for the module notebooks.
+
+A stage's key is a hash of its notebook code, the ``frt`` modules the
+notebook imports (followed transitively) and the contents of its input
+files. A stage is skipped when its key matches the last successful run
+and all of its outputs still exist. The edges come from the stage table:
+a stage depends on whichever stages write its inputs.
+
+Outputs are hashed by content, not by timestamp. So:
+
+- editing a value in a notebook's config cell reruns that stage; its
+  dependants only rerun if the outputs they read actually changed;
+- editing an ``frt`` module reruns exactly the notebooks that import it.
+
+Ready stages run concurrently, each in its own Python process
+(``python -m frt.pipeline execute``) with its log in ``pipeline_logs/``.
+File hashes are cached by size and modification time in the state file,
+so unchanged inputs are not re-read.
+
+Every stage run is recorded in the alert / audit store with the content
+hashes of its notebook and inputs; after a run that changed anything the
+alert rules are re-evaluated and their episodes stored too.
+
+With ``FRT_PROFILE`` set (``--profile``) the workers inherit it and
+record each notebook and cell into the same profile files.
+"""
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from frt.paths import ALERT_RULES_FILE, ROOT, STORE_FILE
+from frt.pipeline.notebook import code_cells, code_hash
+from frt.pipeline.stages import STAGES, output_writers
+from frt.profiling import export_prometheus
+
+STATE_FILE = ROOT / "pipeline_state.json"
+LOG_DIR = ROOT / "pipeline_logs"
+
+FRT_IMPORT = re.compile(r"^[ \t]*(?:from[ \t]+(frt(?:\.\w+)*)[ \t]+import[ \t]+(\([^)]*\)|[\w \t,]+)"
+                        r"|import[ \t]+(frt(?:\.\w+)*))", re.MULTILINE)
+
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"stages": {}, "files": {}}
+
+
+def save_state(state, path=STATE_FILE):
+    with open(path, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def file_hash(path, state):
+    """Content hash of ``path``, reused from ``state`` while size and mtime are unchanged"""
+    stat = path.stat()
+    key = str(path.relative_to(ROOT))
+    cached = state["files"].get(key)
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["sha256"]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    state["files"][key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+    return digest.hexdigest()
+
+
+def _module_file(name):
+    """Source file of an ``frt`` module or package, or None"""
+    base = ROOT.joinpath(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def frt_dependencies(sources):
+    """``frt`` source files imported by ``sources``, followed transitively (package ``__init__`` included)"""
+    found = set()
+    pending = list(sources)
+    while pending:
+        for package, names, module in FRT_IMPORT.findall(pending.pop()):
+            imported = [n.split()[0] for n in names.strip("()").split(",") if n.strip()]
+            modules = [module] if module else [package] + [f"{package}.{n}" for n in imported]
+            for name in modules:
+                parts = name.split(".")
+                for depth in range(1, len(parts) + 1):
+                    path = _module_file(".".join(parts[:depth]))
+                    if path is not None and path not in found:
+                        found.add(path)
+                        pending.append(path.read_text(encoding="utf-8"))
+    return sorted(found)
+
+
+def stage_key(name, stage, state):
+    """Hash of the stage's code and inputs; None while an input is missing"""
+    notebook = ROOT / stage["notebook"]
+    digest = hashlib.sha256(f"{name}\0{code_hash(notebook)}".encode())
+    for path in frt_dependencies(code_cells(notebook)):
+        digest.update(f"\0{path.relative_to(ROOT)}:{file_hash(path, state)}".encode())
+    for relative in sorted(stage["inputs"]):
+        path = ROOT / relative
+        if not path.exists():
+            return None
+        digest.update(f"\0{relative}:{file_hash(path, state)}".encode())
+    return digest.hexdigest()
+
+
+def stage_dependencies(stages=STAGES):
+    """Stage -> set of stages that write one of its inputs"""
+    writers = output_writers(stages)
+    return {name: {writers[i] for i in stage["inputs"] if i in writers and writers[i] != name}
+            for name, stage in stages.items()}
+
+
+def _with_upstream(targets, dependencies):
+    selected, pending = set(), list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(dependencies[name])
+    return selected
+
+
+def _execute(name, stage):
+    """Run one stage's notebook in a fresh process; returns (return code, seconds)"""
+    LOG_DIR.mkdir(exist_ok=True)
+    env = dict(os.environ, MPLBACKEND="Agg",
+               PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    start = time.perf_counter()
+    with open(LOG_DIR / f"{name}.log", "w") as log:
+        process = subprocess.run([sys.executable, "-m", "frt.pipeline", "execute", str(ROOT / stage["notebook"])],
+                                 cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return process.returncode, time.perf_counter() - start
+
+
+def _record_run(connection, name, stage, status, seconds, state, version):
+    from frt.alerts.store import record_run
+
+    files = [stage["notebook"]] + sorted(stage["inputs"])
+    inputs = {relative: file_hash(ROOT / relative, state) for relative in files if (ROOT / relative).exists()}
+    started = datetime.now() - timedelta(seconds=seconds)
+    return record_run(connection, name, "pipeline", status, started.isoformat(sep=" ", timespec="seconds"),
+                      round(seconds, 2), inputs, version)
+
+
+def _record_alerts(connection, run_id, rules_path=ALERT_RULES_FILE):
+    from frt.alerts.rules import evaluate_rules, load_rules, load_sources
+    from frt.alerts.store import record_alerts, source_modules
+
+    config = load_rules(rules_path)
+    episodes = evaluate_rules(load_sources(config), config["rules"])
+    return record_alerts(connection, episodes, source_modules(config, output_writers()), [r["name"] for r in config["rules"]], run_id)
+
+
+def run_pipeline(targets=None, force=False, dry_run=False, max_workers=None, stages=STAGES,
+                 state_path=STATE_FILE, store_path=STORE_FILE):
+    """
+    Bring ``targets`` (default: every stage) and their upstream stages up to date.
+
+    ``force`` reruns the selected stages regardless of their keys;
+    ``dry_run`` only reports what would run (assuming upstream outputs
+    change). Returns one row per stage with ``status`` (ran, skipped,
+    failed, blocked, missing_inputs or would_run) and ``seconds``.
+    Runs are recorded in the store at ``store_path`` (None: not recorded).
+    """
+    dependencies = stage_dependencies(stages)
+    unknown = set(targets or []) - set(stages)
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {sorted(unknown)}; choose from {sorted(stages)}")
+    selected = _with_upstream(targets or list(stages), dependencies)
+    state = load_state(state_path)
+    results = {}
+    store, run_id = None, None
+    if store_path is not None and not dry_run:
+        from frt.alerts.store import code_version, connect
+        store, version = connect(store_path), code_version()
+
+    def ready():
+        return [name for name in stages if name in selected and name not in results and name not in running
+                and all(d in results and results[d]["status"] in ("ran", "skipped", "would_run")
+                        for d in dependencies[name] if d in selected)]
+
+    def blocked():
+        return [name for name in stages if name in selected and name not in results and name not in running
+                and any(d in results and results[d]["status"] not in ("ran", "skipped", "would_run")
+                        for d in dependencies[name])]
+
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages)) as pool:
+        while True:
+            for name in blocked():
+                results[name] = {"status": "blocked", "seconds": 0.0}
+            for name in ready():
+                stage = stages[name]
+                upstream_changed = any(results[d]["status"] in ("ran", "would_run") for d in dependencies[name])
+                key = stage_key(name, stage, state)
+                outputs_exist = all((ROOT / output).exists() for output in stage["outputs"])
+                previous = state["stages"].get(name, {})
+                if key is None and not (dry_run and upstream_changed):
+                    results[name] = {"status": "missing_inputs", "seconds": 0.0}
+                elif not force and not (dry_run and upstream_changed) and outputs_exist \
+                        and previous.get("key") == key:
+                    results[name] = {"status": "skipped", "seconds": 0.0}
+                elif dry_run:
+                    results[name] = {"status": "would_run", "seconds": 0.0}
+                else:
+                    running[name] = pool.submit(_execute, name, stage)
+                    print(f"▶️  {name}: running ({stage['notebook']})", flush=True)
+            if not running:
+                if len(results) == len(selected):
+                    break
+                continue
+
+            done, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+            for name in [n for n, future in running.items() if future in done]:
+                code, seconds = running.pop(name).result()
+                if code == 0:
+                    # Key recomputed after the run: a stage that rewrites its own inputs keeps a valid key
+                    state["stages"][name] = {"key": stage_key(name, stages[name], state),
+                                             "finished": datetime.now().isoformat(timespec="seconds"),
+                                             "seconds": round(seconds, 2)}
+                    for output in stages[name]["outputs"]:
+                        if (ROOT / output).exists():
+                            file_hash(ROOT / output, state)
+                    save_state(state, state_path)
+                results[name] = {"status": "ran" if code == 0 else "failed", "seconds": seconds}
+                if store is not None:
+                    run_id = _record_run(store, name, stages[name], results[name]["status"], seconds, state, version)
+                print(f"{'✅' if code == 0 else '❌'} {name}: {results[name]['status']} in {seconds:.1f}s"
+                      + ("" if code == 0 else f" (log: {LOG_DIR / (name + '.log')})"), flush=True)
+
+    save_state(state, state_path)
+    if store is not None:
+        if run_id is not None and ALERT_RULES_FILE.exists():
+            new = _record_alerts(store, run_id)
+            print(f"🔔 alerts: {new} new breach episode(s) recorded", flush=True)
+        store.close()
+    # The workers each exported on exit; this one sees all of their records
+    export_prometheus()
+    return pd.DataFrame([{"stage": name, **results[name]} for name in stages if name in results])
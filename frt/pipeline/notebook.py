@@ -0,0 +1,48 @@
+"""
+Headless notebook execution.
+
+The code cells are run in order in one namespace, in the notebook's own
+directory (the notebooks use relative paths), with matplotlib on the Agg
+backend so figures are saved but never shown. IPython magics and shell
+escapes (``%...``, ``!...``) are skipped. The notebook file itself is not
+modified. With profiling on (``frt.profiling``) the notebook and each of
+its cells are recorded as blocks.
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from frt.profiling import profile
+
+MAGIC = re.compile(r"^\s*[%!]")
+
+
+def code_cells(path):
+    """Source of each code cell of the notebook at ``path``"""
+    with open(path, encoding="utf-8") as f:
+        notebook = json.load(f)
+    return ["".join(cell["source"]) for cell in notebook["cells"] if cell["cell_type"] == "code"]
+
+
+def code_hash(path):
+    """Hash of the notebook's code only (outputs and metadata change on every run)"""
+    digest = hashlib.sha256()
+    for source in code_cells(path):
+        digest.update(source.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def execute_notebook(path):
+    """Run the code cells of ``path``; an exception in a cell stops the run and propagates"""
+    path = Path(path).resolve()
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    os.chdir(path.parent)
+    namespace = {"__name__": "__main__", "__file__": str(path)}
+    with profile(f"notebook.{path.stem}"):
+        for index, source in enumerate(code_cells(path)):
+            source = "\n".join(line for line in source.splitlines() if not MAGIC.match(line))
+            print(f"--- [{path.name}] cell {index}", flush=True)
+            with profile(f"notebook.{path.stem}[cell {index}]"):
+                exec(compile(source, f"{path.name}[cell {index}]", "exec"), namespace)
@@ -0,0 +1,83 @@
+"""
+The module notebooks as pipeline stages.
+
+Each stage lists the files it reads and writes, relative to the repository
+root. Dependencies are not declared: a stage runs after every stage that
+writes one of its inputs. Every file that downstream stages or the
+dashboard read is listed, including ones a run may reuse instead of
+rewriting (the cached efficient frontier, the order-size bucket edges
+fixed on the first run), so a deleted one brings its stage back. The
+incremental TCA stores (daily aggregates, sketches) are internal state,
+not outputs.
+"""
+DATA_INPUTS = ["Data/project2_trading.csv", "Data/project2_instruments.csv"]
+
+RISK = "Risk Analytics Module"
+BACKTEST = "Backtesting Framework & Strategies"
+PORTFOLIO = "Portfolio Optimization Module"
+TCA = "Transaction Cost Analysis (TCA)"
+REPORT = "Daily Risk & Performance"
+
+STAGES = {
+    "risk": {
+        "notebook": f"{RISK}/Ristanalysis.ipynb",
+        "inputs": DATA_INPUTS,
+        "outputs": [f"{RISK}/daily_risk_metrics.csv", f"{RISK}/sector_exposure.csv"],
+    },
+    "tca": {
+        "notebook": f"{TCA}/TCA.ipynb",
+        "inputs": DATA_INPUTS,
+        "outputs": [
+            f"{TCA}/weekly_tca_summary.csv",
+            f"{TCA}/Weekly_TCA_Report.xlsx",
+            f"{TCA}/impact_parameters.csv",
+            f"{TCA}/tca_cube.npz",
+            f"{TCA}/trade_benchmarks.csv",
+            f"{TCA}/order_size_buckets.json",
+        ],
+    },
+    "backtest": {
+        "notebook": f"{BACKTEST}/bt.ipynb",
+        "inputs": DATA_INPUTS + [f"{TCA}/impact_parameters.csv"],
+        "outputs": [
+            f"{BACKTEST}/backtest_results.csv",
+            f"{BACKTEST}/backtest_results_walkforward.csv",
+            f"{BACKTEST}/backtest_detailed_metrics.json",
+            f"{BACKTEST}/backtest_config.json",
+        ],
+    },
+    "optimization": {
+        "notebook": f"{PORTFOLIO}/Porfoliooptimization.ipynb",
+        "inputs": DATA_INPUTS + [f"{TCA}/impact_parameters.csv"],
+        "outputs": [
+            f"{PORTFOLIO}/target_weights_with_names.csv",
+            f"{PORTFOLIO}/trade_recommendations_with_names.csv",
+            f"{PORTFOLIO}/portfolio_risk_return_report.csv",
+            f"{PORTFOLIO}/risk_budget_report.csv",
+            f"{PORTFOLIO}/risk_parity_report.csv",
+            f"{PORTFOLIO}/sector_allocation_report.csv",
+            f"{PORTFOLIO}/efficient_frontier.csv",
+            f"{PORTFOLIO}/random_portfolios.csv",
+            f"{PORTFOLIO}/risk_model.npz",
+        ],
+    },
+    "report": {
+        "notebook": f"{REPORT}/R&Preport.ipynb",
+        "inputs": [
+            f"{RISK}/daily_risk_metrics.csv",
+            f"{RISK}/sector_exposure.csv",
+            f"{BACKTEST}/backtest_results.csv",
+            f"{BACKTEST}/backtest_results_walkforward.csv",
+            f"{PORTFOLIO}/target_weights_with_names.csv",
+            f"{PORTFOLIO}/trade_recommendations_with_names.csv",
+            f"{PORTFOLIO}/portfolio_risk_return_report.csv",
+            f"{TCA}/weekly_tca_summary.csv",
+        ],
+        "outputs": [f"{REPORT}/daily_report.xlsx"],
+    },
+}
+
+
+def output_writers(stages=STAGES):
+    """Output path (relative to the repository root) -> the stage that writes it"""
+    return {output: name for name, stage in stages.items() for output in stage["outputs"]}
@@ -0,0 +1,291 @@
+"""
+Opt-in profiling of the stages and their major functions.
+
+    FRT_PROFILE=profiles python -m frt all
+    FRT_PROFILE=profiles python -m frt.pipeline --force
+
+``FRT_PROFILE`` names the output directory (or call ``enable``). Blocks
+are marked with the ``profiled`` decorator or the ``profile`` context
+manager; each finished block appends one line to ``profile.jsonl``::
+
+    {"time": "...", "pid": 4711, "name": "frt.backtest.engine.backtest_signals",
+     "parent": "frt.backtest.registry.run_strategies", "status": "ok",
+     "wall_seconds": 0.41, "cpu_seconds": 0.39, "peak_rss_bytes": 412876800,
+     "rss_growth_bytes": 20971520, "rows": 1250}
+
+CPU time includes child processes reaped inside the block (process pool
+workers, pipeline notebooks). Peak RSS is the process high-water mark at
+the end of the block and ``rss_growth_bytes`` how much the block raised
+it. ``rows`` is the length of the result or of the named argument.
+
+``profile.prom`` holds the per-block totals in the Prometheus text format
+(for node_exporter's textfile collector or any local scraper). It is
+rebuilt from the JSON lines, so the records of every process writing to
+the directory are included: after an outermost block (at most once a
+second) and at exit.
+
+The directory is passed on through the environment, so pipeline workers
+and pool processes record into the same files. Disabled, a decorated
+function costs one global lookup and ``profile`` returns a shared no-op
+block.
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+ENV_VAR = "FRT_PROFILE"
+JSONL_FILE = "profile.jsonl"
+PROM_FILE = "profile.prom"
+EXPORT_SECONDS = 1.0
+
+# Prometheus metric -> (type, help), one series per block name
+METRICS = [
+    ("frt_profile_calls_total", "counter", "Finished calls of the block."),
+    ("frt_profile_errors_total", "counter", "Calls of the block that raised."),
+    ("frt_profile_wall_seconds_total", "counter", "Wall time spent in the block."),
+    ("frt_profile_cpu_seconds_total", "counter", "CPU time spent in the block, including reaped children."),
+    ("frt_profile_rows_total", "counter", "Rows processed by the block."),
+    ("frt_profile_last_wall_seconds", "gauge", "Wall time of the latest call of the block."),
+    ("frt_profile_peak_rss_bytes", "gauge", "Highest process peak RSS seen at the end of the block."),
+    ("frt_profile_max_rss_growth_bytes", "gauge", "Largest peak RSS increase during one call of the block."),
+]
+
+# ru_maxrss is in KiB on Linux, bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+_directory = None
+_local = threading.local()
+_lock = threading.Lock()
+_last_export = 0.0
+_exit_registered = False
+
+
+def enable(directory):
+    """Record into ``directory`` (also for child processes started from now on)"""
+    global _directory
+    directory = Path(directory).resolve()
+    directory.mkdir(parents=True, exist_ok=True)
+    os.environ[ENV_VAR] = str(directory)
+    _directory = directory
+
+
+def disable():
+    global _directory
+    os.environ.pop(ENV_VAR, None)
+    _directory = None
+
+
+def enabled():
+    return _directory is not None
+
+
+def _peak_rss():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+def _cpu_seconds():
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class _Block:
+    """One running profiled block; set ``rows`` inside it to record a row count"""
+    __slots__ = ("name", "rows", "parent", "_start", "_cpu", "_rss")
+
+    def __init__(self, name, rows=None):
+        self.name, self.rows = name, rows
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._rss = _peak_rss()
+        self._cpu = _cpu_seconds()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._start
+        cpu = _cpu_seconds() - self._cpu
+        rss = _peak_rss()
+        stack = _stack()
+        stack.pop()
+        _write({
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "pid": os.getpid(),
+            "name": self.name,
+            "parent": self.parent,
+            "status": "ok" if exc_type is None else "error",
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(cpu, 6),
+            "peak_rss_bytes": rss,
+            "rss_growth_bytes": None if rss is None else rss - self._rss,
+            "rows": None if self.rows is None else int(self.rows),
+        }, outermost=not stack)
+        return False
+
+
+class _NoBlock:
+    """The block handed out while profiling is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NO_BLOCK = _NoBlock()
+
+
+def _stack():
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def profile(name, rows=None):
+    """Context manager timing the block as ``name``"""
+    if _directory is None:
+        return _NO_BLOCK
+    return _Block(name, rows)
+
+
+def add_rows(rows):
+    """Add ``rows`` to the row count of the innermost running block"""
+    if _directory is None:
+        return
+    stack = _stack()
+    if stack:
+        stack[-1].rows = (stack[-1].rows or 0) + rows
+
+
+def _length(value):
+    return len(value) if hasattr(value, "__len__") else None
+
+
+def profiled(func=None, *, name=None, rows=None):
+    """
+    Decorator recording every call of the function (as ``module.qualname``
+    unless ``name`` is given). ``rows`` is the name of an argument whose
+    length is the row count, or a function of the result; by default the
+    length of a frame / series / array result. ``add_rows`` inside the
+    function counts rows otherwise.
+    """
+    if func is None:
+        return functools.partial(profiled, name=name, rows=rows)
+    label = name or f"{func.__module__}.{func.__qualname__}"
+    signature = inspect.signature(func) if isinstance(rows, str) else None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _directory is None:
+            return func(*args, **kwargs)
+        with _Block(label) as block:
+            if signature is not None:
+                block.rows = _length(signature.bind_partial(*args, **kwargs).arguments.get(rows))
+            result = func(*args, **kwargs)
+            if callable(rows):
+                block.rows = rows(result)
+            elif rows is None and getattr(result, "ndim", 0) > 0:
+                block.rows = len(result)
+        return result
+    return wrapper
+
+
+def _write(record, outermost):
+    global _exit_registered
+    directory = _directory
+    if directory is None:
+        return
+    line = json.dumps(record) + "\n"
+    with _lock:
+        # One append per record: lines from concurrent processes do not interleave
+        with open(directory / JSONL_FILE, "a") as f:
+            f.write(line)
+        if not _exit_registered:
+            atexit.register(export_prometheus)
+            _exit_registered = True
+    if outermost and time.monotonic() - _last_export >= EXPORT_SECONDS:
+        export_prometheus()
+
+
+def read_records(directory=None):
+    """The JSON-lines records in ``directory`` (default: the enabled one)"""
+    path = Path(directory or _directory) / JSONL_FILE
+    records = []
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.endswith("\n"):
+                    records.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def export_prometheus(directory=None):
+    """Rewrite ``profile.prom`` from ``profile.jsonl``; returns its path (None while disabled)"""
+    global _last_export
+    directory = Path(directory) if directory else _directory
+    if directory is None:
+        return None
+    totals = defaultdict(lambda: defaultdict(float))
+    for record in read_records(directory):
+        block = totals[record["name"]]
+        block["frt_profile_calls_total"] += 1
+        block["frt_profile_errors_total"] += record["status"] != "ok"
+        block["frt_profile_wall_seconds_total"] += record["wall_seconds"]
+        block["frt_profile_cpu_seconds_total"] += record["cpu_seconds"]
+        block["frt_profile_rows_total"] += record["rows"] or 0
+        block["frt_profile_last_wall_seconds"] = record["wall_seconds"]
+        for metric, field in (("frt_profile_peak_rss_bytes", "peak_rss_bytes"),
+                              ("frt_profile_max_rss_growth_bytes", "rss_growth_bytes")):
+            if record[field] is not None:
+                block[metric] = max(block[metric], record[field])
+
+    lines = []
+    for metric, kind, help_text in METRICS:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        lines += [f'{metric}{{block="{_label(name)}"}} {_number(values[metric])}'
+                  for name, values in sorted(totals.items())]
+    path = directory / PROM_FILE
+    # Written aside and renamed: a scraper never reads a half-written file
+    temporary = directory / f".{PROM_FILE}.{os.getpid()}"
+    temporary.write_text("\n".join(lines) + "\n")
+    os.replace(temporary, path)
+    _last_export = time.monotonic()
+    return path
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
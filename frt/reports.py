@@ -0,0 +1,114 @@
+"""
+Streaming Excel reports.
+
+``pd.ExcelWriter`` (openpyxl, or xlsxwriter in its default mode) keeps
+every cell of the workbook in memory until the file is closed.
+``write_workbook`` uses xlsxwriter's ``constant_memory`` mode instead: each
+row is flushed to disk as soon as it is written, so memory stays flat
+however long the sheets are.
+
+- A frame longer than an Excel sheet is continued on ``Name (2)``,
+  ``Name (3)``, ... with the header repeated.
+- ``siblings`` (``"csv.gz"`` or ``"parquet"``) also saves every sheet with
+  at least ``sibling_min_rows`` rows as its own file next to the workbook,
+  for tabs too large to open comfortably in Excel. Parquet needs pyarrow.
+- ``write_workbooks`` writes several workbooks in parallel processes
+  (xlsxwriter is pure Python, so threads would serialise on the GIL).
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import xlsxwriter
+
+from frt.profiling import add_rows, profiled
+
+EXCEL_MAX_ROWS = 1_048_576     # including the header row
+SHEET_NAME_LENGTH = 31
+CONVERT_ROWS = 10_000
+
+SIBLING_WRITERS = {
+    "csv.gz": lambda frame, path: frame.to_csv(path, index=False, compression="gzip"),
+    "parquet": lambda frame, path: frame.to_parquet(path, index=False),
+}
+
+
+def _sheet_names(name, parts):
+    """Valid, unique-per-part sheet names: ``name``, ``name (2)``, ..."""
+    name = re.sub(r"[\[\]:*?/\\]", "_", str(name))
+    names = []
+    for part in range(1, parts + 1):
+        suffix = "" if part == 1 else f" ({part})"
+        names.append(name[:SHEET_NAME_LENGTH - len(suffix)] + suffix)
+    return names
+
+
+def _write_sheet(worksheet, frame, start, stop, header_format):
+    """Header plus rows ``start:stop`` of ``frame``, row by row (required by constant_memory)"""
+    worksheet.write_row(0, 0, [str(column) for column in frame.columns], header_format)
+    row = 1
+    for block_start in range(start, min(stop, len(frame)), CONVERT_ROWS):
+        # Python scalars (None for missing) a block at a time, to keep memory flat
+        block = frame.iloc[block_start:min(block_start + CONVERT_ROWS, stop)]
+        for record in block.astype(object).where(block.notna(), None).to_numpy():
+            worksheet.write_row(row, 0, record)
+            row += 1
+
+
+@profiled
+def write_workbook(path, sheets, max_rows=EXCEL_MAX_ROWS, siblings=None, sibling_min_rows=0):
+    """
+    Write ``sheets`` (sheet name -> DataFrame, in order) to ``path``.
+
+    Returns the sheet names written, including continuation sheets, and the
+    sibling files. Frames with a meaningful index should be ``reset_index()``
+    first.
+    """
+    path = Path(path)
+    rows_per_sheet = max_rows - 1
+    written = {"sheets": [], "siblings": []}
+
+    workbook = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "nan_inf_to_errors": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
+    header_format = workbook.add_format({"bold": True, "border": 1})
+    try:
+        for name, frame in sheets.items():
+            add_rows(len(frame))
+            parts = max(1, -(-len(frame) // rows_per_sheet))
+            for part, sheet_name in enumerate(_sheet_names(name, parts)):
+                worksheet = workbook.add_worksheet(sheet_name)
+                _write_sheet(worksheet, frame, part * rows_per_sheet, (part + 1) * rows_per_sheet, header_format)
+                written["sheets"].append(sheet_name)
+
+            if siblings is not None and len(frame) >= sibling_min_rows:
+                slug = re.sub(r"[^0-9A-Za-z]+", "_", str(name)).strip("_").lower()
+                sibling = path.with_name(f"{path.stem}_{slug}.{siblings}")
+                SIBLING_WRITERS[siblings](frame, sibling)
+                written["siblings"].append(str(sibling))
+    finally:
+        workbook.close()
+    return written
+
+
+def _write_job(job):
+    path, sheets, options = job
+    return write_workbook(path, sheets, **options)
+
+
+@profiled(rows="jobs")
+def write_workbooks(jobs, n_jobs=None):
+    """
+    Write several workbooks at once. ``jobs`` is a list of ``(path, sheets)``
+    or ``(path, sheets, options)`` where ``options`` are ``write_workbook``
+    keyword arguments. Returns the ``write_workbook`` results in job order.
+    """
+    jobs = [(job[0], job[1], job[2] if len(job) > 2 else {}) for job in jobs]
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(jobs)))
+    if n_jobs == 1:
+        return [_write_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return list(pool.map(_write_job, jobs))
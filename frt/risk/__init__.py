@@ -0,0 +1 @@
+"""Risk analytics: historical VaR / expected shortfall, stress scenarios and sector exposure."""
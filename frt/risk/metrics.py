@@ -0,0 +1,61 @@
+"""
+Historical risk measures on the portfolio return series.
+
+The portfolio return of a period is the sum of the instrument returns.
+VaR is the lower ``1 - confidence`` quantile of that series and expected
+shortfall the mean of the returns below it, so both are returns (negative
+for a loss), not loss amounts.
+"""
+import pandas as pd
+
+from frt.profiling import profiled
+
+CONFIDENCE_LEVELS = [0.95, 0.99]
+
+STRESS_SCENARIOS = {
+    "Rate_Shock": lambda total: total - 0.05,
+    "Volatility_Spike": lambda total: total * 1.5,
+    "Sector_Drawdown": lambda total: total - 0.1,
+}
+
+
+def var(returns, confidence=0.95):
+    return returns.quantile(1 - confidence)
+
+
+def es(returns, confidence=0.95):
+    var_level = var(returns, confidence)
+    return returns[returns < var_level].mean()
+
+
+def portfolio_returns(returns):
+    """Portfolio return per period: the sum of the instrument returns"""
+    return returns.sum(axis=1)
+
+
+@profiled(rows="total_returns")
+def risk_metrics(total_returns, levels=CONFIDENCE_LEVELS):
+    """One-row frame with ``VaR_<NN>`` and ``ES_<NN>`` for each confidence level"""
+    metrics = {}
+    for level in levels:
+        metrics[f"VaR_{int(level*100)}"] = var(total_returns, level)
+        metrics[f"ES_{int(level*100)}"] = es(total_returns, level)
+    return pd.DataFrame([metrics])
+
+
+@profiled(rows="total_returns")
+def stress_test(total_returns, scenarios=STRESS_SCENARIOS):
+    """Portfolio returns under each scenario (scenario name -> function of the return series)"""
+    return pd.DataFrame({name: scenario(total_returns) for name, scenario in scenarios.items()})
+
+
+@profiled(rows="trades")
+def exposure_by_sector(trades, instruments):
+    """Average ``portfolio_weight`` of the trades per instrument sector"""
+    merged = trades.merge(instruments[["instrument_id", "sector"]], on="instrument_id", how="left")
+    return merged.groupby("sector")["portfolio_weight"].mean().reset_index()
+
+
+def var_breaches(total_returns, confidence=0.99):
+    """Periods whose portfolio return is below the historical VaR"""
+    return total_returns[total_returns < var(total_returns, confidence)]
@@ -0,0 +1,31 @@
+"""Headless risk stage: the Risk Analytics notebook's outputs without plotting."""
+from pathlib import Path
+
+import pandas as pd
+
+from frt.data import load_instruments, load_trades, returns_matrix
+from frt.paths import INSTRUMENTS_FILE, RISK_DIR, TRADES_FILE
+from frt.profiling import add_rows, profiled
+from frt.risk.metrics import exposure_by_sector, portfolio_returns, risk_metrics, stress_test, var_breaches
+
+
+@profiled
+def run_risk(trades_path=TRADES_FILE, instruments_path=INSTRUMENTS_FILE, output_dir=RISK_DIR):
+    """Write ``daily_risk_metrics.csv`` and ``sector_exposure.csv``; returns the written paths"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    trades = load_trades(trades_path)
+    add_rows(len(trades))
+    instruments = load_instruments(instruments_path)
+
+    total_returns = portfolio_returns(returns_matrix(trades))
+    risk_df = risk_metrics(total_returns)
+    stress_df = stress_test(total_returns)
+    breaches = var_breaches(total_returns, 0.99)
+    print(f"📉 VaR 95%: {risk_df['VaR_95'].iloc[0]:.4f}, ES 95%: {risk_df['ES_95'].iloc[0]:.4f}, "
+          f"{len(breaches)} periods beyond the 99% VaR")
+
+    paths = [output_dir / "daily_risk_metrics.csv", output_dir / "sector_exposure.csv"]
+    pd.concat([risk_df, stress_df], axis=1).to_csv(paths[0], index=False)
+    exposure_by_sector(trades, instruments).to_csv(paths[1], index=False)
+    return paths
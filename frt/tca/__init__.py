@@ -0,0 +1 @@
+"""Transaction cost analysis: per-trade cost measures and incremental aggregate stores."""
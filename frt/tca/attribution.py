@@ -0,0 +1,76 @@
+"""
+Cost breakdown and P&L attribution over a set of trades.
+
+Needs the per-trade values from ``add_tca_columns``. Total cost is
+slippage + commission + market impact; the cost-adjusted alpha is what is
+left of the P&L after the beta component and the costs.
+"""
+import pandas as pd
+
+from frt.profiling import profiled
+
+
+@profiled(rows="trades")
+def attribution_totals(trades):
+    """Total P&L, alpha (raw and cost-adjusted), beta, timing and cost components (USD)"""
+    alpha_adjusted = trades["pnl_usd"] - trades["beta_value"] - trades["cost_value"]
+    return {
+        "total_pnl": trades["pnl_usd"].sum(),
+        "total_alpha": trades["alpha_value"].sum(),
+        "total_alpha_adj": alpha_adjusted.sum(),
+        "total_beta": trades["beta_value"].sum(),
+        "total_timing": trades["timing_value"].sum(),
+        "total_slippage": trades["slippage_value"].sum(),
+        "total_commission": trades["commission_usd"].sum(),
+        "total_market_impact": trades["market_impact_value"].sum(),
+        "total_cost": trades["cost_value"].sum(),
+    }
+
+
+def cost_breakdown_table(totals):
+    """Cost components with their share of the total cost"""
+    total_cost = totals["total_cost"]
+    components = [totals["total_slippage"], totals["total_commission"], totals["total_market_impact"]]
+    return pd.DataFrame({
+        "Component": ["Slippage", "Commission", "Market Impact", "TOTAL"],
+        "Value (USD)": components + [total_cost],
+        "Percentage": [f"{value/total_cost*100:.1f}%" for value in components] + ["100.0%"]
+    })
+
+
+def pnl_attribution_table(totals):
+    """P&L components (cost as a negative contribution) with their share of the total P&L"""
+    total_pnl = totals["total_pnl"]
+    values = [totals["total_alpha"], totals["total_alpha_adj"], totals["total_beta"],
+              -totals["total_cost"], totals["total_timing"]]
+    return pd.DataFrame({
+        "Component": ["Total P&L", "Alpha", "Alpha (Adjusted)", "Beta", "Cost", "Timing"],
+        "Value (USD)": [total_pnl] + values,
+        "% of P&L": ["100.0%"] + [f"{value/total_pnl*100:.1f}%" for value in values]
+    })
+
+
+@profiled(rows="trades")
+def order_type_performance(trades):
+    """Slippage, impact, commission and P&L per order type"""
+    performance = trades.groupby("order_type").agg({
+        "slippage_bps": "mean",
+        "market_impact_bps": "mean",
+        "commission_usd": "sum",
+        "pnl_usd": "sum",
+        "quantity": "count"
+    }).rename(columns={"quantity": "num_trades"}).round(2)
+    performance["avg_cost_per_trade"] = (
+        performance["commission_usd"] / performance["num_trades"]
+    ).round(2)
+    return performance
+
+
+@profiled(rows="trades")
+def strategy_performance(trades):
+    """Average slippage, total P&L and total cost per strategy"""
+    return trades.groupby("strategy").agg({
+        "slippage_bps": "mean",
+        "pnl_usd": "sum",
+        "cost_value": "sum"
+    }).reset_index()
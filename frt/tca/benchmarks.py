@@ -0,0 +1,187 @@
+"""
+Benchmark-price TCA: arrival price, interval VWAP / TWAP and
+implementation shortfall per trade.
+
+The trade stream itself is the tape. Prints are sorted by instrument and
+time and carry running sums of price x quantity, quantity and price. For
+each trade, two as-of merges by instrument find the first print at or
+after ``t - window`` (forward) and the last print at or before ``t``
+(backward). The VWAP / TWAP over the window are then differences of the
+running sums. Arrival price is the last print strictly before the trade
+(falling back to the trade's own quoted ``price`` for the first print of
+an instrument). Everything is vectorized; there is no loop over trades or
+instruments.
+
+Implementation shortfall (signed so that a cost is positive, quoted
+``price`` as the decision price, orders fully filled) splits exactly into
+
+    delay        = side * (arrival - decision) * quantity
+    market drift = side * (vwap - arrival) * quantity
+    execution    = side * (execution_price - vwap) * quantity
+    commission   = commission_usd
+
+``stream_benchmarks`` processes a time-ordered trades file in chunks. Each
+chunk is joined against a carried history of the prints inside the window
+and the last print per instrument. Prints at a chunk's last timestamp are
+held back until the next chunk, so windows and arrival prices never depend
+on where the file was split. A file that turns out not to be ordered by
+timestamp is benchmarked again from a sorted in-memory copy.
+"""
+import numpy as np
+import pandas as pd
+
+from frt.profiling import profiled
+
+BENCHMARK_FILE = "trade_benchmarks.csv"
+
+# Trailing benchmark interval; 0 = prints at the trade's own timestamp
+# (the day's VWAP for date-stamped trades)
+BENCHMARK_WINDOW = "0D"
+
+TAPE_COLUMNS = ["trade_id", "timestamp", "instrument_id", "trade_type", "quantity",
+                "price", "execution_price", "commission_usd"]
+
+
+def benchmark_prices(trades, history=None, window=BENCHMARK_WINDOW):
+    """
+    Arrival, VWAP and TWAP per trade in ``trades``. ``history`` holds earlier
+    prints (same columns) used only as market context.
+    """
+    window = pd.Timedelta(window)
+    current = trades[TAPE_COLUMNS].assign(timestamp=pd.to_datetime(trades["timestamp"]), _current=True)
+    tape = current if history is None or history.empty else pd.concat(
+        [history[TAPE_COLUMNS].assign(_current=False), current], ignore_index=True)
+    tape = tape.reset_index(drop=True)
+    tape["_seq"] = np.arange(len(tape))
+
+    # Running sums in (instrument, time, arrival order); sums over a window of
+    # one instrument are differences of two positions in the same block
+    by_instrument = tape.sort_values(["instrument_id", "timestamp", "_seq"], kind="stable")
+    pos = np.empty(len(tape), dtype=np.int64)
+    pos[by_instrument["_seq"].to_numpy()] = np.arange(len(tape))
+    tape["_pos"] = pos
+    price = by_instrument["execution_price"].to_numpy(dtype=float)
+    quantity = by_instrument["quantity"].to_numpy(dtype=float)
+    running = {
+        "notional": np.concatenate([[0.0], np.cumsum(price * quantity)]),
+        "quantity": np.concatenate([[0.0], np.cumsum(quantity)]),
+        "price": np.concatenate([[0.0], np.cumsum(price)]),
+    }
+
+    prints = tape[["timestamp", "instrument_id", "_pos", "execution_price"]].sort_values(
+        ["timestamp", "_pos"], kind="stable")
+    orders = tape[tape["_current"]].sort_values("timestamp", kind="stable")
+
+    def as_of(on, direction, exact=True):
+        left = orders[["_seq", "instrument_id"]].assign(_on=on)
+        right = prints.rename(columns={"timestamp": "_on"})
+        return pd.merge_asof(left, right, on="_on", by="instrument_id", direction=direction,
+                             allow_exact_matches=exact).set_index("_seq").loc[orders["_seq"]]
+
+    start = as_of(orders["timestamp"] - window, "forward")["_pos"].to_numpy(dtype=np.int64)
+    end = as_of(orders["timestamp"], "backward")["_pos"].to_numpy(dtype=np.int64) + 1
+    previous = as_of(orders["timestamp"], "backward", exact=False)["execution_price"]
+
+    notional = running["notional"][end] - running["notional"][start]
+    volume = running["quantity"][end] - running["quantity"][start]
+    prints_in_window = end - start
+    result = orders[TAPE_COLUMNS].copy()
+    result["arrival_price"] = previous.fillna(pd.Series(orders["price"].to_numpy(), index=previous.index)).to_numpy()
+    result["vwap"] = notional / volume
+    result["twap"] = (running["price"][end] - running["price"][start]) / prints_in_window
+    result["window_prints"] = prints_in_window
+    return result.sort_index()
+
+
+def implementation_shortfall(benchmarks):
+    """Benchmark slippage (bps, cost positive) and the shortfall decomposition (USD)"""
+    side = np.where(benchmarks["trade_type"].str.upper() == "SELL", -1.0, 1.0)
+    quantity = benchmarks["quantity"].astype(float)
+    execution = benchmarks["execution_price"]
+    decision_notional = benchmarks["price"] * quantity
+
+    result = benchmarks.copy()
+    result["arrival_slippage_bps"] = side * (execution / benchmarks["arrival_price"] - 1) * 10000
+    result["vwap_slippage_bps"] = side * (execution / benchmarks["vwap"] - 1) * 10000
+    result["twap_slippage_bps"] = side * (execution / benchmarks["twap"] - 1) * 10000
+    result["is_delay"] = side * (benchmarks["arrival_price"] - benchmarks["price"]) * quantity
+    result["is_market_drift"] = side * (benchmarks["vwap"] - benchmarks["arrival_price"]) * quantity
+    result["is_execution"] = side * (execution - benchmarks["vwap"]) * quantity
+    result["is_commission"] = benchmarks["commission_usd"]
+    result["implementation_shortfall"] = (result["is_delay"] + result["is_market_drift"]
+                                          + result["is_execution"] + result["is_commission"])
+    result["implementation_shortfall_bps"] = result["implementation_shortfall"] / decision_notional * 10000
+    return result
+
+
+def _carry(tape, window):
+    """Prints later chunks still need: the window before the last timestamp and the last print per instrument"""
+    cutoff = tape["timestamp"].max() - pd.Timedelta(window)
+    last = ~tape.duplicated("instrument_id", keep="last")
+    return tape[(tape["timestamp"] >= cutoff) | last]
+
+
+class _UnorderedTrades(Exception):
+    """A later chunk of the trades file has prints before an earlier one"""
+
+
+def _sorted_chunks(trades_path, chunk_size):
+    """The whole trades file sorted by timestamp, in slices of ``chunk_size`` rows"""
+    tape = pd.read_csv(trades_path, usecols=TAPE_COLUMNS)
+    tape = tape.assign(timestamp=pd.to_datetime(tape["timestamp"])).sort_values("timestamp", kind="stable")
+    for start in range(0, len(tape), chunk_size):
+        yield tape.iloc[start:start + chunk_size]
+
+
+def stream_benchmarks(trades_path, window=BENCHMARK_WINDOW, chunk_size=1_000_000, presort=False):
+    """
+    Yield benchmarked and decomposed trades chunk by chunk for a trades file
+    ordered by timestamp. Memory is bounded by ``chunk_size`` plus the
+    prints inside one window. With ``presort`` the file is loaded and sorted
+    in memory first, for files that are not time-ordered; otherwise a chunk
+    reaching back before an earlier chunk raises ``_UnorderedTrades``.
+    """
+    if presort:
+        chunks = _sorted_chunks(trades_path, chunk_size)
+    else:
+        chunks = (chunk.assign(timestamp=pd.to_datetime(chunk["timestamp"]))
+                  for chunk in pd.read_csv(trades_path, usecols=TAPE_COLUMNS, chunksize=chunk_size))
+    history = None
+    pending = None
+    for chunk in chunks:
+        if pending is not None:
+            if chunk["timestamp"].min() < pending["timestamp"].max():
+                raise _UnorderedTrades(trades_path)
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        chunk = chunk.sort_values("timestamp", kind="stable")
+        held = chunk["timestamp"] == chunk["timestamp"].max()
+        pending = chunk[held]
+        ready = chunk[~held]
+        if ready.empty:
+            continue
+        yield implementation_shortfall(benchmark_prices(ready, history, window))
+        tape = ready if history is None else pd.concat([history, ready], ignore_index=True)
+        history = _carry(tape, window)
+    if pending is not None and not pending.empty:
+        yield implementation_shortfall(benchmark_prices(pending, history, window))
+
+
+@profiled(rows=lambda written: written)
+def write_benchmarks(trades_path, path=BENCHMARK_FILE, window=BENCHMARK_WINDOW, chunk_size=1_000_000):
+    """
+    Stream ``trades_path`` into a per-trade benchmark file; returns the number
+    of trades written. An out-of-order file is rewritten from a sorted pass.
+    """
+    try:
+        return _write_benchmark_chunks(stream_benchmarks(trades_path, window, chunk_size), path)
+    except _UnorderedTrades:
+        print(f"⚠️  {trades_path} is not ordered by timestamp; benchmarking a sorted copy in memory")
+        return _write_benchmark_chunks(stream_benchmarks(trades_path, window, chunk_size, presort=True), path)
+
+
+def _write_benchmark_chunks(chunks, path):
+    written = 0
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        written += len(chunk)
+    return written
@@ -0,0 +1,123 @@
+"""
+Precomputed TCA aggregate cube for drill-down.
+
+Trades are aggregated once to the finest grain of the drill-down
+dimensions (order type x trade type x order size x sector x instrument);
+each cell keeps the trade count and the sums (and sums of squares) of the
+cost measures. The cube is saved as ``tca_cube.npz``: integer codes per
+dimension plus one float array per measure, a small fraction of the raw
+trades file.
+
+``query_cube`` answers any slice from the cells alone. Filters are masks
+on the codes and the group-by is an ``np.bincount`` per measure, so no
+raw trade is touched and means / standard deviations are derived from
+the summed measures.
+"""
+import numpy as np
+import pandas as pd
+
+from frt.profiling import profiled
+
+CUBE_FILE = "tca_cube.npz"
+
+CUBE_DIMENSIONS = ["order_type", "trade_type", "order_size_category", "sector", "instrument_id"]
+
+# Summed per cell; the bps measures also as sums of squares
+CUBE_MEASURES = [
+    "slippage_bps", "market_impact_bps", "slippage_value", "market_impact_value",
+    "commission_usd", "cost_value", "pnl_usd", "quantity",
+]
+CUBE_SQUARES = ["slippage_bps", "market_impact_bps"]
+
+
+@profiled(rows="trades")
+def build_cube(trades, instrument_sector_map=None):
+    """
+    Aggregate trades (with the ``add_tca_columns`` measures and
+    ``order_size_category``) to cube cells. ``sector`` comes from the
+    trades or from ``instrument_sector_map``.
+    """
+    frame = trades
+    if "sector" not in frame.columns:
+        frame = frame.assign(sector=frame["instrument_id"].map(instrument_sector_map or {}))
+    keys = frame[CUBE_DIMENSIONS].astype(object).fillna("Unknown").astype(str)
+    measures = frame[CUBE_MEASURES].astype(float)
+    values = pd.concat([measures, measures[CUBE_SQUARES].pow(2).add_prefix("sumsq_")], axis=1)
+    values.insert(0, "count", 1)
+
+    cells = values.groupby([keys[d] for d in CUBE_DIMENSIONS], observed=True).sum()
+    cube = {"levels": {}, "codes": {}, "measures": {name: cells[name].to_numpy() for name in cells.columns}}
+    for i, dimension in enumerate(CUBE_DIMENSIONS):
+        codes, levels = pd.factorize(cells.index.get_level_values(i), sort=True)
+        cube["levels"][dimension] = np.asarray(levels, dtype=str)
+        cube["codes"][dimension] = codes.astype(np.int32)
+    return cube
+
+
+def save_cube(cube, path=CUBE_FILE):
+    """Save a cube as one ``.npz`` (codes as int32, levels as strings)"""
+    arrays = {}
+    for dimension in CUBE_DIMENSIONS:
+        arrays[f"levels__{dimension}"] = cube["levels"][dimension]
+        arrays[f"codes__{dimension}"] = cube["codes"][dimension]
+    for name, values in cube["measures"].items():
+        arrays[f"measures__{name}"] = values
+    np.savez_compressed(path, **arrays)
+
+
+def load_cube(path=CUBE_FILE):
+    """Load a cube saved by ``save_cube``"""
+    cube = {"levels": {}, "codes": {}, "measures": {}}
+    with np.load(path) as data:
+        for key in data.files:
+            kind, name = key.split("__", 1)
+            cube[kind][name] = data[key]
+    return cube
+
+
+def query_cube(cube, filters=None, group_by=None):
+    """
+    Slice of the cube as a DataFrame.
+
+    ``filters`` maps a dimension to the levels to keep (empty or missing =
+    all); ``group_by`` lists the dimensions to break the result down by
+    (none = a single total row). Returns trade counts, mean / std
+    slippage and impact in bps and the USD totals per group.
+    """
+    group_by = list(group_by or [])
+    n_cells = len(cube["measures"]["count"])
+    mask = np.ones(n_cells, dtype=bool)
+    for dimension, selected in (filters or {}).items():
+        if selected is not None and len(selected):
+            wanted = np.isin(cube["levels"][dimension], np.asarray(selected, dtype=str))
+            mask &= wanted[cube["codes"][dimension]]
+
+    if group_by:
+        shape = [len(cube["levels"][d]) for d in group_by]
+        flat = np.ravel_multi_index([cube["codes"][d][mask] for d in group_by], shape)
+        groups, inverse = np.unique(flat, return_inverse=True)
+    else:
+        groups, inverse = np.zeros(1, dtype=int), np.zeros(mask.sum(), dtype=int)
+
+    def total(name):
+        return np.bincount(inverse, weights=cube["measures"][name][mask], minlength=len(groups))
+
+    count = total("count")
+    result = {}
+    if group_by:
+        for dimension, codes in zip(group_by, np.unravel_index(groups, shape)):
+            result[dimension] = cube["levels"][dimension][codes]
+    result["num_trades"] = count.astype(int)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for name in CUBE_SQUARES:
+            mean = total(name) / count
+            variance = (total(f"sumsq_{name}") - count * mean ** 2) / (count - 1)
+            result[f"avg_{name}"] = mean
+            result[f"std_{name}"] = np.where(count > 1, np.sqrt(np.clip(variance, 0, None)), np.nan)
+    result["total_slippage_value"] = total("slippage_value")
+    result["total_market_impact_value"] = total("market_impact_value")
+    result["total_commission"] = total("commission_usd")
+    result["total_cost"] = total("cost_value")
+    result["total_pnl"] = total("pnl_usd")
+    result["total_volume"] = total("quantity")
+    return pd.DataFrame(result)
@@ -0,0 +1,197 @@
+"""
+Per-instrument market-impact calibration.
+
+The impact of a trade of notional ``Q`` (as a fraction of price) is modelled
+as
+
+    impact = eta * sigma * (Q / ADV) ^ beta
+
+with ``sigma`` the daily volatility (``volatility_30d / sqrt(252)``) and
+``ADV`` the instrument's ``avg_daily_volume`` (traded value, as in
+``frt.backtest.costs``). Taking logs gives a straight line,
+``log(impact / sigma) = log(eta) + beta * log(Q / ADV)``. It is fitted by
+Huber-weighted iteratively reweighted least squares, so a few outlier
+prints cannot drag the fit.
+
+Fits run per sector (pooled trades, the prior) and per instrument.
+Instruments are split into chunks fitted in parallel processes, as in
+``frontier.efficient_frontier``. Every group in a chunk is fitted at once
+with ``np.bincount`` sums. An instrument with fewer than ``min_trades``
+usable trades takes its sector's parameters. Otherwise its ``log(eta)``
+and ``beta`` are shrunk towards the sector's, with the prior worth
+``prior_trades`` trades. ``beta`` is clipped to ``BETA_BOUNDS`` so that
+the cost ``q * impact`` stays convex in the traded size.
+
+The result is a small table (``impact_parameters.csv``, one row per
+instrument) that ``frt.backtest.costs.rebalance_cost_coefficients`` reads
+for the backtester and the rebalance QP. Without a single usable trade
+there is nothing to fit: every instrument gets NaN parameters (``source``
+``default``), which the cost model replaces by its square-root default.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from frt.profiling import profiled
+
+IMPACT_PARAMETERS_FILE = "impact_parameters.csv"
+
+TRADING_DAYS = 252
+BETA_BOUNDS = (0.1, 1.0)
+HUBER_K = 1.345
+
+IMPACT_CALIBRATION = {
+    'min_trades': 20,      # fewer usable trades: use the sector prior
+    'prior_trades': 20,    # weight of the sector prior, in trades
+    'max_iter': 50,
+    'tol': 1e-8,
+}
+
+
+def impact_observations(trades, instruments):
+    """
+    Log-space regression inputs per trade: ``x = log(Q / ADV)``,
+    ``y = log(impact / sigma)`` with the instrument and sector. Trades
+    without a positive impact, notional, ADV or volatility are dropped.
+    """
+    reference = instruments.set_index("instrument_id")[["sector", "avg_daily_volume", "volatility_30d"]]
+    merged = trades[["instrument_id", "quantity", "execution_price", "market_impact_bps"]].join(
+        reference, on="instrument_id", how="inner")
+    notional = (merged["execution_price"] * merged["quantity"]).abs()
+    sigma = merged["volatility_30d"] / np.sqrt(TRADING_DAYS)
+    impact = merged["market_impact_bps"] / 10000
+    valid = (notional > 0) & (merged["avg_daily_volume"] > 0) & (sigma > 0) & (impact > 0)
+    merged = merged[valid]
+    return pd.DataFrame({
+        "instrument_id": merged["instrument_id"].to_numpy(),
+        "sector": merged["sector"].fillna("Unknown").to_numpy(),
+        "x": np.log(notional[valid] / merged["avg_daily_volume"]).to_numpy(),
+        "y": np.log(impact[valid] / sigma[valid]).to_numpy(),
+    })
+
+
+def robust_fit(groups, x, y, max_iter=50, tol=1e-8):
+    """
+    Huber IRLS line fit ``y = a + b x`` for every group label in ``groups``
+    at once. Returns (a, b, trade count) per group, in ``np.unique`` order.
+    """
+    labels, group = np.unique(groups, return_inverse=True)
+    n_groups = len(labels)
+    weights = np.ones(len(x))
+    a = np.zeros(n_groups)
+    b = np.zeros(n_groups)
+    for _ in range(max_iter):
+        sums = [np.bincount(group, weights=weights * term, minlength=n_groups)
+                for term in (np.ones_like(x), x, y, x * x, x * y)]
+        sw, sx, sy, sxx, sxy = sums
+        variance = sw * sxx - sx ** 2
+        # Groups without spread in x get a flat line at their weighted mean
+        new_b = np.divide(sw * sxy - sx * sy, variance, out=np.zeros(n_groups), where=variance > 1e-12 * sw ** 2)
+        new_a = (sy - new_b * sx) / sw
+        converged = np.max(np.abs(new_a - a) + np.abs(new_b - b)) < tol
+        a, b = new_a, new_b
+
+        residual = y - a[group] - b[group] * x
+        # Robust scale per group (MAD), then Huber weights
+        scale = 1.4826 * pd.Series(np.abs(residual)).groupby(group).median().to_numpy()
+        scale = np.where(scale > 0, scale, 1.0)
+        u = np.abs(residual) / (HUBER_K * scale[group])
+        weights = np.where(u <= 1, 1.0, 1.0 / np.maximum(u, 1e-12))
+        if converged:
+            break
+    counts = np.bincount(group, minlength=n_groups)
+    return labels, a, b, counts
+
+
+def _fit_chunk(task):
+    """Robust fits for a chunk of instruments"""
+    observations, max_iter, tol = task
+    return robust_fit(observations["instrument_id"].to_numpy(), observations["x"].to_numpy(),
+                      observations["y"].to_numpy(), max_iter, tol)
+
+
+@profiled(rows="trades")
+def calibrate_impact(trades, instruments, calibration=None, n_jobs=None):
+    """
+    Fit ``eta`` and ``beta`` per instrument with sector priors.
+
+    Returns one row per instrument in ``instruments`` with ``eta``,
+    ``beta``, the usable ``n_trades``, ``source`` (``instrument``,
+    ``sector`` or ``default``) and the sector prior (``sector_eta``,
+    ``sector_beta``).
+    """
+    calibration = {**IMPACT_CALIBRATION, **(calibration or {})}
+    observations = impact_observations(trades, instruments)
+    lo, hi = BETA_BOUNDS
+    if observations.empty:
+        return pd.DataFrame({
+            "instrument_id": instruments["instrument_id"].to_numpy(),
+            "sector": instruments["sector"].fillna("Unknown").to_numpy(),
+            "eta": np.nan, "beta": np.nan, "n_trades": 0, "source": "default",
+            "sector_eta": np.nan, "sector_beta": np.nan,
+        })
+
+    # Sector priors, with a book-wide fit for sectors without trades
+    sectors, sector_a, sector_b, _ = robust_fit(observations["sector"].to_numpy(), observations["x"].to_numpy(),
+                                                observations["y"].to_numpy(), calibration['max_iter'],
+                                                calibration['tol'])
+    _, book_a, book_b, _ = robust_fit(np.zeros(len(observations)), observations["x"].to_numpy(),
+                                      observations["y"].to_numpy(), calibration['max_iter'], calibration['tol'])
+    prior = pd.DataFrame({"sector_a": sector_a, "sector_b": np.clip(sector_b, lo, hi)}, index=sectors)
+
+    assets = observations["instrument_id"].unique()
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, len(assets)))
+    tasks = [(observations[observations["instrument_id"].isin(chunk)], calibration['max_iter'], calibration['tol'])
+             for chunk in np.array_split(assets, n_jobs) if len(chunk)]
+    if n_jobs == 1:
+        fits = [_fit_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            fits = list(pool.map(_fit_chunk, tasks))
+    fitted = pd.DataFrame({
+        "a": np.concatenate([fit[1] for fit in fits]),
+        "b": np.concatenate([fit[2] for fit in fits]),
+        "n_trades": np.concatenate([fit[3] for fit in fits]),
+    }, index=np.concatenate([fit[0] for fit in fits]))
+
+    table = instruments[["instrument_id", "sector"]].copy()
+    table["sector"] = table["sector"].fillna("Unknown")
+    table = table.join(fitted, on="instrument_id").join(prior, on="sector")
+    table["sector_a"] = table["sector_a"].fillna(book_a[0])
+    table["sector_b"] = table["sector_b"].fillna(np.clip(book_b[0], lo, hi))
+    table["n_trades"] = table["n_trades"].fillna(0).astype(int)
+
+    own = table["n_trades"] >= calibration['min_trades']
+    shrink = table["n_trades"] / (table["n_trades"] + calibration['prior_trades'])
+    a = np.where(own, shrink * table["a"] + (1 - shrink) * table["sector_a"], table["sector_a"])
+    b = np.where(own, shrink * table["b"] + (1 - shrink) * table["sector_b"], table["sector_b"])
+    return pd.DataFrame({
+        "instrument_id": table["instrument_id"],
+        "sector": table["sector"],
+        "eta": np.exp(a),
+        "beta": np.clip(b, lo, hi),
+        "n_trades": table["n_trades"],
+        "source": np.where(own, "instrument", "sector"),
+        "sector_eta": np.exp(table["sector_a"]),
+        "sector_beta": table["sector_b"],
+    }).reset_index(drop=True)
+
+
+# Path -> (modification time, parameters); a recalibrated file is re-read
+_parameters_cache = {}
+
+
+def load_impact_parameters(path=IMPACT_PARAMETERS_FILE):
+    """Fitted ``eta`` / ``beta`` indexed by instrument_id, or None if not calibrated yet"""
+    key = str(path)
+    try:
+        version = os.stat(path).st_mtime_ns
+        cached = _parameters_cache.get(key)
+        if cached is None or cached[0] != version:
+            _parameters_cache[key] = (version, pd.read_csv(path).set_index("instrument_id")[["eta", "beta"]])
+    except FileNotFoundError:
+        _parameters_cache.pop(key, None)
+        return None
+    return _parameters_cache[key][1]
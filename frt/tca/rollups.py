@@ -0,0 +1,230 @@
+"""
+Incremental TCA rollups.
+
+Instead of re-aggregating every trade on each run, the store keeps
+additive partial aggregates per day (trade count, sums and sums of
+squares of the cost measures) in ``tca_daily_aggregates.csv``. Counts,
+sums and sums of squares of disjoint sets of trades simply add, so:
+
+- a run reads only the bytes appended to the trades file since the last
+  run (the watermark in ``tca_rollup_state.json``), aggregates those rows
+  per day and adds them to the stored days;
+- weekly / monthly / quarterly summaries are a groupby-sum over at most a
+  few hundred daily rows, with means and standard deviations derived from
+  the totals.
+
+The trades file is treated as an append-only log. If it shrinks or its
+header / first trade changes, the store is rebuilt from scratch.
+"""
+import hashlib
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frt.profiling import profiled
+
+DAILY_FILE = "tca_daily_aggregates.csv"
+STATE_FILE = "tca_rollup_state.json"
+
+# Per-trade measures kept as sums (and as sums of squares for the spreads)
+SUM_COLUMNS = [
+    "slippage_bps", "slippage_value", "commission_usd", "market_impact_bps",
+    "market_impact_value", "pnl_usd", "alpha_value", "beta_value", "cost_value",
+    "timing_value", "quantity",
+]
+SQUARE_COLUMNS = ["slippage_bps", "market_impact_bps"]
+
+PERIODS = {
+    "day": ("date", lambda dates: dates.dt.strftime("%Y-%m-%d")),
+    "week": ("_week", lambda dates: dates.dt.strftime("%Y-%U")),
+    "month": ("_month", lambda dates: dates.dt.strftime("%Y-%m")),
+    "quarter": ("_quarter", lambda dates: dates.dt.to_period("Q").astype(str)),
+}
+
+
+@profiled(rows="trades")
+def add_tca_columns(trades):
+    """
+    Add the per-trade cost and attribution values (USD) used throughout TCA:
+    slippage, market impact, total cost, timing and alpha/beta split.
+    """
+    trades["slippage_value"] = (trades["execution_price"] - trades["price"]) * trades["quantity"]
+    trades["market_impact_value"] = (trades["market_impact_bps"] / 10000) * trades["execution_price"] * trades["quantity"]
+    trades["cost_value"] = trades["slippage_value"] + trades["commission_usd"] + trades["market_impact_value"]
+    trades["timing_value"] = (trades["price"] - trades["execution_price"]) * trades["quantity"]
+    if "alpha" in trades.columns:
+        trades["alpha_value"] = trades["alpha"]
+        trades["beta_value"] = trades["pnl_usd"] - trades["alpha"]
+    else:
+        # No alpha column: assume 70% market-driven, 30% alpha
+        trades["beta_value"] = trades["pnl_usd"] * 0.7
+        trades["alpha_value"] = trades["pnl_usd"] * 0.3
+    return trades
+
+
+@profiled(rows="trades")
+def daily_partials(trades):
+    """Count, sums and sums of squares per trade date (rows without a valid timestamp are dropped)"""
+    if "cost_value" not in trades.columns:
+        trades = add_tca_columns(trades.copy())
+    dates = pd.to_datetime(trades["timestamp"], errors="coerce").dt.normalize()
+    measures = trades[SUM_COLUMNS].astype(float)
+    squares = measures[SQUARE_COLUMNS].pow(2).add_prefix("sumsq_")
+    frame = pd.concat([measures.add_prefix("sum_"), squares], axis=1)
+    frame.insert(0, "count", 1)
+    return frame.groupby(dates.rename("date")).sum()
+
+
+def _fingerprint(path):
+    """Hash of the header and first trade line, identifying the log being appended to"""
+    with open(path, "rb") as f:
+        head = f.readline() + f.readline()
+    return hashlib.sha1(head).hexdigest()
+
+
+def _load_store(directory):
+    try:
+        with open(directory / STATE_FILE) as f:
+            state = json.load(f)
+        daily = pd.read_csv(directory / DAILY_FILE, parse_dates=["date"], index_col="date",
+                            float_precision="round_trip")   # exact, so unchanged runs rewrite identical files
+        return state, daily
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None, None
+
+
+class _BoundedReader(io.RawIOBase):
+    """Read-only view of an open binary file that stops at byte offset ``end``"""
+
+    def __init__(self, f, end):
+        self._f, self._end = f, end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self._end - self._f.tell())
+        if n <= 0:
+            return 0
+        data = self._f.read(n)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _last_line_end(f, start, size, block=1 << 16):
+    """Offset just past the last newline in ``[start, size)`` of ``f`` (``start`` if none)"""
+    end = size
+    while end > start:
+        begin = max(start, end - block)
+        f.seek(begin)
+        newline = f.read(end - begin).rfind(b"\n")
+        if newline >= 0:
+            return begin + newline + 1
+        end = begin
+    return start
+
+
+def _read_chunks(trades_path, columns, start, end, chunk_size):
+    with open(trades_path, "rb") as f:
+        f.seek(start)
+        yield from pd.read_csv(io.BufferedReader(_BoundedReader(f, end)), names=columns, header=None,
+                               chunksize=chunk_size)
+
+
+def read_appended(trades_path, state=None, chunk_size=250_000):
+    """
+    Trades appended to ``trades_path`` since the watermark ``state`` of a
+    previous run (None = from the start).
+
+    Returns (an iterable of DataFrame chunks of ``chunk_size`` rows, the new
+    watermark, whether the log was replaced and is being re-read in full).
+    Only complete lines are returned; a partly written last line waits for
+    the next run. The chunks are parsed straight from the file as they are
+    iterated, so memory is bounded by ``chunk_size`` however much was appended.
+    """
+    trades_path = Path(trades_path)
+    fingerprint = _fingerprint(trades_path)
+    size = trades_path.stat().st_size
+    reset = state is None or state["fingerprint"] != fingerprint or state["offset"] > size
+    if reset:
+        state = {"offset": 0, "trades": 0}
+
+    with open(trades_path, "rb") as f:
+        header = f.readline()
+        start = max(state["offset"], f.tell())
+        end = _last_line_end(f, start, size)
+
+    chunks = []
+    if end > start:
+        columns = pd.read_csv(io.BytesIO(header), nrows=0).columns
+        chunks = _read_chunks(trades_path, columns, start, end, chunk_size)
+    watermark = {"source": str(trades_path), "fingerprint": fingerprint,
+                 "offset": end, "trades": state["trades"]}
+    return chunks, watermark, reset
+
+
+@profiled(rows=lambda result: result[1])
+def update_daily_aggregates(trades_path, directory=".", chunk_size=250_000):
+    """
+    Bring the daily aggregate store in ``directory`` up to date with ``trades_path``.
+
+    Only the complete lines appended since the last run are parsed, in
+    chunks of ``chunk_size`` rows. Returns (daily aggregates indexed by
+    date, number of new trades processed).
+    """
+    directory = Path(directory)
+    state, daily = _load_store(directory)
+    chunks, watermark, reset = read_appended(trades_path, state, chunk_size)
+
+    partials = [] if reset or daily is None else [daily]
+    new_trades = 0
+    for chunk in chunks:
+        partials.append(daily_partials(chunk))
+        new_trades += len(chunk)
+    if partials:
+        daily = pd.concat(partials).groupby(level="date").sum()
+    else:
+        columns = ["count"] + [f"sum_{c}" for c in SUM_COLUMNS] + [f"sumsq_{c}" for c in SQUARE_COLUMNS]
+        daily = pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name="date"), dtype=float)
+
+    daily.to_csv(directory / DAILY_FILE)
+    watermark["trades"] += new_trades
+    with open(directory / STATE_FILE, "w") as f:
+        json.dump(watermark, f, indent=2)
+    return daily, new_trades
+
+
+@profiled(rows="daily")
+def rollup(daily, period="week"):
+    """
+    Summary per ``period`` (day, week, month or quarter) from the daily aggregates,
+    with the columns of the weekly TCA summary plus slippage / impact spreads.
+    """
+    key, label = PERIODS[period]
+    totals = daily.groupby(label(daily.index.to_series()).rename(key)).sum()
+    count = totals["count"]
+
+    def std(column):
+        mean = totals[f"sum_{column}"] / count
+        variance = (totals[f"sumsq_{column}"] - count * mean ** 2) / (count - 1)
+        return np.sqrt(variance.clip(lower=0)).where(count > 1)
+
+    return pd.DataFrame({
+        "avg_slippage_bps": totals["sum_slippage_bps"] / count,
+        "total_slippage_value": totals["sum_slippage_value"],
+        "total_commission": totals["sum_commission_usd"],
+        "avg_market_impact_bps": totals["sum_market_impact_bps"] / count,
+        "total_market_impact_value": totals["sum_market_impact_value"],
+        "total_pnl": totals["sum_pnl_usd"],
+        "total_alpha": totals["sum_alpha_value"],
+        "total_beta": totals["sum_beta_value"],
+        "total_cost": totals["sum_cost_value"],
+        "total_timing": totals["sum_timing_value"],
+        "num_trades": count,
+        "total_volume": totals["sum_quantity"],
+        "std_slippage_bps": std("slippage_bps"),
+        "std_market_impact_bps": std("market_impact_bps"),
+    }).reset_index()
@@ -0,0 +1,73 @@
+"""
+Headless TCA stage: the TCA notebook's data outputs without plotting.
+
+The incremental stores (daily aggregates, sketches, bucket edges) live in
+``output_dir`` like the notebook's, so batch and notebook runs share them.
+The Excel workbook and the recommendations stay in the notebook.
+"""
+from pathlib import Path
+
+from frt.data import load_instruments, load_trades
+from frt.paths import INSTRUMENTS_FILE, TCA_DIR, TRADES_FILE
+from frt.profiling import add_rows, profiled
+from frt.tca.attribution import attribution_totals, cost_breakdown_table, pnl_attribution_table
+from frt.tca.benchmarks import BENCHMARK_FILE, write_benchmarks
+from frt.tca.cube import CUBE_FILE, build_cube, save_cube
+from frt.tca.impact import IMPACT_PARAMETERS_FILE, calibrate_impact
+from frt.tca.rollups import add_tca_columns, rollup, update_daily_aggregates
+from frt.tca.sketches import BUCKETS_FILE, assign_buckets, load_bucket_edges, sketch_quantiles, update_sketches
+
+WEEKLY_FILE = "weekly_tca_summary.csv"
+COST_BREAKDOWN_FILE = "tca_cost_breakdown.csv"
+ATTRIBUTION_FILE = "tca_pnl_attribution.csv"
+
+
+@profiled(rows="daily_aggregates")
+def weekly_summary(daily_aggregates, sketches):
+    """Weekly rollup with cost ratios and the weekly slippage percentiles from the sketches"""
+    weekly = rollup(daily_aggregates, "week")
+    weekly["cost_to_pnl_ratio"] = (weekly["total_cost"] / weekly["total_pnl"] * 100).round(2)
+    weekly["avg_cost_per_trade"] = (weekly["total_cost"] / weekly["num_trades"]).round(2)
+    slippage_percentiles = sketch_quantiles(sketches[sketches["measure"] == "slippage_bps"], keys=["_week"])
+    return weekly.merge(
+        slippage_percentiles[["_week", "p50", "p95", "p99"]].rename(
+            columns=lambda c: f"{c}_slippage_bps" if c != "_week" else c),
+        on="_week", how="left"
+    )
+
+
+@profiled
+def run_tca(trades_path=TRADES_FILE, instruments_path=INSTRUMENTS_FILE, output_dir=TCA_DIR):
+    """
+    Write the weekly summary, benchmarks, impact parameters, drill-down cube
+    and the cost / attribution breakdowns; returns the written paths.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    trades = add_tca_columns(load_trades(trades_path))
+    add_rows(len(trades))
+    instruments = load_instruments(instruments_path)
+
+    benchmarked = write_benchmarks(trades_path, output_dir / BENCHMARK_FILE)
+    sketches, _ = update_sketches(trades_path, output_dir)
+    size_edges = load_bucket_edges(sketches, output_dir / BUCKETS_FILE)
+    trades["order_size_category"] = assign_buckets(trades["quantity"], size_edges)
+
+    impact_parameters = calibrate_impact(trades, instruments)
+    impact_parameters.to_csv(output_dir / IMPACT_PARAMETERS_FILE, index=False)
+
+    daily_aggregates, new_trades = update_daily_aggregates(trades_path, output_dir)
+    weekly = weekly_summary(daily_aggregates, sketches)
+    weekly.to_csv(output_dir / WEEKLY_FILE, index=False)
+
+    save_cube(build_cube(trades, instruments.set_index("instrument_id")["sector"].to_dict()),
+              output_dir / CUBE_FILE)
+
+    totals = attribution_totals(trades)
+    cost_breakdown_table(totals).to_csv(output_dir / COST_BREAKDOWN_FILE, index=False)
+    pnl_attribution_table(totals).to_csv(output_dir / ATTRIBUTION_FILE, index=False)
+    print(f"📏 {benchmarked:,} trades benchmarked, {new_trades:,} new trades aggregated, "
+          f"{len(weekly)} weeks, total cost ${totals['total_cost']:,.2f}")
+
+    return [output_dir / name for name in (WEEKLY_FILE, BENCHMARK_FILE, IMPACT_PARAMETERS_FILE, CUBE_FILE,
+                                           COST_BREAKDOWN_FILE, ATTRIBUTION_FILE)]
@@ -0,0 +1,180 @@
+"""
+Mergeable quantile sketches (t-digest) for TCA distributions.
+
+A sketch of one measure in one group (instrument x week by default) is a
+short list of centroids: (mean, weight) pairs sorted by mean. Centroids
+are formed on the t-digest ``k1`` scale
+
+    k(q) = compression / (2 pi) * asin(2q - 1)
+
+and every centroid covers at most one unit of ``k``. The scale is steep
+near q = 0 and q = 1, so the tails stay at (near) single trades while the
+middle is summarised coarsely. A group never has more than about
+``compression / 2`` centroids, however many trades it holds, and p95/p99
+stay accurate.
+
+Sketches of disjoint sets of trades merge by concatenating their
+centroids and compressing again. Chunks of a file, workers and stored
+weeks can therefore be combined in any order, and rolled up to coarser
+groups (e.g. all instruments per week). All groups are compressed in one
+vectorized pass over a long centroid frame.
+
+Order-size buckets come from the quantiles of a reference sketch. The
+edges are saved once (``order_size_buckets.json``), so new trades get a
+bucket without re-ranking history and old trades never change bucket.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frt.profiling import profiled
+from frt.tca.rollups import PERIODS, read_appended
+
+SKETCH_FILE = "tca_sketches.csv"
+SKETCH_STATE_FILE = "tca_sketch_state.json"
+BUCKETS_FILE = "order_size_buckets.json"
+
+SKETCH_COLUMNS = ["quantity", "slippage_bps", "market_impact_bps"]
+SKETCH_KEYS = ["instrument_id", "_week"]
+COMPRESSION = 200
+
+SIZE_LABELS = ["Small", "Medium", "Large", "Very Large"]
+
+
+def compress(centroids, keys, compression=COMPRESSION):
+    """
+    Merge the centroids of each (``keys``, measure) group onto the k1 scale.
+
+    ``centroids`` has the ``keys`` columns plus ``measure``, ``mean`` and
+    ``weight``; single observations are centroids of weight 1.
+    """
+    by = list(keys) + ["measure"]
+    frame = centroids.sort_values(by + ["mean"], kind="stable")
+    groups = frame.groupby(by, sort=False, observed=True)
+    cumulative = groups["weight"].cumsum()
+    q = (cumulative - frame["weight"] / 2) / groups["weight"].transform("sum")
+    k = np.floor(compression / (2 * np.pi) * np.arcsin(2 * q.clip(0, 1) - 1))
+
+    frame = frame.assign(k=k, weighted=frame["mean"] * frame["weight"])
+    merged = frame.groupby(by + ["k"], sort=False, observed=True)[["weighted", "weight"]].sum()
+    merged["mean"] = merged["weighted"] / merged["weight"]
+    return merged[["mean", "weight"]].reset_index().drop(columns="k")
+
+
+def sketch_trades(trades, keys=SKETCH_KEYS, columns=SKETCH_COLUMNS, compression=COMPRESSION):
+    """Sketches of ``columns`` per ``keys`` group (``_week`` is derived from ``timestamp``)"""
+    if "_week" in keys and "_week" not in trades.columns:
+        timestamps = pd.to_datetime(trades["timestamp"], errors="coerce")
+        trades = trades.assign(_week=PERIODS["week"][1](timestamps))
+    values = trades.melt(id_vars=list(keys), value_vars=list(columns), var_name="measure", value_name="mean")
+    values = values.dropna(subset=list(keys) + ["mean"]).assign(weight=1.0)
+    return compress(values, keys, compression)
+
+
+def merge_sketches(sketches, keys=SKETCH_KEYS, compression=COMPRESSION):
+    """
+    Merge sketches of disjoint trade sets (chunks, workers, stored periods).
+    ``keys`` may be a subset of the sketches' keys to roll up, e.g.
+    ``["_week"]`` for all instruments per week or ``[]`` for everything.
+    """
+    combined = pd.concat([sketch[list(keys) + ["measure", "mean", "weight"]] for sketch in sketches],
+                         ignore_index=True)
+    return compress(combined, keys, compression)
+
+
+def sketch_quantiles(sketch, quantiles=(0.5, 0.95, 0.99), keys=None):
+    """
+    Quantiles per group and measure. The groups are the sketch's own keys by
+    default, or are rolled up to ``keys`` first. Returns the keys,
+    ``measure``, ``count`` and one ``p<NN>`` column per quantile.
+    """
+    if keys is not None:
+        sketch = merge_sketches([sketch], keys)
+    by = [c for c in sketch.columns if c not in ("mean", "weight")]
+    sketch = sketch.sort_values(by + ["mean"], kind="stable")
+    group = sketch.groupby(by, sort=False, observed=True).ngroup().to_numpy()
+    weight = sketch["weight"].to_numpy()
+    total = np.bincount(group, weights=weight)
+    # Centroid centres as a fraction of their group, offset by 2 * group so all
+    # groups interpolate in one np.interp call (with flat ends on [2g, 2g + 1])
+    centre = (np.cumsum(weight) - weight / 2 - np.concatenate([[0], np.cumsum(total)[:-1]])[group]) / total[group]
+    first = np.r_[True, group[1:] != group[:-1]]
+    last = np.r_[group[1:] != group[:-1], True]
+    means = sketch["mean"].to_numpy()
+    x = np.concatenate([2.0 * group[first], 2.0 * group + centre, 2.0 * group[last] + 1])
+    y = np.concatenate([means[first], means, means[last]])
+    order = np.argsort(x, kind="stable")
+
+    result = sketch.loc[first, by].reset_index(drop=True)
+    result["count"] = total
+    groups = np.arange(len(total))
+    for quantile in quantiles:
+        result[f"p{quantile * 100:g}"] = np.interp(2.0 * groups + quantile, x[order], y[order])
+    return result
+
+
+def size_bucket_edges(sketch, quantiles=(0.25, 0.5, 0.75)):
+    """Order-size bucket edges: quantiles of ``quantity`` over the whole sketch"""
+    quantity = sketch[sketch["measure"] == "quantity"]
+    row = sketch_quantiles(quantity, quantiles, keys=[]).iloc[0]
+    return [float(row[f"p{q * 100:g}"]) for q in quantiles]
+
+
+def load_bucket_edges(sketch, path=BUCKETS_FILE):
+    """
+    Saved order-size edges, or edges calibrated from ``sketch`` and saved on
+    the first run, so buckets stay fixed as trades arrive.
+    """
+    path = Path(path)
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)["edges"]
+    edges = size_bucket_edges(sketch)
+    with open(path, "w") as f:
+        json.dump({"edges": edges, "labels": SIZE_LABELS, "trades": float(
+            sketch.loc[sketch["measure"] == "quantity", "weight"].sum())}, f, indent=2)
+    return edges
+
+
+def assign_buckets(values, edges, labels=SIZE_LABELS):
+    """Bucket labels for ``values`` (e.g. quantity) given fixed interior ``edges``"""
+    return pd.cut(values, [-np.inf] + list(edges) + [np.inf], labels=labels)
+
+
+@profiled(rows=lambda result: result[1])
+def update_sketches(trades_path, directory=".", chunk_size=250_000, compression=COMPRESSION):
+    """
+    Bring the sketch store in ``directory`` up to date with ``trades_path``.
+
+    Like the daily aggregates, only trades appended since the last run are
+    read (in chunks), sketched and merged into the stored instrument/week
+    sketches. Returns (sketches, number of new trades processed).
+    """
+    directory = Path(directory)
+    try:
+        with open(directory / SKETCH_STATE_FILE) as f:
+            state = json.load(f)
+        stored = pd.read_csv(directory / SKETCH_FILE, dtype={"_week": str}, float_precision="round_trip")
+    except (FileNotFoundError, json.JSONDecodeError):
+        state, stored = None, None
+    chunks, watermark, reset = read_appended(trades_path, state, chunk_size)
+
+    sketches = [] if reset or stored is None else [stored]
+    new_trades = 0
+    for chunk in chunks:
+        sketches.append(sketch_trades(chunk, compression=compression))
+        # Keep memory bounded: fold chunks into the store as they arrive
+        sketches = [merge_sketches(sketches, compression=compression)]
+        new_trades += len(chunk)
+    if sketches:
+        sketch = sketches[0] if len(sketches) == 1 else merge_sketches(sketches, compression=compression)
+    else:
+        sketch = pd.DataFrame(columns=SKETCH_KEYS + ["measure", "mean", "weight"])
+
+    sketch.to_csv(directory / SKETCH_FILE, index=False)
+    watermark["trades"] += new_trades
+    with open(directory / SKETCH_STATE_FILE, "w") as f:
+        json.dump(watermark, f, indent=2)
+    return sketch, new_trades
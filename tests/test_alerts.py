@@ -0,0 +1,103 @@
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from frt.alerts.monitor import poll
+from frt.alerts.rules import breach_episodes, evaluate_rules
+from frt.alerts.store import (connect, count_alerts, monitor_status, query_alerts, record_alerts,
+                              record_heartbeat, source_modules)
+
+RULE = {"name": "exposure", "source": "sector_exposure", "column": "value", "by": "sector", "time": "t",
+        "op": ">", "threshold": 1.0, "clear": 0.5}
+
+
+def grouped_history():
+    # A breaches at t=1..3, B at t=2..3; rows of the two sectors interleave in time
+    return pd.DataFrame({"t": [1, 1, 2, 2, 3, 3], "sector": ["A", "B"] * 3,
+                         "value": [5.0, 0.0, 4.0, 2.0, 3.0, 6.0]})
+
+
+def test_grouped_episodes_are_numbered_per_key():
+    episodes = breach_episodes(grouped_history(), RULE).set_index("key")
+    assert list(episodes.index) == ["A", "B"]
+    assert episodes.loc["A", ["start", "end", "periods", "peak"]].tolist() == [1, 3, 3, 5.0]
+    assert episodes.loc["B", ["start", "end", "periods", "peak"]].tolist() == [2, 3, 2, 6.0]
+    assert episodes["active"].all()
+
+
+def test_hysteresis_keeps_one_episode_until_clear():
+    frame = pd.DataFrame({"t": range(6), "sector": "A", "value": [2.0, 0.8, 2.0, 0.4, 0.0, 3.0]})
+    episodes = breach_episodes(frame, RULE)
+    assert episodes[["start", "end", "periods", "active"]].values.tolist() == [[0, 2, 3, False], [5, 5, 1, True]]
+
+
+def test_monitor_appends_match_full_evaluation(tmp_path):
+    history = grouped_history()
+    more = pd.DataFrame({"t": [4, 4, 5, 5], "sector": ["A", "B", "A", "B"], "value": [0.2, 7.0, 2.0, 0.1]})
+    path = tmp_path / "sector_exposure.csv"
+    history.to_csv(path, index=False)
+    config = {"sources": {"sector_exposure": str(path)}, "rules": [RULE]}
+    store = connect(tmp_path / "monitoring.db")
+    modules = {"sector_exposure": "risk"}
+
+    sources, resume = {}, {}
+    episodes, evaluated = poll(config, sources, resume)
+    record_alerts(store, episodes, modules, evaluated)
+    with open(path, "a") as f:
+        more.to_csv(f, header=False, index=False)
+    episodes, evaluated = poll(config, sources, resume)
+    record_alerts(store, episodes, modules, evaluated)
+
+    # Both sectors were in breach at their latest row, so each resumes from its own breach start
+    assert evaluated == ["exposure"]
+    assert sorted(zip(episodes["key"], episodes["start"])) == [("A", 1), ("A", 5), ("B", 2)]
+
+    columns = ["key", "start", "end", "periods", "peak", "active"]
+    full = evaluate_rules({"sector_exposure": pd.concat([history, more], ignore_index=True)}, [RULE])
+    full = full.assign(start=full["start"].astype(str), end=full["end"].astype(str),
+                       active=full["active"].astype(int))
+    stored = query_alerts(store)[columns].sort_values(["key", "start"]).reset_index(drop=True)
+    assert stored.equals(full[columns].sort_values(["key", "start"]).reset_index(drop=True))
+    store.close()
+
+
+def test_store_updates_episodes_in_place(tmp_path):
+    store = connect(tmp_path / "monitoring.db")
+    modules = {"sector_exposure": "risk"}
+    first = breach_episodes(grouped_history(), RULE)
+    assert record_alerts(store, first, modules) == 2
+
+    closed = first.assign(active=False)
+    assert record_alerts(store, closed, modules) == 0
+    assert count_alerts(store) == 2
+    assert count_alerts(store, active=True) == 0
+    assert json.loads(query_alerts(store, module="risk").to_json(orient="records"))[0]["rule"] == "exposure"
+    store.close()
+
+
+def test_store_records_no_episodes(tmp_path):
+    store = connect(tmp_path / "monitoring.db")
+    empty = breach_episodes(grouped_history().assign(value=0.0), RULE)
+    assert empty.empty
+    assert record_alerts(store, empty, {}) == 0
+    assert record_alerts(store, empty, {}, rules=[]) == 0
+    store.close()
+
+
+def test_source_modules_from_writers(tmp_path):
+    config = {"sources": {"exposure": str(tmp_path / "sector_exposure.csv"),
+                          "other": str(tmp_path / "extra" / "other.csv")}}
+    writers = {(tmp_path / "sector_exposure.csv").as_posix(): "risk"}
+    assert source_modules(config, writers) == {"exposure": "risk", "other": "extra"}
+
+
+def test_monitor_status_tells_idle_from_stopped(tmp_path):
+    store = connect(tmp_path / "monitoring.db")
+    assert monitor_status(store) is None
+    record_heartbeat(store, "alerts", 5.0)
+    assert monitor_status(store)["running"]
+    assert not monitor_status(store, now=datetime.now() + timedelta(minutes=5))["running"]
+    record_heartbeat(store, "alerts", 5.0, stopped=True)
+    assert not monitor_status(store)["running"]
+    store.close()
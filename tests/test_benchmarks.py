@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frt.bench.universe import iter_trades, make_instruments
+from frt.tca.benchmarks import benchmark_prices, implementation_shortfall, stream_benchmarks, write_benchmarks
+
+WINDOW = "1D"
+
+
+@pytest.fixture(scope="module")
+def trades():
+    # Three instruments per timestamp, so chunks split between prints of the same time
+    return next(iter_trades(make_instruments(8, seed=9), 900, seed=9, trades_per_timestamp=3,
+                            start="2024-01-01", end="2024-01-15"))
+
+
+def one_shot(trades):
+    return implementation_shortfall(benchmark_prices(trades, window=WINDOW)).set_index("trade_id").sort_index()
+
+
+@pytest.mark.parametrize("chunk_size", [37, 100, 10_000])
+def test_streaming_matches_one_shot(tmp_path, trades, chunk_size):
+    path = tmp_path / "trades.csv"
+    trades.to_csv(path, index=False)
+    streamed = pd.concat(stream_benchmarks(path, WINDOW, chunk_size)).set_index("trade_id").sort_index()
+    expected = one_shot(trades)
+    assert expected["window_prints"].max() > 3
+    # Window sums are differences of running sums, so values near zero differ by rounding only
+    pd.testing.assert_frame_equal(streamed, expected, check_like=True, rtol=1e-9, atol=1e-5)
+
+
+def test_unordered_file_is_benchmarked_sorted(tmp_path, trades):
+    path, output = tmp_path / "trades.csv", tmp_path / "benchmarks.csv"
+    trades.iloc[::-1].to_csv(path, index=False)
+    assert write_benchmarks(path, output, WINDOW, chunk_size=50) == len(trades)
+    written = pd.read_csv(output).set_index("trade_id").sort_index()
+    written["timestamp"] = pd.to_datetime(written["timestamp"], format="ISO8601")
+    pd.testing.assert_frame_equal(written, one_shot(trades)[written.columns], rtol=1e-9, atol=1e-5)
+
+
+def test_shortfall_decomposition_adds_up(trades):
+    result = one_shot(trades)
+    side = np.where(result["trade_type"] == "SELL", -1.0, 1.0)
+    total = side * (result["execution_price"] - result["price"]) * result["quantity"] + result["commission_usd"]
+    parts = result[["is_delay", "is_market_drift", "is_execution", "is_commission"]].sum(axis=1)
+    np.testing.assert_allclose(parts, total, rtol=1e-9)
+    np.testing.assert_allclose(result["implementation_shortfall"], total, rtol=1e-9)
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from frt.bench.universe import iter_trades, make_instruments
+from frt.tca.cube import build_cube, load_cube, query_cube, save_cube
+from frt.tca.rollups import add_tca_columns
+
+
+@pytest.fixture(scope="module")
+def trades():
+    instruments = make_instruments(25, seed=3)
+    trades = add_tca_columns(next(iter_trades(instruments, 3_000, seed=3)))
+    trades["order_size_category"] = pd.qcut(trades["quantity"], 4, labels=["Small", "Medium", "Large", "Very Large"])
+    return trades.merge(instruments[["instrument_id", "sector"]], on="instrument_id")
+
+
+def raw_query(trades, filters, group_by):
+    for dimension, selected in filters.items():
+        trades = trades[trades[dimension].astype(str).isin(selected)]
+    grouped = trades.groupby([trades[d].astype(str) for d in group_by])
+    return pd.DataFrame({
+        "num_trades": grouped.size(),
+        "avg_slippage_bps": grouped["slippage_bps"].mean(),
+        "std_slippage_bps": grouped["slippage_bps"].std(),
+        "avg_market_impact_bps": grouped["market_impact_bps"].mean(),
+        "std_market_impact_bps": grouped["market_impact_bps"].std(),
+        "total_cost": grouped["cost_value"].sum(),
+        "total_volume": grouped["quantity"].sum(),
+    }).reset_index()
+
+
+@pytest.mark.parametrize("filters, group_by", [
+    ({}, ["sector"]),
+    ({"order_type": ["MARKET", "LIMIT"]}, ["trade_type", "order_size_category"]),
+    ({"trade_type": ["BUY"], "sector": ["Financial", "Energy"]}, ["sector", "instrument_id"]),
+])
+def test_queries_match_raw_groupby(tmp_path, trades, filters, group_by):
+    save_cube(build_cube(trades), tmp_path / "tca_cube.npz")
+    cube = load_cube(tmp_path / "tca_cube.npz")
+    expected = raw_query(trades, filters, group_by)
+    result = query_cube(cube, filters, group_by)[expected.columns]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, rtol=1e-9)
+
+
+def test_total_row_without_group_by(trades):
+    total = query_cube(build_cube(trades))
+    assert len(total) == 1
+    assert total.loc[0, "num_trades"] == len(trades)
+    assert total.loc[0, "total_commission"] == pytest.approx(trades["commission_usd"].sum())
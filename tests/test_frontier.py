@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frt.optimization.factor import factor_covariance, factor_covariance_matrix
+from frt.optimization.frontier import (efficient_frontier, frontier_cache_key, load_frontier_cache,
+                                       portfolio_variances, random_portfolio_cloud, save_frontier_cache)
+from frt.optimization.optimizer import DEFAULT_CONSTRAINTS
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    rng = np.random.default_rng(10)
+    returns = rng.normal(0.0004, 0.015, (300, 20)) + rng.normal(0, 0.01, (300, 1))
+    return returns.mean(axis=0), factor_covariance(returns, n_factors=3)
+
+
+def test_cloud_matches_a_loop_over_portfolios(inputs):
+    mu, model = inputs
+    cov = factor_covariance_matrix(model)
+    cloud = random_portfolio_cloud(mu, model, num_portfolios=1_000, chunk_size=64)
+    rng = np.random.RandomState(42)
+    for i in range(1_000):
+        weights = rng.random_sample(len(mu))
+        weights /= weights.sum()
+        volatility = np.sqrt(weights @ cov @ weights)
+        np.testing.assert_allclose(cloud[:, i], [weights @ mu, volatility, (weights @ mu - 0.02) / volatility],
+                                   rtol=1e-10)
+    np.testing.assert_array_equal(cloud, random_portfolio_cloud(mu, model, num_portfolios=1_000, chunk_size=1_000))
+    np.testing.assert_allclose(random_portfolio_cloud(mu, cov, num_portfolios=1_000), cloud, rtol=1e-10)
+
+
+def test_frontier_is_monotone_and_parallel_agrees_with_serial(inputs):
+    mu, model = inputs
+    n = len(mu)
+    current, benchmark = np.full(n, 1 / n), np.full(n, 1 / n)
+    serial = efficient_frontier(mu, model, current, benchmark, DEFAULT_CONSTRAINTS, n_points=8, n_jobs=1)
+    parallel = efficient_frontier(mu, model, current, benchmark, DEFAULT_CONSTRAINTS, n_points=8, n_jobs=2)
+    np.testing.assert_allclose(serial["return"], serial["target_return"], atol=1e-6)
+    assert np.all(np.diff(serial["return"]) > -1e-8) and np.all(np.diff(serial["volatility"]) > -1e-8)
+    # Chunks warm-start from different points, so only the solutions agree, not the iteration counts
+    np.testing.assert_allclose(parallel[["return", "volatility"]], serial[["return", "volatility"]], rtol=1e-4)
+
+
+def test_frontier_cache_round_trip(tmp_path, inputs):
+    mu, _ = inputs
+    key = frontier_cache_key(mu, n_points=8)
+    assert key != frontier_cache_key(mu, n_points=9)
+    assert load_frontier_cache(key, tmp_path) is None
+    frontier, cloud = pd.DataFrame({"return": [0.1], "volatility": [0.2]}), pd.DataFrame({"sharpe": [0.5]})
+    save_frontier_cache(key, frontier, cloud, tmp_path)
+    cached = load_frontier_cache(key, tmp_path)
+    pd.testing.assert_frame_equal(cached[0], frontier)
+    pd.testing.assert_frame_equal(cached[1], cloud)
+    assert load_frontier_cache(frontier_cache_key(mu, n_points=9), tmp_path) is None
+
+
+def test_factor_variances_match_dense(inputs):
+    _, model = inputs
+    weights = np.random.default_rng(0).random((5, 20))
+    np.testing.assert_allclose(portfolio_variances(weights, model),
+                               portfolio_variances(weights, factor_covariance_matrix(model)), rtol=1e-12)
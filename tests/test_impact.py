@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frt.tca.impact import TRADING_DAYS, calibrate_impact
+
+TRUE = pd.DataFrame({"instrument_id": ["A", "B", "C", "D"], "sector": ["X", "X", "Y", "Y"],
+                     "eta": [0.8, 0.5, 1.2, 0.3], "beta": [0.6, 0.4, 0.5, 0.7]})
+
+
+def synthetic_trades(n_per_instrument=400, outlier_share=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    instruments = TRUE[["instrument_id", "sector"]].assign(avg_daily_volume=[2e7, 5e6, 1e8, 3e7],
+                                                           volatility_30d=[0.25, 0.4, 0.2, 0.3])
+    frames = []
+    for _, row in TRUE.merge(instruments).iterrows():
+        notional = row["avg_daily_volume"] * np.exp(rng.uniform(np.log(1e-4), np.log(0.2), n_per_instrument))
+        price = rng.uniform(10, 200, n_per_instrument)
+        sigma = row["volatility_30d"] / np.sqrt(TRADING_DAYS)
+        impact = row["eta"] * sigma * (notional / row["avg_daily_volume"]) ** row["beta"]
+        impact *= rng.lognormal(0, 0.1, n_per_instrument)
+        impact[rng.random(n_per_instrument) < outlier_share] *= 30   # bad prints
+        frames.append(pd.DataFrame({"instrument_id": row["instrument_id"], "quantity": notional / price,
+                                    "execution_price": price, "market_impact_bps": impact * 10000}))
+    return pd.concat(frames, ignore_index=True), instruments
+
+
+def test_huber_fit_recovers_known_parameters():
+    trades, instruments = synthetic_trades()
+    fitted = calibrate_impact(trades, instruments, {"prior_trades": 0}, n_jobs=1).set_index("instrument_id")
+    assert (fitted["source"] == "instrument").all()
+    np.testing.assert_allclose(fitted.loc[TRUE["instrument_id"], "beta"], TRUE["beta"], atol=0.02)
+    np.testing.assert_allclose(fitted.loc[TRUE["instrument_id"], "eta"], TRUE["eta"], rtol=0.1)
+
+
+def test_parallel_fit_matches_serial():
+    trades, instruments = synthetic_trades(n_per_instrument=100)
+    serial = calibrate_impact(trades, instruments, n_jobs=1)
+    parallel = calibrate_impact(trades, instruments, n_jobs=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_thin_instruments_take_the_sector_prior():
+    trades, instruments = synthetic_trades()
+    thin = trades[trades["instrument_id"] != "B"]
+    thin = pd.concat([thin, trades[trades["instrument_id"] == "B"].head(5)], ignore_index=True)
+    fitted = calibrate_impact(thin, instruments.assign(sector=["X", "X", "Y", "Z"]), n_jobs=1)
+    fitted = fitted.set_index("instrument_id")
+    assert fitted.loc["B", "source"] == "sector"
+    assert fitted.loc["B", ["eta", "beta"]].tolist() == fitted.loc["B", ["sector_eta", "sector_beta"]].tolist()
+    assert fitted.loc["A", "source"] == "instrument"
+
+
+def test_no_usable_trades_gives_default_parameters():
+    trades, instruments = synthetic_trades(n_per_instrument=10)
+    fitted = calibrate_impact(trades.assign(market_impact_bps=0.0), instruments)
+    assert (fitted["source"] == "default").all() and fitted["eta"].isna().all()
+    assert list(fitted["instrument_id"]) == list(instruments["instrument_id"])
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frt.optimization.pretrade import check_trade_list, check_trades
+from frt.optimization.whatif import apply_weight_changes, load_risk_model, risk_state, save_risk_model
+
+LIMITS = {"max_position_weight": 0.15, "sector_max_weight": 0.4, "max_gross_exposure": 1.05, "max_var": 0.012}
+
+
+@pytest.fixture
+def model(tmp_path):
+    rng = np.random.default_rng(8)
+    n = 10
+    path = tmp_path / "risk_model.npz"
+    save_risk_model(path, [f"INST_{i}" for i in range(n)], rng.normal(0, 0.02, (250, n)),
+                    np.full(n, 1 / n), np.full(n, 1 / n), ["Energy", "Technology"] * (n // 2))
+    return load_risk_model(path)
+
+
+def looped(model, ids, deltas, cumulative):
+    # One trade at a time through the what-if model
+    base = risk_state(model)
+    state, rows = base, []
+    for instrument, delta in zip(ids, deltas):
+        start = state if cumulative else base
+        position = model["position"][instrument]
+        state = apply_weight_changes(start, model, [position], [start["weights"][position] + delta])
+        rows.append({"new_weight": state["weights"][position],
+                     "sector_weight": state["sector_weights"][model["sector_labels"][position]],
+                     "gross_exposure": np.abs(state["weights"]).sum(),
+                     "var_loss": -np.percentile(state["pnl"], 5)})
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("cumulative", [False, True])
+def test_vectorized_checks_match_a_loop(model, cumulative):
+    ids = ["INST_1", "INST_3", "INST_1", "INST_4", "INST_6", "INST_3"]
+    deltas = [0.04, 0.03, 0.02, -0.05, 0.06, -0.08]
+    result = check_trades(model, risk_state(model), ids, deltas, LIMITS, cumulative=cumulative)
+    expected = looped(model, ids, deltas, cumulative)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, rtol=1e-12)
+    assert not result["passed"].all() and result["passed"].any()
+
+
+def test_limits_only_fail_trades_that_make_things_worse(model):
+    result = check_trades(model, risk_state(model), ["INST_0", "INST_0"], [0.1, -0.05], LIMITS)
+    assert result.loc[0, "reasons"].startswith("position_limit")
+    assert result.loc[1, "passed"]
+
+
+def test_trade_list_checks_sells_first(model):
+    trade_list = pd.DataFrame({
+        "instrument_id": ["INST_0", "INST_2", "INST_5", "UNKNOWN"],
+        "instrument_name": ["a", "b", "c", "d"],
+        "action": ["BUY", "SELL", "HOLD", "BUY"],
+        "current_weight": [0.1, 0.1, 0.1, 0.0],
+        "change": [0.05, -0.05, 0.0, 0.1],
+    })
+    result = check_trade_list(model, trade_list, LIMITS, fills=[0.5, 1.0], cumulative=True)
+    assert list(result["action"]) == ["SELL", "BUY"]
+    np.testing.assert_allclose(result["delta"], [-0.05, 0.025])
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from frt import profiling
+from frt.profiling import add_rows, disable, enable, export_prometheus, profile, profiled, read_records
+
+
+@profiled(rows="values")
+def total(values):
+    return float(np.sum(values))
+
+
+@profiled
+def doubled(values):
+    with profile("inner") as block:
+        block.rows = 1
+        add_rows(2)
+    return np.asarray(values) * 2
+
+
+@profiled
+def fails():
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    disable()
+    yield
+    disable()
+
+
+def test_disabled_path_records_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert not profiling.enabled()
+    assert total([1, 2, 3]) == 6.0
+    assert list(doubled([1, 2])) == [2, 4]
+    block = profile("anything")
+    assert block is profile("else")
+    with block:
+        block.rows = 5
+    add_rows(3)
+    assert export_prometheus() is None
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(RuntimeError):
+        fails()
+
+
+def test_enabled_records_nested_blocks(tmp_path):
+    enable(tmp_path)
+    total([1, 2, 3])
+    doubled([1, 2])
+    with pytest.raises(RuntimeError):
+        fails()
+    records = {record["name"]: record for record in read_records(tmp_path)}
+    assert records[f"{__name__}.total"]["rows"] == 3
+    assert records["inner"]["rows"] == 3
+    assert records["inner"]["parent"] == f"{__name__}.doubled"
+    assert records[f"{__name__}.doubled"]["rows"] == 2
+    assert records[f"{__name__}.fails"]["status"] == "error"
+
+    prom = export_prometheus().read_text()
+    assert 'frt_profile_calls_total{block="inner"} 1' in prom
+    assert f'frt_profile_errors_total{{block="{__name__}.fails"}} 1' in prom
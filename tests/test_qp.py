@@ -0,0 +1,112 @@
+import numpy as np
+from scipy.optimize import minimize_scalar
+
+from frt.optimization.qp import (project_ball, project_box_budget, project_halfspace, project_l1_ball,
+                                 project_sector_caps, prox_trading_cost)
+
+
+def assert_projection(v, projected, feasible_points):
+    # p is the projection of v onto a convex set iff (v - p)'(z - p) <= 0 for every z in the set
+    assert np.all((feasible_points - projected) @ (v - projected) <= 1e-10)
+
+
+def test_box_budget_matches_bisection():
+    rng = np.random.default_rng(0)
+    lo, hi, total = -0.05, 0.2, 1.0
+    for _ in range(50):
+        v = rng.normal(0.1, 0.3, 12)
+        projected = project_box_budget(v, lo, hi, total)
+        low, high = v.min() - hi, v.max() - lo
+        for _ in range(200):
+            shift = 0.5 * (low + high)
+            low, high = (shift, high) if np.clip(v - shift, lo, hi).sum() > total else (low, shift)
+        np.testing.assert_allclose(projected, np.clip(v - shift, lo, hi), atol=1e-12)
+        assert abs(projected.sum() - total) < 1e-12
+
+
+def test_box_budget_infeasible_total_returns_closest_bound():
+    v = np.array([0.3, -0.1, 0.5])
+    np.testing.assert_array_equal(project_box_budget(v, 0.0, 0.2, 1.0), [0.2, 0.2, 0.2])
+    np.testing.assert_array_equal(project_box_budget(v, 0.1, 0.2, 0.1), [0.1, 0.1, 0.1])
+
+
+def test_l1_ball_projection():
+    rng = np.random.default_rng(1)
+    center = rng.normal(0, 0.1, 8)
+    radius = 0.3
+    directions = rng.laplace(size=(500, 8))
+    inside = center + directions / np.abs(directions).sum(axis=1, keepdims=True) * radius * rng.random((500, 1))
+    for _ in range(20):
+        v = center + rng.normal(0, 0.2, 8)
+        projected = project_l1_ball(v, center, radius)
+        assert np.abs(projected - center).sum() <= radius + 1e-12
+        assert_projection(v, projected, inside)
+    v = center + 0.01
+    np.testing.assert_array_equal(project_l1_ball(v, center, radius), v)
+
+
+def test_sector_caps_projection():
+    rng = np.random.default_rng(2)
+    labels = np.array([0, 0, 0, 1, 1, -1])
+    counts = np.bincount(labels[labels >= 0])
+    cap = 0.4
+    v = rng.random(6)
+    projected = project_sector_caps(v, labels, counts, cap)
+    sums = np.bincount(labels[labels >= 0], weights=projected[labels >= 0])
+    assert np.all(sums <= cap + 1e-12)
+    assert projected[-1] == v[-1]
+    candidates = rng.random((2000, 6))
+    feasible = candidates[np.all(np.stack([candidates[:, labels == s].sum(axis=1) <= cap for s in range(2)]),
+                                 axis=0)]
+    assert_projection(v, projected, feasible)
+
+
+def test_ball_and_halfspace_projections():
+    rng = np.random.default_rng(3)
+    center, radius = np.zeros(4), 1.0
+    v = rng.normal(0, 2, 4) + 3
+    projected = project_ball(v, center, radius)
+    assert np.isclose(np.linalg.norm(projected), radius)
+    inside = rng.normal(size=(500, 4))
+    inside *= (rng.random((500, 1)) ** 0.25) / np.linalg.norm(inside, axis=1, keepdims=True)
+    assert_projection(v, projected, inside)
+
+    normal, level = rng.normal(size=4), 1.0
+    v = -normal
+    projected = project_halfspace(v, normal, level)
+    assert np.isclose(normal @ projected, level)
+    above = rng.normal(0, 3, (2000, 4))
+    assert_projection(v, projected, above[above @ normal >= level])
+    feasible = normal * (2 * level / (normal @ normal))
+    np.testing.assert_array_equal(project_halfspace(feasible, normal, level), feasible)
+
+
+def brute_force_prox(v, center, linear, impact, rho, exponent):
+    def objective(w):
+        trade = abs(w - center)
+        return linear * trade + impact * trade ** (1 + exponent) + 0.5 * rho * (w - v) ** 2
+    # The minimiser lies between the centre and v
+    return minimize_scalar(objective, bounds=sorted((center, v)), method="bounded",
+                           options={"xatol": 1e-13}).x
+
+
+def test_trading_cost_prox_matches_brute_force():
+    rng = np.random.default_rng(4)
+    n = 40
+    v, center = rng.normal(0, 0.05, n), rng.normal(0, 0.05, n)
+    linear, impact = rng.uniform(0, 0.002, n), rng.uniform(0, 0.05, n)
+    exponent = rng.uniform(0.2, 1.0, n)
+    rho = 1.5
+    for beta, prox in ((np.full(n, 0.5), prox_trading_cost(v, center, linear, impact, rho)),
+                       (exponent, prox_trading_cost(v, center, linear, impact, rho, exponent))):
+        expected = [brute_force_prox(*args) for args in zip(v, center, linear, impact, [rho] * n, beta)]
+        np.testing.assert_allclose(prox, expected, atol=1e-9)
+
+
+def test_trading_cost_prox_keeps_small_moves_at_the_centre():
+    center = np.array([0.1, 0.2])
+    linear, impact = np.array([0.01, 0.01]), np.array([0.05, 0.05])
+    v = center + np.array([0.005, -0.005])
+    np.testing.assert_array_equal(prox_trading_cost(v, center, linear, impact, rho=1.0), center)
+    np.testing.assert_array_equal(
+        prox_trading_cost(v, center, linear, impact, rho=1.0, exponent=np.array([0.3, 0.8])), center)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frt.optimization.optimizer import DEFAULT_CONSTRAINTS, sector_groups
+from frt.optimization.resample import resampled_optimization, weight_dispersion
+
+
+@pytest.fixture(scope="module")
+def problem():
+    rng = np.random.default_rng(12)
+    assets = [f"INST_{i:02d}" for i in range(16)]
+    returns = pd.DataFrame(rng.normal(0.0005, 0.015, (200, 16)) + rng.normal(0, 0.01, (200, 1)), columns=assets)
+    groups = sector_groups(assets, {a: ["Energy", "Technology", "Financial", "Consumer"][i % 4]
+                                    for i, a in enumerate(assets)})
+    return returns, np.full(16, 1 / 16), groups
+
+
+OPTIONS = dict(n_draws=8, n_factors=3, seed=7)
+
+
+@pytest.fixture(scope="module")
+def serial(problem):
+    returns, weights, groups = problem
+    return resampled_optimization(returns, weights, weights, DEFAULT_CONSTRAINTS, groups, n_jobs=1, **OPTIONS)
+
+
+def test_draws_do_not_depend_on_the_process_count(problem, serial):
+    returns, weights, groups = problem
+    parallel = resampled_optimization(returns, weights, weights, DEFAULT_CONSTRAINTS, groups, n_jobs=3, **OPTIONS)
+    np.testing.assert_array_equal(serial.weights, parallel.weights)
+    np.testing.assert_array_equal(serial.x, parallel.x)
+
+
+def test_average_keeps_the_convex_constraints(problem, serial):
+    returns, weights, groups = problem
+    x = serial.x
+    assert x.sum() == pytest.approx(1.0, abs=1e-6)
+    assert x.min() >= -1e-6 and x.max() <= DEFAULT_CONSTRAINTS["max_position_weight"] + 1e-6
+    assert np.abs(x - weights).sum() <= DEFAULT_CONSTRAINTS["max_turnover"] + 1e-6
+    for positions in groups.values():
+        assert x[positions].sum() <= DEFAULT_CONSTRAINTS["sector_max_weight"] + 1e-6
+    assert list(serial.dispersion["instrument_id"]) == list(returns.columns)
+
+
+def test_weight_dispersion():
+    draws = np.array([[0.5, 0.0], [0.3, 0.0005], [0.1, 0.2]])
+    dispersion = weight_dispersion(draws, ["A", "B"]).set_index("instrument_id")
+    assert dispersion.loc["A", "mean_weight"] == pytest.approx(0.3)
+    assert dispersion.loc["A", "std_weight"] == pytest.approx(0.2)
+    assert dispersion.loc["B", "selection_frequency"] == pytest.approx(1 / 3)
+    assert dispersion.loc["A", "median_weight"] == pytest.approx(0.3)
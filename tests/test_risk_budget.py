@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from frt.optimization.factor import factor_covariance, factor_covariance_matrix
+from frt.optimization.risk_budget import risk_budgets, solve_risk_budget
+
+
+def factor_model(n_instruments=60, seed=0):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, (250, 1))
+    returns = market @ rng.uniform(0.5, 1.5, (1, n_instruments)) + rng.normal(0, 0.02, (250, n_instruments))
+    return factor_covariance(returns, n_factors=3)
+
+
+@pytest.mark.parametrize("dense", [False, True])
+def test_newton_and_ccd_agree(dense):
+    model = factor_model()
+    cov = factor_covariance_matrix(model) if dense else model
+    budgets = np.random.default_rng(1).uniform(0.5, 2.0, 60)
+    budgets[:3] = 0
+    newton = solve_risk_budget(cov, budgets, method="newton")
+    ccd = solve_risk_budget(cov, budgets, method="ccd", max_iter=2000)
+
+    assert newton.success and ccd.success
+    np.testing.assert_allclose(newton.x, ccd.x, atol=1e-8)
+    np.testing.assert_allclose(newton.risk_contribution_pct, budgets / budgets.sum() * 100, atol=1e-6)
+    assert np.all(newton.x[:3] == 0) and np.isclose(newton.x.sum(), 1)
+    assert newton.nit < ccd.nit
+
+
+def test_sector_budgets_need_a_sector_map():
+    assets = ["A", "B", "C"]
+    np.testing.assert_allclose(risk_budgets(assets, {"A": "X", "B": "X", "C": "Y"}, {"X": 0.6, "Y": 0.4}),
+                               [0.3, 0.3, 0.4])
+    with pytest.raises(ValueError, match="instrument_sector_map"):
+        risk_budgets(assets, sector_budgets={"X": 1.0})
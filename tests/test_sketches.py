@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frt.bench.universe import iter_trades, make_instruments
+from frt.tca.sketches import assign_buckets, merge_sketches, sketch_quantiles, sketch_trades
+
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+@pytest.fixture(scope="module")
+def trades():
+    return next(iter_trades(make_instruments(10, seed=5), 20_000, seed=5))
+
+
+def chunk_sketches(trades, n_chunks):
+    bounds = np.linspace(0, len(trades), n_chunks + 1).astype(int)
+    return [sketch_trades(trades.iloc[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def test_merge_is_order_invariant(trades):
+    sketches = chunk_sketches(trades, 5)
+    forward = sketch_quantiles(merge_sketches(sketches, keys=[]), QUANTILES)
+    for order in ([4, 3, 2, 1, 0], [2, 0, 4, 1, 3]):
+        shuffled = sketch_quantiles(merge_sketches([sketches[i] for i in order], keys=[]), QUANTILES)
+        pd.testing.assert_frame_equal(forward, shuffled, rtol=1e-12)
+    assert (forward["count"] == len(trades)).all()
+
+
+@pytest.mark.parametrize("measure", ["quantity", "slippage_bps", "market_impact_bps"])
+def test_quantile_rank_error(trades, measure):
+    merged = merge_sketches(chunk_sketches(trades, 8), keys=[])
+    estimates = sketch_quantiles(merged, QUANTILES).set_index("measure").loc[measure]
+    values = np.sort(trades[measure].to_numpy())
+    for q in QUANTILES:
+        rank = np.searchsorted(values, estimates[f"p{q * 100:g}"]) / len(values)
+        # The k1 scale keeps centroids small in the tails, so the error shrinks there
+        assert abs(rank - q) <= 0.01 * max(4 * q * (1 - q), 0.1)
+
+
+def test_per_instrument_rollup_matches_whole_book(trades):
+    sketch = sketch_trades(trades)
+    by_instrument = sketch_quantiles(sketch, keys=["instrument_id"])
+    assert by_instrument.groupby("measure")["count"].sum().eq(len(trades)).all()
+    assert sorted(by_instrument["instrument_id"].unique()) == sorted(trades["instrument_id"].unique())
+
+
+def test_assign_buckets_uses_fixed_edges():
+    labels = assign_buckets(pd.Series([1.0, 10.0, 10.5, 100.0, 1000.0]), [10.0, 100.0, 500.0])
+    assert list(labels) == ["Small", "Small", "Medium", "Medium", "Very Large"]
@@ -0,0 +1,44 @@
+import hashlib
+
+import pandas as pd
+import pytest
+
+from frt.bench import universe
+from frt.bench.universe import INSTRUMENT_COLUMNS, TRADE_COLUMNS, make_instruments, write_universe
+
+
+def digests(paths):
+    return [hashlib.sha256(path.read_bytes()).hexdigest() for path in paths]
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Several blocks, so the state carried between them is exercised
+    monkeypatch.setattr(universe, "BLOCK_ROWS", 250)
+
+
+def test_same_arguments_write_identical_files(tmp_path, small_blocks):
+    first = write_universe(tmp_path / "a", 40, 1_000, seed=11, trades_per_timestamp=4)
+    second = write_universe(tmp_path / "b", 40, 1_000, seed=11, trades_per_timestamp=4)
+    other = write_universe(tmp_path / "c", 40, 1_000, seed=12, trades_per_timestamp=4)
+    assert digests(first) == digests(second)
+    assert digests(first)[1] != digests(other)[1]
+
+
+def test_trades_follow_on_across_blocks(tmp_path, small_blocks):
+    instruments_path, trades_path = write_universe(tmp_path, 30, 1_003, seed=3, trades_per_timestamp=3)
+    instruments, trades = pd.read_csv(instruments_path), pd.read_csv(trades_path)
+    assert list(instruments.columns) == INSTRUMENT_COLUMNS and list(trades.columns) == TRADE_COLUMNS
+    assert len(trades) == 1_003 and trades["trade_id"].is_unique
+    assert pd.to_datetime(trades["timestamp"], format="ISO8601").is_monotonic_increasing
+    assert set(trades["instrument_id"]) <= set(instruments["instrument_id"])
+    # Instruments at one timestamp are distinct
+    assert not trades.duplicated(["timestamp", "instrument_id"]).any()
+
+
+def test_sector_mix():
+    instruments = make_instruments(2_000, seed=1, sector_mix={"Technology": 3, "Energy": 1})
+    shares = instruments["sector"].value_counts(normalize=True)
+    assert set(shares.index) == {"Technology", "Energy"}
+    assert shares["Technology"] == pytest.approx(0.75, abs=0.03)
+    assert make_instruments(50, seed=1).equals(make_instruments(50, seed=1))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from frt.optimization.whatif import (apply_weight_changes, load_risk_model, risk_metrics, risk_state,
+                                     save_risk_model, sector_weights)
+
+
+@pytest.fixture
+def model(tmp_path):
+    rng = np.random.default_rng(6)
+    n = 12
+    assets = [f"INST_{i:02d}" for i in range(n)]
+    weights = rng.dirichlet(np.ones(n))
+    sectors = ["Energy", "Technology", None] * (n // 3)
+    path = tmp_path / "risk_model.npz"
+    save_risk_model(path, assets, rng.normal(0.0005, 0.02, (300, n)), weights, np.full(n, 1 / n), sectors)
+    return load_risk_model(path)
+
+
+def test_incremental_edits_match_full_repricing(model):
+    base = risk_state(model)
+    before = {key: value.copy() for key, value in base.items()}
+    positions = [model["position"]["INST_03"], model["position"]["INST_07"]]
+    edited = apply_weight_changes(base, model, positions, [0.2, 0.0])
+
+    weights = model["weights"].copy()
+    weights[positions] = [0.2, 0.0]
+    full = risk_state(model, weights)
+    np.testing.assert_allclose(edited["pnl"], full["pnl"], atol=1e-15)
+    np.testing.assert_allclose(edited["sector_weights"], full["sector_weights"], atol=1e-15)
+    for key, value in risk_metrics(edited).items():
+        assert value == pytest.approx(risk_metrics(full)[key], abs=1e-12)
+    assert all(np.array_equal(base[key], before[key]) for key in base)
+
+
+def test_sectors_round_trip(model):
+    weights = sector_weights(risk_state(model), model)
+    assert list(weights.index) == ["Energy", "Technology", "Unknown"]
+    assert weights.sum() == pytest.approx(1.0)